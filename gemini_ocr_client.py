@@ -11,24 +11,51 @@ Usage (evaluation):
     from gemini_ocr_client import evaluate_answers_with_gemini
     result = evaluate_answers_with_gemini(per_question_items)
 
+Usage (batch evaluation, one request per ``batch_size`` sheets):
+    from gemini_ocr_client import evaluate_answers_batch
+    results = evaluate_answers_batch([sheet1_items, sheet2_items])
+
+Usage (concurrent OCR for many files):
+    from gemini_ocr_client import extract_texts_concurrently
+    texts = extract_texts_concurrently(paths)  # str or exception per path
+
 Configuration (loaded via .env):
     - GEMINI_API_KEY or GOOGLE_API_KEY must be set.
+    - OCR_CONCURRENCY (optional): max in-flight OCR requests for
+      concurrent OCR; defaults to min(cpu_count, 8).
+    - OCR_RATE_LIMIT_RPS (optional): max OCR requests started per
+      second for concurrent OCR; unset or 0 disables the limiter.
+    - GEMINI_IMAGE_MAX_SIDE (optional): long edge images are downscaled
+      to before upload; defaults to 1600, 0 disables downscaling.
+    - GEMINI_TRANSPORT (optional): SDK transport, "grpc" (default) or
+      "rest". Both keep one pooled keep-alive connection per process;
+      gRPC also multiplexes concurrent calls over HTTP/2.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import os
 import json
-from typing import Any, Iterable
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable
 
 from PIL import Image
-import google.generativeai as genai
+
+if TYPE_CHECKING:  # pragma: no cover
+    import google.generativeai as genai
 
 
 class GeminiConfigError(RuntimeError):
     """Configuration or environment issue for Gemini OCR."""
 
 
+# The key is read once per process; call ``_get_api_key.cache_clear()``
+# after changing the environment to pick up a new one.
+@functools.lru_cache(maxsize=1)
 def _get_api_key() -> str:
     api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
     if not api_key:
@@ -38,6 +65,111 @@ def _get_api_key() -> str:
     return api_key
 
 
+def verify_config() -> None:
+    """Raise ``GeminiConfigError`` now if Gemini is not configured.
+
+    Lets the app report a missing API key at startup instead of on the
+    first OCR/evaluation request.
+    """
+
+    _get_api_key()
+
+
+_genai_module = None
+
+
+def _genai():
+    """Import ``google.generativeai`` on first use.
+
+    The SDK takes a while to import, so processes that only need the
+    prompt helpers or ``verify_config`` do not pay for it.
+    """
+
+    global _genai_module
+
+    if _genai_module is None:
+        import google.generativeai as genai
+
+        _genai_module = genai
+    return _genai_module
+
+
+# ``genai.configure`` sets process-wide client state and building a
+# ``GenerativeModel`` is not free, so both are done once and reused
+# across requests instead of on every OCR/evaluation call. The SDK's
+# client owns the underlying channel, so reusing it also reuses the TLS
+# connection rather than handshaking on every call.
+TRANSPORT = os.environ.get("GEMINI_TRANSPORT", "grpc").strip().lower() or "grpc"
+_MODEL_CACHE: dict[tuple[str, str], genai.GenerativeModel] = {}
+_CONFIGURED_KEY: str | None = None
+_MODEL_LOCK = threading.Lock()
+
+
+def _get_model(api_key: str, model_name: str) -> genai.GenerativeModel:
+    """Return a cached ``GenerativeModel`` for ``(api_key, model_name)``.
+
+    The SDK is (re)configured only when the API key changes.
+    """
+
+    global _CONFIGURED_KEY
+
+    cache_key = (api_key, model_name)
+    model = _MODEL_CACHE.get(cache_key)
+    if model is not None and _CONFIGURED_KEY == api_key:
+        return model
+
+    with _MODEL_LOCK:
+        if _CONFIGURED_KEY != api_key:
+            _genai().configure(api_key=api_key, transport=TRANSPORT)
+            _CONFIGURED_KEY = api_key
+        model = _MODEL_CACHE.get(cache_key)
+        if model is None:
+            model = _genai().GenerativeModel(model_name)
+            _MODEL_CACHE[cache_key] = model
+        return model
+
+
+# Long edge, in pixels, that images are downscaled to before being sent.
+# Phone scans are often 3-4x larger than this; the extra pixels only cost
+# image tokens and upload time without improving text recognition.
+IMAGE_MAX_SIDE = int(os.environ.get("GEMINI_IMAGE_MAX_SIDE", "1600"))
+
+
+def _load_image(image_path: str) -> Image.Image:
+    """Open ``image_path`` and shrink it to at most ``IMAGE_MAX_SIDE``.
+
+    Images already within the limit are passed through untouched.
+    """
+
+    img = Image.open(image_path)
+    if IMAGE_MAX_SIDE > 0 and max(img.size) > IMAGE_MAX_SIDE:
+        # For JPEGs, let libjpeg scale while decoding (1/2, 1/4, 1/8) to
+        # the smallest size that is still >= the target; a no-op for
+        # other formats. thumbnail() then does the final trim.
+        img.draft("RGB", (IMAGE_MAX_SIDE, IMAGE_MAX_SIDE))
+        if img.mode not in ("L", "RGB"):
+            img = img.convert("RGB")
+        img.thumbnail((IMAGE_MAX_SIDE, IMAGE_MAX_SIDE), Image.LANCZOS)
+    return img
+
+
+# Prompts are laid out static-first: instructions that never change come
+# first, then the per-exam rubric, and the per-sheet data (student answers,
+# image) last. Keeping the prefix byte-identical across calls lets
+# Gemini's implicit prompt caching serve it from cache on repeat calls.
+#
+# Bump OCR_PROMPT_VERSION whenever _OCR_PROMPT (or the image
+# preprocessing in _load_image) changes so cached OCR results produced
+# with the old request are no longer reused.
+OCR_PROMPT_VERSION = "v2"
+_OCR_PROMPT = (
+    "You are an OCR engine for exam answer sheets. "
+    "Extract ALL readable handwritten and printed text from this document. "
+    "Keep question numbers and line breaks where possible. "
+    "Return ONLY the extracted text, with no explanations, comments, or labels."
+)
+
+
 def extract_text(image_path: str, *, model_name: str = "gemini-2.5-flash") -> str:
     """Run OCR on a local image or scanned-PDF file using Gemini.
 
@@ -51,25 +183,17 @@ def extract_text(image_path: str, *, model_name: str = "gemini-2.5-flash") -> st
 
     api_key = _get_api_key()
 
-    # Configure SDK once per call (cheap enough for our usage pattern).
-    genai.configure(api_key=api_key)
-
     # 2.5 Flash gives good accuracy for extraction at a reasonable cost.
-    model = genai.GenerativeModel(model_name)
+    model = _get_model(api_key, model_name)
 
     ext = os.path.splitext(image_path)[1].lower()
 
-    prompt = (
-        "You are an OCR engine for exam answer sheets. "
-        "Extract ALL readable handwritten and printed text from this document. "
-        "Keep question numbers and line breaks where possible. "
-        "Return ONLY the extracted text, with no explanations, comments, or labels."
-    )
+    prompt = _OCR_PROMPT
 
     if ext == ".pdf":
         # Upload the scanned PDF so Gemini can process its pages
         # (including embedded images/handwriting).
-        file_obj = genai.upload_file(path=image_path)
+        file_obj = _genai().upload_file(path=image_path)
         response = model.generate_content(
             [prompt, file_obj],
             generation_config={
@@ -77,7 +201,7 @@ def extract_text(image_path: str, *, model_name: str = "gemini-2.5-flash") -> st
             },
         )
     else:
-        img = Image.open(image_path)
+        img = _load_image(image_path)
         response = model.generate_content(
             [prompt, img],
             generation_config={
@@ -89,6 +213,136 @@ def extract_text(image_path: str, *, model_name: str = "gemini-2.5-flash") -> st
     return str(text).strip()
 
 
+class RateLimiter:
+    """Async limiter that spaces request starts at least ``1 / rps`` apart."""
+
+    def __init__(self, rps: float) -> None:
+        self._interval = 1.0 / rps if rps > 0 else 0.0
+        self._last = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RateLimiter":
+        async with self._lock:
+            wait = self._interval - (time.monotonic() - self._last)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last = time.monotonic()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+def _is_rate_limit_error(exc: BaseException) -> bool:
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+    except Exception:  # noqa: BLE001
+        ResourceExhausted = None  # type: ignore[assignment]  # noqa: N806
+
+    if ResourceExhausted is not None and isinstance(exc, ResourceExhausted):
+        return True
+    message = str(exc).lower()
+    return "429" in message or "quota" in message
+
+
+async def extract_text_async(
+    image_path: str,
+    *,
+    sem: asyncio.Semaphore,
+    model_name: str = "gemini-2.5-flash",
+    rate_limiter: RateLimiter | None = None,
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_wait: float = 30.0,
+) -> str:
+    """Async variant of :func:`extract_text` for concurrent OCR.
+
+    At most ``sem``'s value of requests are in flight at once. Rate
+    limit/quota errors are retried up to ``max_retries`` times with
+    exponential backoff (``base_delay * 2**attempt``, capped at
+    ``max_wait`` seconds); other errors are raised immediately.
+
+    The request itself goes through the cached model's synchronous
+    client on a worker thread. The SDK's default async (grpc.aio)
+    client is bound to the first event loop that uses it, and every
+    :func:`extract_texts_concurrently` call runs a new one.
+    """
+
+    api_key = _get_api_key()
+    model = _get_model(api_key, model_name)
+
+    ext = os.path.splitext(image_path)[1].lower()
+
+    async with sem:
+        if ext == ".pdf":
+            # upload_file is blocking; keep it off the event loop.
+            content: Any = await asyncio.to_thread(_genai().upload_file, path=image_path)
+        else:
+            # Decoding and resizing a full scan is CPU-bound.
+            content = await asyncio.to_thread(_load_image, image_path)
+
+        attempt = 0
+        while True:
+            try:
+                if rate_limiter is not None:
+                    async with rate_limiter:
+                        pass
+                response = await asyncio.to_thread(
+                    model.generate_content,
+                    [_OCR_PROMPT, content],
+                    generation_config={
+                        "temperature": 0.1,
+                    },
+                )
+                break
+            except Exception as exc:  # noqa: BLE001
+                if attempt >= max_retries or not _is_rate_limit_error(exc):
+                    raise
+                await asyncio.sleep(min(max_wait, (2 ** attempt) * base_delay))
+                attempt += 1
+
+    text: Any = response.text or ""
+    return str(text).strip()
+
+
+def extract_texts_concurrently(
+    image_paths: Iterable[str],
+    *,
+    model_name: str = "gemini-2.5-flash",
+    concurrency: int | None = None,
+    rps: float | None = None,
+) -> list[str | BaseException]:
+    """Run Gemini OCR on many files concurrently from synchronous code.
+
+    Returns one entry per input path, in order: the extracted text, or
+    the exception raised for that file. ``concurrency`` and ``rps``
+    default to the ``OCR_CONCURRENCY`` and ``OCR_RATE_LIMIT_RPS``
+    environment variables.
+    """
+
+    paths = list(image_paths)
+    if not paths:
+        return []
+
+    if concurrency is None:
+        concurrency = int(os.environ.get("OCR_CONCURRENCY", min(os.cpu_count() or 1, 8)))
+    if rps is None:
+        rps = float(os.environ.get("OCR_RATE_LIMIT_RPS", 0) or 0)
+
+    async def _run() -> list[str | BaseException]:
+        sem = asyncio.Semaphore(max(1, concurrency))
+        limiter = RateLimiter(rps) if rps and rps > 0 else None
+        return await asyncio.gather(
+            *[
+                extract_text_async(p, sem=sem, model_name=model_name, rate_limiter=limiter)
+                for p in paths
+            ],
+            return_exceptions=True,
+        )
+
+    return asyncio.run(_run())
+
+
 def extract_students_from_image(
     image_path: str,
     *,
@@ -105,11 +359,9 @@ def extract_students_from_image(
     """
 
     api_key = _get_api_key()
-    genai.configure(api_key=api_key)
+    model = _get_model(api_key, model_name)
 
-    model = genai.GenerativeModel(model_name)
-
-    img = Image.open(image_path)
+    img = _load_image(image_path)
 
     prompt = (
         "You are reading a photo of a handwritten student list. "
@@ -146,6 +398,144 @@ def extract_students_from_image(
     return out
 
 
+# Bump whenever the grading prompts below change so per-question results
+# cached by gradix.evaluate.cache are no longer reused.
+EVAL_PROMPT_VERSION = "v1"
+_INTRO_WITH_MODEL_ANSWER = (
+    "You are an experienced exam evaluator. For each question you are given "
+    "the question text, a model answer, the maximum marks, and the student's "
+    "answer. Grade strictly against the model answer. "
+    "Student answers may be written as bullet points, in table form, or "
+    "partly as diagrams; treat those as normal content and grade their "
+    "meaning, not their format."
+)
+
+_INTRO_WITHOUT_MODEL_ANSWER = (
+    "You are an experienced exam evaluator. For each question you are given "
+    "the question text, the maximum marks, and the student's answer. "
+    "There is no explicit model answer; grade based on what a well-"
+    "prepared student should write for that question, focusing on "
+    "conceptual correctness, completeness, and clarity. "
+    "Student answers may include bullet lists, tables, or diagrams; "
+    "treat these as valid content, not as missing answers."
+)
+
+_SYSTEM_PROMPT = "\n".join(
+    [
+        # Step-wise marking rules for numerical/mathematical questions.
+        "When a question is mathematical or numerical, apply strict university-"
+        "style step-wise marking: award marks for correct formulas, substitutions, "
+        "intermediate steps, and the final result; do not give full marks for only "
+        "the final answer if steps or formulas are missing; deduct marks when "
+        "calculations or reasoning steps are skipped; give partial marks when the "
+        "method is correct but there are minor arithmetic mistakes; and if the "
+        "final answer is correct but steps are incomplete, deduct 1–2 marks as "
+        "appropriate.",
+        # In general, mark strictly rather than generously: vague, off-topic,
+        # or incomplete answers should receive low scores, and full marks
+        # should be reserved only for answers that clearly meet all key
+        # points expected for the given max_marks.
+        "Be clearly strict, not lenient: only award full marks when the student's "
+        "answer covers almost all key points with correct reasoning and clear "
+        "structure. If 20–30% of the important points are missing, reduce the "
+        "score to around 50–70% of max_marks. If about half or more of the key "
+        "ideas are missing, give low marks (0–40% of max_marks). Give zero or "
+        "near-zero marks when the answer is mostly irrelevant, extremely short, "
+        "or fundamentally wrong even if some words look related.",
+        "For each question, output a JSON object with: question_no (int), "
+        "score (float between 0 and max_marks, inclusive), feedback (short "
+        "explanation), and has_diagram (bool). has_diagram must be true if the "
+        "student's answer for that question includes any meaningful diagram, "
+        "ray diagram, graph, labelled figure, circuit diagram, or sketch that "
+        "is part of the answer; otherwise it must be false. Use the full range "
+        "[0, max_marks] where appropriate: answers that are mostly correct "
+        "should receive a score close to max_marks, not a tiny decimal. Do not "
+        "say that a question is unanswered if there is any non-trivial student "
+        "text; in that case, assign at least some partial marks if any "
+        "relevant points are present.",
+    ]
+)
+
+_SINGLE_SHEET_SCHEMA = (
+    "Finally, also include total_score as the sum of per-question scores. "
+    "Return ONLY JSON with this structure: "
+    "{\"questions\":[{\"question_no\":int,\"score\":float,\"feedback\":str,"
+    "\"has_diagram\":bool}], \"total_score\": float}. Do not include "
+    "any extra keys."
+)
+
+_BATCH_SCHEMA = (
+    "You are given several students' answer sheets below, each starting "
+    "with a line of the form '--- SHEET <sheet_id> ---'. Grade every sheet "
+    "independently of the others. For each sheet also include total_score "
+    "as the sum of its per-question scores. Return ONLY JSON with this "
+    "structure: {\"sheets\":[{\"sheet_id\":int,\"questions\":[{"
+    "\"question_no\":int,\"score\":float,\"feedback\":str,"
+    "\"has_diagram\":bool}], \"total_score\": float}]}. Include one "
+    "entry per sheet and do not include any extra keys."
+)
+
+_SHEET_IMAGE_HINT = (
+    "You also have the full scanned answer sheet attached as an image or "
+    "PDF. When grading each question, read the student's answer directly "
+    "from the sheet, including any ray diagrams, graphs, labelled figures, "
+    "or other visual elements. If the OCR text below misses details that "
+    "are clearly shown in the diagrams or handwriting, use the sheet image "
+    "as the source of truth."
+)
+
+
+def _has_any_model_answer(items: Iterable[dict[str, Any]]) -> bool:
+    return any(bool((item.get("model_answer") or "").strip()) for item in items)
+
+
+def _rubric_lines(items: Iterable[dict[str, Any]]) -> list[str]:
+    """Render the per-exam rubric block (questions, model answers, marks)."""
+
+    lines: list[str] = ["Rubric:", ""]
+    for item in items:
+        q_no = item.get("question_no")
+        q_text = item.get("question_text") or ""
+        m_ans = (item.get("model_answer") or "").strip()
+        max_marks = item.get("max_marks")
+
+        marks_part = f"Max marks: {max_marks}" if max_marks is not None else "Max marks: use a 0-1 scale"
+        lines.append(f"Question {q_no}:")
+        lines.append(q_text)
+        if m_ans:
+            lines.append(f"Model answer: {m_ans}")
+        lines.append(marks_part)
+        lines.append("")
+    return lines
+
+
+def _student_answer_lines(items: Iterable[dict[str, Any]]) -> list[str]:
+    """Render the per-sheet block with the student's answers."""
+
+    lines: list[str] = ["Student answers:", ""]
+    for item in items:
+        s_ans = item.get("student_answer") or ""
+        lines.append(f"Question {item.get('question_no')}:")
+        if s_ans.strip():
+            lines.append(f"Student answer: {s_ans}")
+        else:
+            lines.append("Student answer: [UNANSWERED]")
+        lines.append("")
+    return lines
+
+
+def _rubric_key(items: list[dict[str, Any]]) -> tuple:
+    return tuple(
+        (
+            item.get("question_no"),
+            item.get("question_text") or "",
+            (item.get("model_answer") or "").strip(),
+            item.get("max_marks"),
+        )
+        for item in items
+    )
+
+
 def evaluate_answers_with_gemini(
     per_question_items: Iterable[dict[str, Any]],
     *,
@@ -187,114 +577,24 @@ def evaluate_answers_with_gemini(
     """
 
     api_key = _get_api_key()
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(model_name)
+    model = _get_model(api_key, model_name)
 
     items = list(per_question_items)
 
     # Decide whether we are grading strictly against provided model
-    # answers or more generically using only question text.
-    has_any_model_answer = any(
-        bool((item.get("model_answer") or "").strip()) for item in items
-    )
-
-    lines: list[str] = []
-    if has_any_model_answer:
-        lines.append(
-            "You are an experienced exam evaluator. For each question you are given "
-            "the question text, a model answer, the maximum marks, and the student's "
-            "answer. Grade strictly against the model answer. "
-            "Student answers may be written as bullet points, in table form, or "
-            "partly as diagrams; treat those as normal content and grade their "
-            "meaning, not their format."
-        )
-    else:
-        lines.append(
-            "You are an experienced exam evaluator. For each question you are given "
-            "the question text, the maximum marks, and the student's answer. "
-            "There is no explicit model answer; grade based on what a well-" \
-            "prepared student should write for that question, focusing on "
-            "conceptual correctness, completeness, and clarity. "
-            "Student answers may include bullet lists, tables, or diagrams; "
-            "treat these as valid content, not as missing answers."
-        )
-
-    # Step-wise marking rules for numerical/mathematical questions.
-    lines.append(
-        "When a question is mathematical or numerical, apply strict university-"
-        "style step-wise marking: award marks for correct formulas, substitutions, "
-        "intermediate steps, and the final result; do not give full marks for only "
-        "the final answer if steps or formulas are missing; deduct marks when "
-        "calculations or reasoning steps are skipped; give partial marks when the "
-        "method is correct but there are minor arithmetic mistakes; and if the "
-        "final answer is correct but steps are incomplete, deduct 1–2 marks as "
-        "appropriate."
-    )
-
-    # In general, mark strictly rather than generously: vague, off-topic,
-    # or incomplete answers should receive low scores, and full marks should
-    # be reserved only for answers that clearly meet all key points expected
-    # for the given max_marks.
-    lines.append(
-        "Be clearly strict, not lenient: only award full marks when the student's "
-        "answer covers almost all key points with correct reasoning and clear "
-        "structure. If 20–30% of the important points are missing, reduce the "
-        "score to around 50–70% of max_marks. If about half or more of the key "
-        "ideas are missing, give low marks (0–40% of max_marks). Give zero or "
-        "near-zero marks when the answer is mostly irrelevant, extremely short, "
-        "or fundamentally wrong even if some words look related."
-    )
-
-    lines.append(
-        "For each question, output a JSON object with: question_no (int), "
-        "score (float between 0 and max_marks, inclusive), feedback (short "
-        "explanation), and has_diagram (bool). has_diagram must be true if the "
-        "student's answer for that question includes any meaningful diagram, "
-        "ray diagram, graph, labelled figure, circuit diagram, or sketch that "
-        "is part of the answer; otherwise it must be false. Use the full range "
-        "[0, max_marks] where appropriate: answers that are mostly correct "
-        "should receive a score close to max_marks, not a tiny decimal. Do not "
-        "say that a question is unanswered if there is any non-trivial student "
-        "text; in that case, assign at least some partial marks if any "
-        "relevant points are present."
-    )
-    lines.append(
-        "Finally, also include total_score as the sum of per-question scores. "
-        "Return ONLY JSON with this structure: "
-        "{\"questions\":[{\"question_no\":int,\"score\":float,\"feedback\":str,"
-        "\"has_diagram\":bool}], \"total_score\": float}. Do not include "
-        "any extra keys."
-    )
-
+    # answers or more generically using only question text. Everything
+    # up to and including the rubric is identical for every sheet of an
+    # exam; only the student answers at the end differ.
+    lines = [
+        _INTRO_WITH_MODEL_ANSWER if _has_any_model_answer(items) else _INTRO_WITHOUT_MODEL_ANSWER,
+        _SYSTEM_PROMPT,
+        _SINGLE_SHEET_SCHEMA,
+    ]
     if sheet_image_path:
-        lines.append(
-            "You also have the full scanned answer sheet attached as an image or "
-            "PDF. When grading each question, read the student's answer directly "
-            "from the sheet, including any ray diagrams, graphs, labelled figures, "
-            "or other visual elements. If the OCR text above misses details that "
-            "are clearly shown in the diagrams or handwriting, use the sheet image "
-            "as the source of truth."
-        )
+        lines.append(_SHEET_IMAGE_HINT)
     lines.append("")
-
-    for item in items:
-        q_no = item.get("question_no")
-        q_text = item.get("question_text") or ""
-        m_ans = (item.get("model_answer") or "").strip()
-        max_marks = item.get("max_marks")
-        s_ans = item.get("student_answer") or ""
-
-        marks_part = f"Max marks: {max_marks}" if max_marks is not None else "Max marks: use a 0-1 scale"
-        lines.append(f"Question {q_no}:")
-        lines.append(q_text)
-        if m_ans:
-            lines.append(f"Model answer: {m_ans}")
-        lines.append(marks_part)
-        if s_ans.strip():
-            lines.append(f"Student answer: {s_ans}")
-        else:
-            lines.append("Student answer: [UNANSWERED]")
-        lines.append("")
+    lines.extend(_rubric_lines(items))
+    lines.extend(_student_answer_lines(items))
 
     prompt = "\n".join(lines)
 
@@ -304,10 +604,10 @@ def evaluate_answers_with_gemini(
     if sheet_image_path:
         ext = os.path.splitext(sheet_image_path)[1].lower()
         if ext == ".pdf":
-            file_obj = genai.upload_file(path=sheet_image_path)
+            file_obj = _genai().upload_file(path=sheet_image_path)
             gen_inputs: list[Any] = [prompt, file_obj]
         else:
-            img = Image.open(sheet_image_path)
+            img = _load_image(sheet_image_path)
             gen_inputs = [prompt, img]
     else:
         gen_inputs = [prompt]
@@ -323,7 +623,116 @@ def evaluate_answers_with_gemini(
         },
     )
 
-    import json
-
     text: Any = response.text or "{}"
     return json.loads(str(text))
+
+
+def evaluate_answers_batch(
+    sheets: list[list[dict[str, Any]]],
+    *,
+    model_name: str = "gemini-2.5-flash",
+    batch_size: int = 8,
+    concurrency: int | None = None,
+) -> list[dict[str, Any] | None]:
+    """Score several answer sheets with as few Gemini calls as possible.
+
+    ``sheets`` is a list where each entry holds the per-question items
+    for one answer sheet, in the same format accepted by
+    :func:`evaluate_answers_with_gemini`. The grading instructions are
+    sent once per request (together with the rubric when all sheets in
+    the chunk share it) and followed by one ``--- SHEET {i} ---`` block
+    per sheet; sheets are split into chunks of ``batch_size`` so
+    a single request stays within token limits, and up to
+    ``concurrency`` chunks (default ``OCR_CONCURRENCY``) are sent at once.
+
+    Returns a list aligned with ``sheets``. Each entry is a dict with
+    ``questions`` and ``total_score`` (as returned by
+    :func:`evaluate_answers_with_gemini`), or ``None`` if Gemini did not
+    return a result for that sheet. Text-only: the sheet images are
+    not attached in batch mode.
+    """
+
+    api_key = _get_api_key()
+    model = _get_model(api_key, model_name)
+
+    batch_size = max(1, int(batch_size))
+    if concurrency is None:
+        concurrency = int(os.environ.get("OCR_CONCURRENCY", min(os.cpu_count() or 1, 8)))
+
+    chunks = [
+        (chunk_start, [list(items) for items in sheets[chunk_start:chunk_start + batch_size]])
+        for chunk_start in range(0, len(sheets), batch_size)
+    ]
+    results: list[dict[str, Any] | None] = [None] * len(sheets)
+    if not chunks:
+        return results
+
+    # Chunks are independent requests, so send them in parallel; a
+    # large exam then takes about one round trip instead of one per chunk.
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+        futures = [pool.submit(_evaluate_chunk, model, chunk) for _, chunk in chunks]
+
+    errors: list[BaseException] = []
+    for (chunk_start, _), future in zip(chunks, futures):
+        try:
+            chunk_results = future.result()
+        except Exception as exc:  # noqa: BLE001
+            # Leave this chunk's sheets as None so callers fall back for
+            # them only; re-raise below if nothing succeeded.
+            errors.append(exc)
+            continue
+        results[chunk_start:chunk_start + len(chunk_results)] = chunk_results
+
+    if errors and len(errors) == len(chunks):
+        raise errors[0]
+    return results
+
+
+def _evaluate_chunk(model: Any, chunk: list[list[dict[str, Any]]]) -> list[dict[str, Any] | None]:
+    """Send one batch request for ``chunk``; results are aligned with it."""
+
+    lines = [
+        _INTRO_WITH_MODEL_ANSWER
+        if any(_has_any_model_answer(items) for items in chunk)
+        else _INTRO_WITHOUT_MODEL_ANSWER,
+        _SYSTEM_PROMPT,
+        _BATCH_SCHEMA,
+        "",
+    ]
+
+    # Sheets of one exam share the same rubric, so send it once ahead
+    # of the sheet blocks; otherwise repeat it inside each block.
+    shared_rubric = len({_rubric_key(items) for items in chunk}) == 1
+    if shared_rubric:
+        lines.extend(_rubric_lines(chunk[0]))
+
+    for offset, items in enumerate(chunk):
+        lines.append(f"--- SHEET {offset} ---")
+        lines.append("")
+        if not shared_rubric:
+            lines.extend(_rubric_lines(items))
+        lines.extend(_student_answer_lines(items))
+
+    response = model.generate_content(
+        ["\n".join(lines)],
+        generation_config={
+            "temperature": 0.0,
+            "top_p": 0.1,
+            "response_mime_type": "application/json",
+        },
+    )
+
+    results: list[dict[str, Any] | None] = [None] * len(chunk)
+    text: Any = response.text or "{}"
+    data = json.loads(str(text))
+    for entry in data.get("sheets") or []:
+        try:
+            offset = int(entry.get("sheet_id"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= offset < len(chunk):
+            results[offset] = {
+                "questions": entry.get("questions") or [],
+                "total_score": entry.get("total_score"),
+            }
+    return results
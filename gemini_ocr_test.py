@@ -23,10 +23,12 @@ from dataclasses import dataclass
 from typing import Any
 
 from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 
 from gradix import create_app
-from gradix.extensions import db  # noqa: F401  # ensure app models are loaded
-from gradix.models import AnswerSheet, ExamQuestion
+from gradix.extensions import db
+from gradix.models import AnswerSheet, Exam
 
 
 # Load environment variables from .env at project root
@@ -42,19 +44,14 @@ class QuestionRubric:
 
 
 def build_prompt(rubric: list[QuestionRubric]) -> str:
+    # Static instructions first and the per-exam rubric last so repeated
+    # calls for the same exam share an identical prompt prefix.
     lines: list[str] = []
     lines.append(
         "You are an examiner. The student answer sheet image will be provided. "
         "First, transcribe the student's answers, then evaluate them strictly "
         "against the given model answers and marks."
     )
-    lines.append("")
-    lines.append("Rubric (questions and model answers):")
-    for q in rubric:
-        marks_part = f" ({q.max_marks} marks)" if q.max_marks is not None else ""
-        lines.append(f"Q{q.question_no}{marks_part}: {q.question_text}")
-        lines.append(f"Model answer: {q.model_answer}")
-        lines.append("")
     lines.append(
         "Return JSON with this structure only: "
         '{"questions":[{"question_no":int,"extracted_answer":str,'
@@ -64,6 +61,14 @@ def build_prompt(rubric: list[QuestionRubric]) -> str:
         "If you cannot read an answer, set score=0 and feedback='Not legible'."
     )
 
+    lines.append("")
+    lines.append("Rubric (questions and model answers):")
+    for q in rubric:
+        marks_part = f" ({q.max_marks} marks)" if q.max_marks is not None else ""
+        lines.append(f"Q{q.question_no}{marks_part}: {q.question_text}")
+        lines.append(f"Model answer: {q.model_answer}")
+        lines.append("")
+
     return "\n".join(lines)
 
 
@@ -117,7 +122,14 @@ def main() -> None:
 
     app = create_app()
     with app.app_context():
-        sheet = AnswerSheet.query.get(args.sheet_id)
+        # Load the sheet, its exam and the exam's questions in one
+        # joined query instead of a second round trip for the rubric.
+        stmt = (
+            select(AnswerSheet)
+            .options(joinedload(AnswerSheet.exam).joinedload(Exam.questions))
+            .where(AnswerSheet.sheet_id == args.sheet_id)
+        )
+        sheet = db.session.execute(stmt).unique().scalar_one_or_none()
         if sheet is None:
             raise SystemExit(f"No AnswerSheet with sheet_id={args.sheet_id}")
 
@@ -127,11 +139,7 @@ def main() -> None:
         if not os.path.exists(image_path):
             raise SystemExit(f"File not found: {image_path}")
 
-        questions = (
-            ExamQuestion.query.filter_by(exam_id=sheet.exam_id)
-            .order_by(ExamQuestion.question_no.asc())
-            .all()
-        )
+        questions = sorted(sheet.exam.questions, key=lambda q: q.question_no)
         if not questions:
             raise SystemExit("No questions/rubric defined for this exam.")
 
@@ -1,22 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask
+import importlib
+import logging
 import os
+import threading
 
 from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
 
 from .config import Config
 from .extensions import db, jwt
-from .auth.routes import auth_bp
-from .admin.routes import admin_bp
-from .exam.routes import exam_bp
-from .student.routes import student_bp
-from .answersheet.routes import answersheet_bp
-from .ocr.routes import ocr_bp
-from .preprocess.routes import preprocess_bp
-from .evaluate.routes import evaluate_bp
-from .review.routes import review_bp
-from .report.routes import report_bp
-from .analytics.routes import analytics_bp
-from .web import web_bp
+from .upload_request import UploadRequest
+
+
+# (module, blueprint attribute, feature flag). Blueprints are imported
+# inside create_app so importing ``gradix`` (CLI scripts, workers) stays
+# cheap; a flag set to "0" skips registering that blueprint entirely.
+_BLUEPRINTS = (
+    ("gradix.web", "web_bp", None),
+    ("gradix.auth.routes", "auth_bp", None),
+    ("gradix.admin.routes", "admin_bp", None),
+    ("gradix.exam.routes", "exam_bp", None),
+    ("gradix.student.routes", "student_bp", None),
+    ("gradix.answersheet.routes", "answersheet_bp", None),
+    ("gradix.ocr.routes", "ocr_bp", "GRADIX_ENABLE_OCR"),
+    ("gradix.preprocess.routes", "preprocess_bp", "GRADIX_ENABLE_OCR"),
+    ("gradix.evaluate.routes", "evaluate_bp", "GRADIX_ENABLE_EVAL"),
+    ("gradix.review.routes", "review_bp", None),
+    ("gradix.report.routes", "report_bp", None),
+    ("gradix.analytics.routes", "analytics_bp", None),
+    ("gradix.jobs", "jobs_bp", None),
+)
+
+
+def _add_missing_columns() -> None:
+    """Add nullable columns declared on existing tables.
+
+    Like indexes, columns added to a model after its table was created
+    are not picked up by ``create_all``.
+    """
+
+    inspector = db.inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(
+                    db.text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}")
+                )
+
+
+def _create_missing_indexes() -> None:
+    """Add indexes declared on existing tables.
+
+    ``create_all`` only creates indexes together with new tables; there
+    are no migrations, so indexes added to a model later are created
+    here (checkfirst makes this a no-op once they exist).
+    """
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(db.engine, checkfirst=True)
+            except IntegrityError as exc:
+                # A unique index over rows that already hold duplicates;
+                # the app still works without it.
+                logging.getLogger(__name__).warning(
+                    "Could not create unique index %s; remove duplicate rows first: %s",
+                    index.name,
+                    exc,
+                )
+
+
+def _warmup_models() -> None:
+    """Load the local OCR, grammar and embedding models ahead of traffic.
+
+    Each model is otherwise loaded by the first request that needs it.
+    Failures are only logged; the request path loads lazily as before.
+    """
+
+    from .evaluate.embeddings import get_model as get_embedding_model
+    from .ocr.routes import _get_easyocr_reader
+    from .preprocess.routes import _hf_grammar_correct
+
+    log = logging.getLogger(__name__)
+    for name, load in (
+        ("EasyOCR", _get_easyocr_reader),
+        ("grammar model", lambda: _hf_grammar_correct("warm up")),
+        ("embedding model", get_embedding_model),
+    ):
+        try:
+            load()
+        except Exception as exc:  # noqa: BLE001
+            log.warning("Warm-up of %s failed: %s", name, exc)
+    log.info("Model warm-up finished")
 
 
 def create_app() -> Flask:
@@ -27,24 +110,70 @@ def create_app() -> Flask:
 
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.request_class = UploadRequest
+
+    try:
+        from .json_provider import OrjsonProvider
+    except ImportError:  # orjson is optional; keep Flask's stdlib provider
+        pass
+    else:
+        app.json = OrjsonProvider(app)
 
     db.init_app(app)
     jwt.init_app(app)
 
-    app.register_blueprint(web_bp)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(admin_bp)
-    app.register_blueprint(exam_bp)
-    app.register_blueprint(student_bp)
-    app.register_blueprint(answersheet_bp)
-    app.register_blueprint(ocr_bp)
-    app.register_blueprint(preprocess_bp)
-    app.register_blueprint(evaluate_bp)
-    app.register_blueprint(review_bp)
-    app.register_blueprint(report_bp)
-    app.register_blueprint(analytics_bp)
+    if app.config.get("SESSION_REDIS_URL"):
+        try:  # pragma: no cover - optional dependency
+            import redis
+            from flask_session import Session
+        except ImportError:
+            app.logger.warning(
+                "GRADIX_SESSION_REDIS_URL is set but Flask-Session/redis are not installed"
+            )
+        else:
+            app.config["SESSION_TYPE"] = "redis"
+            app.config["SESSION_REDIS"] = redis.Redis.from_url(app.config["SESSION_REDIS_URL"])
+            Session(app)
+
+    # Development aid: log lazy loads that should have been eager loads.
+    if os.environ.get("GRADIX_DETECT_NPLUSONE", "0") == "1":
+        try:  # pragma: no cover - optional dev dependency
+            from nplusone.ext.flask_sqlalchemy import NPlusOne
+        except ImportError:
+            app.logger.warning("GRADIX_DETECT_NPLUSONE is set but nplusone is not installed")
+        else:
+            NPlusOne(app)
+
+    # Surface a missing Gemini key at boot rather than under load. Gemini
+    # is optional (callers fall back to local OCR/scoring), so only warn.
+    if os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}:
+        try:
+            from gemini_ocr_client import verify_config
+
+            verify_config()
+        except Exception as exc:  # noqa: BLE001
+            app.logger.warning("Gemini is enabled but not usable: %s", exc)
+
+    # Shared pool for slow Gemini/OCR work submitted via gradix.jobs.
+    app.extensions["ocr_pool"] = ThreadPoolExecutor(
+        max_workers=int(os.environ.get("OCR_WORKERS", 4)),
+    )
+    # Small pool for write-behind commits (gradix.jobs.persist).
+    app.extensions["writer_pool"] = ThreadPoolExecutor(max_workers=2)
+
+    for module_name, attr, flag in _BLUEPRINTS:
+        if flag and os.environ.get(flag, "1") != "1":
+            continue
+        app.register_blueprint(getattr(importlib.import_module(module_name), attr))
 
     with app.app_context():
         db.create_all()
+        _add_missing_columns()
+        _create_missing_indexes()
+
+    # Opt-in: load heavy local models in the background so the app can
+    # start serving while they load instead of on the first request.
+    if os.environ.get("WARMUP_MODELS", "0") == "1":
+        threading.Thread(target=_warmup_models, name="gradix-warmup", daemon=True).start()
 
     return app
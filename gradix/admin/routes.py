@@ -2,10 +2,10 @@ from http import HTTPStatus
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
-import bcrypt
 
 from ..extensions import db
 from ..models import User, UserRole
+from ..passwords import hash_password
 from ..rbac import role_required
 
 
@@ -34,9 +34,7 @@ def create_teacher():
             HTTPStatus.CONFLICT,
         )
 
-    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode(
-        "utf-8"
-    )
+    password_hash = hash_password(password)
 
     teacher = User(
         name=name,
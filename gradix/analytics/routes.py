@@ -3,8 +3,11 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required
 
+from ..evaluate import cache as eval_cache
 from ..extensions import db
-from ..models import AnswerSheet, Report, UserRole
+from ..models import AnswerSheet, UserRole
+from ..ocr import cache as ocr_cache
+from . import stats as exam_stats
 from ..rbac import role_required
 
 
@@ -16,11 +19,17 @@ analytics_bp = Blueprint("analytics", __name__, url_prefix="/analytics")
 @role_required({UserRole.TEACHER, UserRole.ADMIN})
 def exam_analytics(exam_id: int):
     # Total submissions (all answer sheets for this exam)
-    total_submissions = AnswerSheet.query.filter_by(exam_id=exam_id).count()
+    total_submissions = (
+        db.session.query(db.func.count(AnswerSheet.sheet_id))
+        .filter(AnswerSheet.exam_id == exam_id)
+        .scalar()
+    )
+
+    # Use reports as the source for scores (one per student per exam),
+    # read from the precomputed exam_stats row.
+    stats = exam_stats.get_exam_stats(exam_id)
 
-    # Use reports as the source for scores (one per student per exam)
-    reports = Report.query.filter_by(exam_id=exam_id).all()
-    if not reports:
+    if not stats.n_reports:
         return (
             jsonify(
                 {
@@ -33,31 +42,10 @@ def exam_analytics(exam_id: int):
             HTTPStatus.OK,
         )
 
-    scores = [r.total_score for r in reports]
-    class_average = round(sum(scores) / len(scores), 2)
+    class_average = round(stats.sum_score / stats.n_reports, 2)
 
     # Simple score distribution buckets (dummy but useful)
-    buckets = {
-        "0-20": 0,
-        "20-40": 0,
-        "40-60": 0,
-        "60-80": 0,
-        "80-100": 0,
-        ">100": 0,
-    }
-    for s in scores:
-        if s < 20:
-            buckets["0-20"] += 1
-        elif s < 40:
-            buckets["20-40"] += 1
-        elif s < 60:
-            buckets["40-60"] += 1
-        elif s < 80:
-            buckets["60-80"] += 1
-        elif s <= 100:
-            buckets["80-100"] += 1
-        else:
-            buckets[">100"] += 1
+    buckets = {label: getattr(stats, column) for label, column in exam_stats.BUCKETS}
 
     return (
         jsonify(
@@ -70,3 +58,19 @@ def exam_analytics(exam_id: int):
         ),
         HTTPStatus.OK,
     )
+
+
+@analytics_bp.get("/ocr-cache")
+@jwt_required()
+@role_required({UserRole.TEACHER, UserRole.ADMIN})
+def ocr_cache_stats():
+    # Counters are per process and reset on restart.
+    return jsonify(ocr_cache.stats()), HTTPStatus.OK
+
+
+@analytics_bp.get("/eval-cache")
+@jwt_required()
+@role_required({UserRole.TEACHER, UserRole.ADMIN})
+def eval_cache_stats():
+    # Per-question hit/miss counters; per process and reset on restart.
+    return jsonify(eval_cache.stats()), HTTPStatus.OK
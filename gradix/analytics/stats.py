@@ -0,0 +1,127 @@
+"""Per-exam report aggregates kept in ``exam_stats``.
+
+``exam_stats`` works like a materialised view over ``reports``: any
+write to a report (ORM insert/update/delete or a bulk ``Query.delete``)
+drops the cached rows, and :func:`get_exam_stats` rebuilds a row with
+one aggregate query the next time it is read. Dashboards polling the
+analytics endpoint then read a single row until the reports change.
+"""
+
+from sqlalchemy import delete, event, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import ExamStats, Report, utcnow
+
+
+# (label, ExamStats column) for the score distribution, in display order.
+BUCKETS = [
+    ("0-20", "bucket_0_20"),
+    ("20-40", "bucket_20_40"),
+    ("40-60", "bucket_40_60"),
+    ("60-80", "bucket_60_80"),
+    ("80-100", "bucket_80_100"),
+    (">100", "bucket_over_100"),
+]
+
+
+def _bucket_conditions():
+    """SQL conditions matching :data:`BUCKETS`.
+
+    100 itself still counts as "80-100"; negatives count as "0-20".
+    """
+
+    s = Report.total_score
+    return [
+        s < 20,
+        db.and_(s >= 20, s < 40),
+        db.and_(s >= 40, s < 60),
+        db.and_(s >= 60, s < 80),
+        db.and_(s >= 80, s <= 100),
+        s > 100,
+    ]
+
+
+# ExamStats columns filled by _aggregates(), in the same order.
+_AGGREGATE_COLUMNS = ["n_reports", "sum_score", *(column for _, column in BUCKETS)]
+
+
+def _aggregates() -> list:
+    return [
+        db.func.count(Report.report_id),
+        db.func.coalesce(db.func.sum(Report.total_score), 0.0),
+        *[db.func.sum(db.case((cond, 1), else_=0)) for cond in _bucket_conditions()],
+    ]
+
+
+def get_exam_stats(exam_id: int) -> ExamStats:
+    """Return the cached aggregates for ``exam_id``, rebuilding if needed.
+
+    The row is rebuilt with a single ``INSERT ... SELECT`` so the stored
+    aggregates are exactly what the database held when it was written:
+    a report committed after that can always find (and drop) the row.
+    Exams without reports are not stored.
+    """
+
+    stats = db.session.get(ExamStats, exam_id)
+    if stats is not None:
+        return stats
+
+    aggregates = _aggregates()
+    source = (
+        db.select(db.literal(exam_id), *aggregates, utcnow())
+        .where(Report.exam_id == exam_id)
+        .having(aggregates[0] > 0)
+    )
+    try:
+        db.session.execute(
+            insert(ExamStats).from_select(
+                ["exam_id", *_AGGREGATE_COLUMNS, "refreshed_on"], source
+            )
+        )
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent reader stored the row first.
+        db.session.rollback()
+
+    stats = db.session.get(ExamStats, exam_id)
+    if stats is None:
+        stats = ExamStats(exam_id=exam_id, n_reports=0, sum_score=0.0)
+        for _, column in BUCKETS:
+            setattr(stats, column, 0)
+    return stats
+
+
+def _invalidate(connection, *exam_ids) -> None:
+    exam_ids = {e for e in exam_ids if e is not None}
+    if exam_ids:
+        connection.execute(
+            delete(ExamStats.__table__).where(ExamStats.__table__.c.exam_id.in_(exam_ids))
+        )
+
+
+@event.listens_for(Report, "after_insert")
+@event.listens_for(Report, "after_delete")
+def _report_written(mapper, connection, target) -> None:
+    _invalidate(connection, target.exam_id)
+
+
+@event.listens_for(Report, "after_update")
+def _report_updated(mapper, connection, target) -> None:
+    history = db.inspect(target).attrs.exam_id.history
+    _invalidate(connection, target.exam_id, *history.deleted)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_report_write(orm_execute_state) -> None:
+    # Bulk INSERT/UPDATE/DELETE on reports bypasses the mapper events
+    # above and may touch several exams, so drop every cached row.
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    if any(m.class_ is Report for m in orm_execute_state.all_mappers):
+        orm_execute_state.session.execute(delete(ExamStats.__table__))
@@ -1,4 +1,5 @@
 import os
+import shutil
 from http import HTTPStatus
 from uuid import uuid4
 
@@ -13,11 +14,70 @@ from ..rbac import role_required
 answersheet_bp = Blueprint("answersheet", __name__, url_prefix="/answersheet")
 
 
-ALLOWED_EXTENSIONS = {"pdf", "jpg", "jpeg", "png"}
-
-
-def _allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+ALLOWED_EXTENSIONS = frozenset({"pdf", "jpg", "jpeg", "png"})
+
+
+def _allowed_extension(filename: str) -> str | None:
+    """Return the lower-cased extension of ``filename`` if it is allowed."""
+
+    dot = filename.rfind(".")
+    if dot == -1:
+        return None
+    ext = filename[dot + 1 :].lower()
+    return ext if ext in ALLOWED_EXTENSIONS else None
+
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _save_upload(file, full_path: str) -> None:
+    """Write an uploaded ``FileStorage`` to ``full_path``.
+
+    Large uploads are spooled by Werkzeug to a real temporary file, so the
+    copy is done in-kernel with ``os.sendfile`` when possible; small
+    in-memory uploads fall back to ``shutil.copyfileobj`` with 1 MB chunks
+    instead of Werkzeug's 16 KB default. Uploads spooled into the upload
+    folder by :class:`gradix.upload_request.UploadRequest` are hard-linked
+    to ``full_path`` without copying.
+    """
+
+    src = file.stream
+    spooled_name = getattr(src, "name", None)
+    # Only on POSIX: Windows opens named temporary files delete-on-close,
+    # so a hard link to one would not reliably outlive the request.
+    if os.name == "posix" and isinstance(spooled_name, str):
+        try:
+            src.flush()
+            os.link(spooled_name, full_path)
+            return
+        except (AttributeError, OSError):
+            # Cross-device, existing target or no hard links; copy below.
+            pass
+
+    with open(full_path, "wb") as dst:
+        try:
+            src_fd = src.fileno()
+            length = os.fstat(src_fd).st_size
+            offset = src.tell()
+        except (AttributeError, OSError, ValueError):
+            src_fd = None
+
+        if src_fd is not None and hasattr(os, "sendfile"):
+            try:
+                while offset < length:
+                    sent = os.sendfile(dst.fileno(), src_fd, offset, length - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError:
+                # Not supported for this pair of descriptors; rewind what
+                # was written and copy in user space instead.
+                dst.seek(0)
+                dst.truncate()
+                src.seek(0)
+
+        shutil.copyfileobj(src, dst, length=_COPY_CHUNK_SIZE)
 
 
 @answersheet_bp.post("/upload")
@@ -45,14 +105,14 @@ def upload_answersheet():
         )
 
     # Validate foreign keys
-    student = Student.query.get(student_id_int)
+    student = db.session.get(Student, student_id_int)
     if student is None:
         return (
             jsonify({"message": "Invalid student_id."}),
             HTTPStatus.BAD_REQUEST,
         )
 
-    exam = Exam.query.get(exam_id_int)
+    exam = db.session.get(Exam, exam_id_int)
     if exam is None:
         return (
             jsonify({"message": "Invalid exam_id."}),
@@ -61,7 +121,8 @@ def upload_answersheet():
 
     # Validate file type
     filename = file.filename or ""
-    if filename == "" or not _allowed_file(filename):
+    ext = _allowed_extension(filename)
+    if ext is None:
         return (
             jsonify({"message": "Invalid file type. Allowed: PDF, JPG, PNG."}),
             HTTPStatus.BAD_REQUEST,
@@ -70,11 +131,10 @@ def upload_answersheet():
     upload_folder = current_app.config["UPLOAD_FOLDER"]
     os.makedirs(upload_folder, exist_ok=True)
 
-    ext = filename.rsplit(".", 1)[1].lower()
     safe_name = f"{student_id_int}_{exam_id_int}_{uuid4().hex}.{ext}"
     full_path = os.path.join(upload_folder, safe_name)
 
-    file.save(full_path)
+    _save_upload(file, full_path)
 
     # Store relative path (uploads/<filename>) for portability
     relative_path = os.path.join("uploads", safe_name)
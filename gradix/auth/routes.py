@@ -2,10 +2,10 @@ from http import HTTPStatus
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import create_access_token
-import bcrypt
 
 from ..extensions import db
 from ..models import User, UserRole
+from ..passwords import dummy_verify, hash_password, needs_rehash, verify_password
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
@@ -23,21 +23,26 @@ def login():
             HTTPStatus.BAD_REQUEST,
         )
 
-    user = User.query.filter_by(email=email).first()
+    user = db.session.execute(
+        db.select(User).where(User.email == email)
+    ).scalar_one_or_none()
     if user is None:
+        dummy_verify(password)
         return (
             jsonify({"message": "Invalid credentials."}),
             HTTPStatus.UNAUTHORIZED,
         )
 
-    if not bcrypt.checkpw(
-        password.encode("utf-8"), user.password_hash.encode("utf-8")
-    ):
+    if not verify_password(password, user.password_hash):
         return (
             jsonify({"message": "Invalid credentials."}),
             HTTPStatus.UNAUTHORIZED,
         )
 
+    if needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+        db.session.commit()
+
     additional_claims = {"role": user.role.value}
     # Identity ("sub" claim) must be a string for newer Flask-JWT-Extended versions
     access_token = create_access_token(identity=str(user.user_id), additional_claims=additional_claims)
@@ -11,11 +11,44 @@ class Config:
         "sqlite:///gradix.db",
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Size the connection pool for request threads plus the OCR/evaluation
+    # workers (OCR_WORKERS), which each hold a connection while a job
+    # runs. SQLite keeps SQLAlchemy's defaults: a file database already
+    # gets one pooled connection per thread and there is no server
+    # connection to go stale.
+    SQLALCHEMY_ENGINE_OPTIONS = (
+        {}
+        if SQLALCHEMY_DATABASE_URI.startswith("sqlite:")
+        else {
+            "pool_size": int(os.environ.get("GRADIX_DB_POOL", "20")),
+            "max_overflow": int(os.environ.get("GRADIX_DB_MAX_OVERFLOW", "10")),
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+        }
+    )
     JWT_SECRET_KEY = os.environ.get("GRADIX_JWT_SECRET_KEY", "dev-jwt-secret")
 
-    # File uploads
-    UPLOAD_FOLDER = os.environ.get(
-        "GRADIX_UPLOAD_FOLDER",
-        os.path.abspath(os.path.join(basedir, "..", "uploads")),
+    # Password hashing (see gradix/passwords.py). "bcrypt" or "argon2";
+    # existing hashes are upgraded to these settings on the next login.
+    PASSWORD_HASHER = os.environ.get("GRADIX_PASSWORD_HASHER", "bcrypt")
+    BCRYPT_ROUNDS = int(os.environ.get("GRADIX_BCRYPT_ROUNDS", "12"))
+    # Seconds a successful password check is remembered; 0 disables.
+    PASSWORD_CACHE_TTL = int(os.environ.get("GRADIX_PASSWORD_CACHE_TTL", "60"))
+
+    # Server-side sessions: set to a Redis URL (e.g. "redis://localhost:6379/0")
+    # to keep session data in Redis and send only a session id cookie.
+    # Requires Flask-Session and redis; empty keeps signed-cookie sessions.
+    SESSION_REDIS_URL = os.environ.get("GRADIX_SESSION_REDIS_URL", "")
+
+    # File uploads. Resolved to an absolute path once here so request
+    # code can join file names onto it without calling abspath again.
+    UPLOAD_FOLDER = os.path.abspath(
+        os.environ.get("GRADIX_UPLOAD_FOLDER", os.path.join(basedir, "..", "uploads"))
     )
+    # Let the front-end server send uploaded files. Behind Apache
+    # (mod_xsendfile) set GRADIX_USE_X_SENDFILE=1; behind nginx set
+    # GRADIX_UPLOADS_ACCEL_PREFIX to an ``internal`` location aliased to
+    # UPLOAD_FOLDER, e.g. "/protected_uploads/".
+    USE_X_SENDFILE = os.environ.get("GRADIX_USE_X_SENDFILE", "0") == "1"
+    UPLOADS_ACCEL_PREFIX = os.environ.get("GRADIX_UPLOADS_ACCEL_PREFIX", "")
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB
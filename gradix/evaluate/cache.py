@@ -0,0 +1,125 @@
+"""Persistent cache for Gemini per-question grading.
+
+Each question is keyed by the SHA-256 of what Gemini is asked to grade
+(question text, model answer, max marks and student answer) plus the
+model name and evaluation prompt version. Re-evaluating a sheet, or a
+different sheet with an identical answer, is then served from the
+database instead of another Gemini call.
+
+Like the OCR cache, entries are written through ``db.session`` and
+persisted by the caller's commit.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any
+
+from ..extensions import db
+from ..models import EvalCache
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+
+def item_key(item: dict[str, Any], model_name: str = DEFAULT_MODEL) -> str:
+    """Return the cache key for one per-question payload item."""
+
+    from gemini_ocr_client import EVAL_PROMPT_VERSION
+
+    payload = json.dumps(
+        [
+            model_name,
+            EVAL_PROMPT_VERSION,
+            (item.get("question_text") or "").strip(),
+            (item.get("model_answer") or "").strip(),
+            item.get("max_marks"),
+            " ".join((item.get("student_answer") or "").split()),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def lookup(
+    items: list[dict[str, Any]], model_name: str = DEFAULT_MODEL
+) -> tuple[list[dict], list[dict]]:
+    """Split ``items`` into ``(cached_questions, misses)``.
+
+    ``cached_questions`` are shaped like the ``questions`` entries of a
+    Gemini result; ``misses`` are the items that still need grading.
+    """
+
+    if not items:
+        return [], []
+
+    keys = [item_key(item, model_name) for item in items]
+    rows = {
+        row.key: row
+        for row in EvalCache.query.filter(EvalCache.key.in_(set(keys))).all()
+    }
+
+    cached: list[dict] = []
+    misses: list[dict] = []
+    for item, key in zip(items, keys):
+        row = rows.get(key)
+        if row is None:
+            misses.append(item)
+            continue
+        cached.append(
+            {
+                "question_no": item["question_no"],
+                "score": row.score,
+                "feedback": row.feedback or "",
+                "has_diagram": row.has_diagram,
+            }
+        )
+
+    _count("hits", len(cached))
+    _count("misses", len(misses))
+    return cached, misses
+
+
+def store(
+    items: list[dict[str, Any]],
+    gemini_result: dict | None,
+    model_name: str = DEFAULT_MODEL,
+) -> None:
+    """Cache the Gemini grading of ``items`` from ``gemini_result``."""
+
+    if not gemini_result:
+        return
+
+    items_by_no = {item["question_no"]: item for item in items}
+    for q in gemini_result.get("questions", []) or []:
+        try:
+            item = items_by_no.get(int(q.get("question_no")))
+            score = float(q.get("score"))
+        except (TypeError, ValueError):
+            continue
+        if item is None:
+            continue
+        db.session.merge(
+            EvalCache(
+                key=item_key(item, model_name),
+                score=score,
+                feedback=(q.get("feedback") or "").strip() or None,
+                has_diagram=bool(q.get("has_diagram", False)),
+            )
+        )
+
+
+def stats() -> dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,93 @@
+"""Cheap local scoring used ahead of Gemini (an LLM cascade).
+
+Answers that can be graded with certainty without a model call are
+scored here: blank answers get zero, and answers identical to the model
+answer (ignoring case and whitespace) get full marks. Everything else,
+including near-copies where one sign, operator or "not" can flip the
+meaning, is left for Gemini, so a sheet with many blank or copied
+answers needs a much smaller (or no) API request.
+"""
+
+from typing import Any
+
+
+def _normalise(text: str | None) -> str:
+    # Only case and whitespace are folded; punctuation, signs and
+    # operators ("-5", "x < 5") carry meaning and are kept.
+    return " ".join((text or "").casefold().split())
+
+
+def local_score(
+    student_answer: str | None,
+    model_answer: str | None,
+    max_marks: float | None,
+) -> tuple[float, float]:
+    """Return ``(score, confidence)`` for one answer.
+
+    ``confidence`` is 1.0 for blank answers and answers identical to the
+    model answer, and 0.0 when the answer cannot be judged locally.
+    """
+
+    student = _normalise(student_answer)
+    if not student:
+        return 0.0, 1.0
+
+    model = _normalise(model_answer)
+    if not model or max_marks is None:
+        return 0.0, 0.0
+
+    if student == model:
+        return float(max_marks), 1.0
+    return 0.0, 0.0
+
+
+def triage(payload_items: list[dict[str, Any]]) -> tuple[list[dict], list[dict]]:
+    """Split per-question items into locally scored and uncertain ones.
+
+    Returns ``(local_questions, uncertain_items)``. ``local_questions`` are
+    shaped like the ``questions`` entries of a Gemini result;
+    ``uncertain_items`` are the original payload items still to be sent
+    to Gemini.
+    """
+
+    local_questions: list[dict] = []
+    uncertain: list[dict] = []
+    for item in payload_items:
+        score, confidence = local_score(
+            item.get("student_answer"),
+            item.get("model_answer"),
+            item.get("max_marks"),
+        )
+        blank = not _normalise(item.get("student_answer"))
+        if confidence == 1.0:
+            local_questions.append(
+                {
+                    "question_no": item["question_no"],
+                    "score": score,
+                    "feedback": "Unanswered" if blank else "Matches the model answer.",
+                    "has_diagram": False,
+                }
+            )
+        else:
+            uncertain.append(item)
+    return local_questions, uncertain
+
+
+def merge_results(local_questions: list[dict], gemini_result: dict | None) -> dict:
+    """Combine local scores with a Gemini result for the remaining items."""
+
+    gemini_result = gemini_result or {}
+    gemini_questions = gemini_result.get("questions", []) or []
+    gemini_total = gemini_result.get("total_score")
+    if gemini_total is None:
+        gemini_total = 0.0
+        for q in gemini_questions:
+            try:
+                gemini_total += float(q.get("score", 0.0))
+            except (TypeError, ValueError):
+                continue
+
+    return {
+        "questions": list(gemini_questions) + local_questions,
+        "total_score": float(gemini_total) + sum(q["score"] for q in local_questions),
+    }
@@ -0,0 +1,109 @@
+"""Sentence embeddings for the heuristic (non-Gemini) semantic score.
+
+Set ``GRADIX_EMBEDDING_MODEL`` to a SentenceTransformer model name (for
+example ``all-MiniLM-L6-v2``) to score answers by cosine similarity to
+the model answer. Without it, or without ``sentence-transformers``
+installed, the Phase I constant score is returned.
+
+Model answers are embedded once when a question is saved
+(``ExamQuestion.answer_embedding``) and only decoded at evaluation time.
+Clear that column after switching ``GRADIX_EMBEDDING_MODEL``.
+"""
+
+import functools
+import logging
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Score returned for every answer while no embedding model is configured.
+MOCK_SEMANTIC_SCORE = 0.78
+
+ENCODE_BATCH_SIZE = 64
+
+
+@functools.lru_cache(maxsize=1)
+def get_model():
+    """Return the configured SentenceTransformer, or ``None``."""
+
+    name = os.environ.get("GRADIX_EMBEDDING_MODEL", "").strip()
+    if not name:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.warning(
+            "GRADIX_EMBEDDING_MODEL is set but sentence-transformers is not installed"
+        )
+        return None
+    return SentenceTransformer(name)
+
+
+def encode(texts: Sequence[str]) -> np.ndarray:
+    """Embed ``texts`` in one batched pass as unit-norm float32 rows."""
+
+    return np.asarray(
+        get_model().encode(
+            list(texts),
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ),
+        dtype=np.float32,
+    )
+
+
+def encode_answer(answer_text: str | None) -> bytes | None:
+    """Return the stored form of a model answer's embedding, or ``None``."""
+
+    if not (answer_text or "").strip() or get_model() is None:
+        return None
+    return encode([answer_text])[0].tobytes()
+
+
+@functools.lru_cache(maxsize=1024)
+def decode_embedding(blob: bytes) -> np.ndarray:
+    """Turn a stored embedding back into a (read-only) float32 vector."""
+
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def semantic_score_batch(
+    pairs: Sequence[tuple[str, str]],
+    reference_embeddings: Optional[Sequence[bytes | None]] = None,
+) -> np.ndarray:
+    """Return the similarity of each ``(student_text, model_answer)`` pair.
+
+    A stored embedding in ``reference_embeddings`` replaces the model
+    answer of its pair. Every distinct text across all pairs (several
+    sheets at once, for example) is encoded in one batched forward pass,
+    and the similarities of the normalised embeddings are clipped to
+    ``[0, 1]``.
+    """
+
+    if get_model() is None:
+        return np.full(len(pairs), MOCK_SEMANTIC_SCORE)
+    if not pairs:
+        return np.zeros(0)
+
+    refs = list(reference_embeddings or [None] * len(pairs))
+    # Texts repeated across pairs (a shared model answer) are encoded once.
+    index: dict[str, int] = {}
+    for (student, model_answer), ref in zip(pairs, refs):
+        index.setdefault(student, len(index))
+        if ref is None:
+            index.setdefault(model_answer or "", len(index))
+    emb = encode(list(index))
+
+    students = emb[[index[student] for student, _ in pairs]]
+    references = np.stack(
+        [
+            emb[index[model_answer or ""]] if ref is None else decode_embedding(ref)
+            for (_, model_answer), ref in zip(pairs, refs)
+        ]
+    )
+    return np.clip(np.einsum("ij,ij->i", students, references), 0.0, 1.0)
@@ -1,84 +1,150 @@
 from http import HTTPStatus
-from datetime import datetime
 import logging
+import os
 import re
 
-from flask import Blueprint, jsonify, request
+import numpy as np
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy import insert, update
+from sqlalchemy.orm import joinedload, selectinload
 
 from ..extensions import db
+from ..jobs import submit as submit_job
+from . import cache as eval_cache
+from . import cheap_scorer
+from .embeddings import semantic_score_batch
 from ..models import (
     AnswerSheet,
     AnswerSheetStatus,
     Evaluation,
+    Exam,
     ExtractedText,
     QuestionEvaluation,
     UserRole,
+    utcnow,
 )
+from ..ocr import cache as ocr_cache
 from ..preprocess.routes import split_numbered_answers
 from ..rbac import role_required
 
+# Imported once at module load rather than inside each request. The
+# client defers the Gemini SDK import to its first call, so this is cheap.
+try:
+    from gemini_ocr_client import (
+        GeminiConfigError,
+        evaluate_answers_batch,
+        evaluate_answers_with_gemini,
+        extract_texts_concurrently,
+    )
+except ImportError as _client_import_error:  # pragma: no cover - missing Pillow etc.
+
+    class GeminiConfigError(RuntimeError):
+        """Stand-in used when ``gemini_ocr_client`` cannot be imported."""
+
+    def _gemini_unavailable(*args, _exc=_client_import_error, **kwargs):
+        raise GeminiConfigError(f"gemini_ocr_client is unavailable: {_exc}")
+
+    evaluate_answers_batch = _gemini_unavailable
+    evaluate_answers_with_gemini = _gemini_unavailable
+    extract_texts_concurrently = _gemini_unavailable
+
 
 evaluate_bp = Blueprint("evaluate", __name__, url_prefix="/evaluate")
 logger = logging.getLogger(__name__)
 
 
-def semantic_score(student_text: str, model_answer: str) -> float:
-    """Mock semantic similarity function.
+def _aggregate(scores: np.ndarray, keyword: float, grammar: float) -> tuple[float, float]:
+    """Return ``(semantic_overall, unrounded_final_score)``."""
 
-    NOTE: Phase I implementation ignores ``student_text`` and
-    ``model_answer`` and returns a constant score. Replace with
-    real embedding-based similarity in a later phase.
-    """
-    _ = (student_text, model_answer)
-    return 0.78
+    semantic = scores.sum() / scores.size
+    return semantic, (semantic + keyword + grammar) / 3.0
+
+
+# numba is optional; when installed the reduction is compiled (and
+# compiled once here rather than on the first request).
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+else:  # pragma: no cover
+    _aggregate = numba.njit(cache=True)(_aggregate)
+    _aggregate(np.zeros(1), 0.0, 0.0)
 
 
-def evaluate_text_by_questions(text: str, model_answer: str) -> tuple[float, str, list[dict]]:
+def evaluate_text_by_questions(
+    text: str,
+    model_answer: str,
+    answer_embeddings: dict[int, bytes | None] | None = None,
+) -> tuple[float, str, list[dict]]:
     """Compute a mock evaluation using per-question segments.
 
+    ``answer_embeddings`` maps question numbers to precomputed model
+    answer embeddings (``ExamQuestion.answer_embedding``); segments for
+    those questions are compared to them instead of ``model_answer``.
+
     Returns a tuple of (final_score, feedback_text, per_question_details).
     Each item in per_question_details is a dict with keys:
     ``question_no``, ``answer_text``, and ``semantic``.
     """
 
-    segments = split_numbered_answers(text)
+    return evaluate_texts_by_questions([(text, model_answer)], answer_embeddings)[0]
 
-    question_details: list[dict] = []
-    if segments:
-        semantic_scores = []
+
+def evaluate_texts_by_questions(
+    texts: list[tuple[str, str]],
+    answer_embeddings: dict[int, bytes | None] | None = None,
+) -> list[tuple[float, str, list[dict]]]:
+    """:func:`evaluate_text_by_questions` for several ``(text, model_answer)`` pairs.
+
+    The answers of all sheets are embedded in a single batched pass.
+    """
+
+    sheet_segments = [split_numbered_answers(text) or [(1, text)] for text, _ in texts]
+
+    answer_embeddings = answer_embeddings or {}
+    pairs = []
+    refs = []
+    for (_, model_answer), segments in zip(texts, sheet_segments):
         for q_no, ans_text in segments:
-            sem = semantic_score(ans_text, model_answer)
-            semantic_scores.append(sem)
-            question_details.append(
-                {
-                    "question_no": q_no,
-                    "answer_text": ans_text,
-                    "score": sem,
-                }
-            )
-        semantic_overall = sum(semantic_scores) / len(semantic_scores)
-    else:
-        sem = semantic_score(text, model_answer)
-        semantic_overall = sem
+            pairs.append((ans_text, model_answer))
+            refs.append(answer_embeddings.get(q_no))
+    all_scores = semantic_score_batch(pairs, refs)
+
+    results = []
+    offset = 0
+    for segments in sheet_segments:
+        scores = all_scores[offset : offset + len(segments)]
+        offset += len(segments)
+        results.append(_score_segments(segments, scores))
+    return results
+
+
+def _score_segments(segments, scores: np.ndarray) -> tuple[float, str, list[dict]]:
+    # Details and feedback lines are built in the same pass.
+    question_details: list[dict] = []
+    per_q_parts: list[str] = []
+    for (q_no, ans_text), sem in zip(segments, scores.tolist()):
         question_details.append(
             {
-                "question_no": 1,
-                "answer_text": text,
+                "question_no": q_no,
+                "answer_text": ans_text,
                 "score": sem,
             }
         )
+        per_q_parts.append(f"Q{q_no}: {sem:.2f}")
 
     # Mock component scores (same as before but driven by semantic_overall)
     keyword_score = 0.80
     grammar_score = 0.90
 
-    final_score = round((semantic_overall + keyword_score + grammar_score) / 3.0, 2)
+    semantic_overall, final_score = _aggregate(
+        np.ascontiguousarray(scores, dtype=np.float64), keyword_score, grammar_score
+    )
+    semantic_overall = float(semantic_overall)
+    final_score = round(float(final_score), 2)
 
-    per_q_lines = [
-        f"Q{qd['question_no']}: {qd['score']:.2f}" for qd in question_details
-    ]
-    per_q_text = "; ".join(per_q_lines)
+    per_q_text = "; ".join(per_q_parts)
 
     feedback = (
         f"Per-question semantic: {per_q_text}. "
@@ -89,141 +155,102 @@ def evaluate_text_by_questions(text: str, model_answer: str) -> tuple[float, str
     return final_score, feedback, question_details
 
 
-@evaluate_bp.post("/<int:sheet_id>")
-@jwt_required()
-@role_required({UserRole.TEACHER})
-def evaluate_sheet(sheet_id: int):
-    sheet = AnswerSheet.query.get(sheet_id)
-    if sheet is None:
-        return (
-            jsonify({"message": "AnswerSheet not found."}),
-            HTTPStatus.NOT_FOUND,
-        )
+def _answer_embeddings(exam_questions) -> dict[int, bytes | None]:
+    return {eq.question_no: eq.answer_embedding for eq in exam_questions}
 
-    # Allow evaluation on newly uploaded and already graded sheets so that
-    # scores can be recomputed if the evaluation logic or rubric changes.
-    if sheet.status not in {AnswerSheetStatus.PENDING, AnswerSheetStatus.GRADED}:
-        return (
-            jsonify({"message": "Only Pending or Graded answer sheets can be evaluated."}),
-            HTTPStatus.BAD_REQUEST,
-        )
 
-    extracted = sheet.extracted_text
-    if extracted is None:
-        return (
-            jsonify({"message": "No extracted text found. Run OCR and preprocessing first."}),
-            HTTPStatus.BAD_REQUEST,
+def _build_payload_items(exam_questions, segments) -> list[dict]:
+    """Build the per-question Gemini payload for one answer sheet."""
+
+    answers_by_q = {q_no: ans for q_no, ans in segments}
+
+    payload_items = []
+    for eq in exam_questions:
+        payload_items.append(
+            {
+                "question_no": eq.question_no,
+                "question_text": eq.question_text,
+                # Model answers may be None/empty; Gemini
+                # will fall back to question-only grading in
+                # that case.
+                "model_answer": eq.answer_text,
+                "max_marks": float(eq.marks) if eq.marks is not None else None,
+                "student_answer": answers_by_q.get(eq.question_no, ""),
+            }
         )
+    return payload_items
 
-    # First, split the *raw* OCR text into numbered answers so
-    # question numbers are not lost by later grammar correction.
-    segments = split_numbered_answers(extracted.raw_text)
 
-    # Prefer Gemini-based evaluation when exam questions/rubric are defined.
-    sheet_exam = sheet.exam
-    exam_questions = sorted(
-        getattr(sheet_exam, "questions", []),
-        key=lambda q: q.question_no,
-    )
+_QUESTION_NO_RE = re.compile(r"\d+")
 
-    final_score: float
-    feedback: str
-    per_q: list[dict]
 
-    if exam_questions:
-        answers_by_q = {q_no: ans for q_no, ans in segments}
+def _parse_question_no(raw) -> int | None:
+    """Question number from Gemini output: ``3``, ``3.0``, ``"3"``, ``"Q3"``..."""
 
-        try:  # pragma: no cover - external API
-            from gemini_ocr_client import (
-                GeminiConfigError,
-                evaluate_answers_with_gemini,
-            )
+    if isinstance(raw, (int, float)):
+        try:
+            return int(raw)
+        except (OverflowError, ValueError):  # NaN/inf from a lenient JSON parse
+            return None
+    if isinstance(raw, str) and raw.isdecimal():
+        return int(raw)
+    m = _QUESTION_NO_RE.search(str(raw))
+    return int(m.group(0)) if m else None
+
+
+def _parse_gemini_result(gemini_result: dict, payload_items: list[dict]) -> tuple[float, str, list[dict]]:
+    """Turn a Gemini evaluation result into (final_score, feedback, per_q)."""
+
+    questions_out = gemini_result.get("questions", []) or []
+    total_score = gemini_result.get("total_score")
+    answers_by_q = {x["question_no"]: x["student_answer"] for x in payload_items}
+
+    per_q = []
+    for item in questions_out:
+        # Robustly parse question number from Gemini output
+        q_no = _parse_question_no(item.get("question_no"))
+        if q_no is None:
+            continue
+        try:
+            q_score = float(item.get("score", 0.0))
+        except (TypeError, ValueError):
+            q_score = 0.0
+        feedback_text = (item.get("feedback") or "").strip()
+        has_diagram = bool(item.get("has_diagram", False))
+        ans_text = answers_by_q.get(q_no, "")
+        per_q.append(
+            {
+                "question_no": q_no,
+                "answer_text": ans_text,
+                "score": q_score,
+                "feedback": feedback_text,
+                "has_diagram": has_diagram,
+            }
+        )
 
-            payload_items = []
-            for eq in exam_questions:
-                payload_items.append(
-                    {
-                        "question_no": eq.question_no,
-                        "question_text": eq.question_text,
-                        # Model answers may be None/empty; Gemini
-                        # will fall back to question-only grading in
-                        # that case.
-                        "model_answer": eq.answer_text,
-                        "max_marks": float(eq.marks) if eq.marks is not None else None,
-                        "student_answer": answers_by_q.get(eq.question_no, ""),
-                    }
-                )
+    if total_score is None:
+        total_score = sum(p["score"] for p in per_q) if per_q else 0.0
 
-            gemini_result = evaluate_answers_with_gemini(payload_items)
-            questions_out = gemini_result.get("questions", []) or []
-            total_score = gemini_result.get("total_score")
+    final_score = round(float(total_score), 2)
+    per_q_lines = [f"Q{p['question_no']}: {p['score']:.2f}" for p in per_q]
+    feedback = "LLM (Gemini) evaluation. " + "; ".join(per_q_lines)
+    return final_score, feedback, per_q
 
-            per_q = []
-            for item in questions_out:
-                # Robustly parse question number from Gemini output
-                q_no_raw = item.get("question_no")
-                q_no = None
-                try:
-                    if isinstance(q_no_raw, (int, float)):
-                        q_no = int(q_no_raw)
-                    else:
-                        s = str(q_no_raw)
-                        m = re.search(r"\\d+", s)
-                        if m:
-                            q_no = int(m.group(0))
-                except (TypeError, ValueError):  # pragma: no cover - defensive
-                    q_no = None
-                if q_no is None:
-                    continue
-                try:
-                    q_score = float(item.get("score", 0.0))
-                except (TypeError, ValueError):
-                    q_score = 0.0
-                feedback_text = (item.get("feedback") or "").strip()
-                has_diagram = bool(item.get("has_diagram", False))
-                ans_text = next(
-                    (x["student_answer"] for x in payload_items if x["question_no"] == q_no),
-                    "",
-                )
-                per_q.append(
-                    {
-                        "question_no": q_no,
-                        "answer_text": ans_text,
-                        "score": q_score,
-                        "feedback": feedback_text,
-                        "has_diagram": has_diagram,
-                    }
-                )
 
-            if total_score is None:
-                total_score = sum(p["score"] for p in per_q) if per_q else 0.0
+def _save_evaluation(
+    sheet: AnswerSheet,
+    extracted: ExtractedText,
+    exam_questions,
+    final_score: float,
+    feedback: str,
+    per_q: list[dict],
+) -> Evaluation:
+    """Upsert the Evaluation and QuestionEvaluation rows for a sheet.
 
-            final_score = round(float(total_score), 2)
-            per_q_lines = [f"Q{p['question_no']}: {p['score']:.2f}" for p in per_q]
-            feedback = "LLM (Gemini) evaluation. " + "; ".join(per_q_lines)
-        except GeminiConfigError as exc:
-            logger.warning("Gemini evaluation misconfigured, falling back to mock scoring: %s", exc)
-            # Fallback: simple heuristic based on the full text; since
-            # we may not have a reference answer, pass the raw text
-            # again as a placeholder.
-            final_score, feedback, per_q = evaluate_text_by_questions(
-                extracted.raw_text,
-                extracted.raw_text,
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Gemini evaluation failed, falling back to mock scoring: %s", exc)
-            final_score, feedback, per_q = evaluate_text_by_questions(
-                extracted.raw_text,
-                extracted.raw_text,
-            )
-    else:
-        # No structured exam questions; fall back to simple heuristic scoring.
-        final_score, feedback, per_q = evaluate_text_by_questions(
-            extracted.raw_text,
-            extracted.raw_text,
-        )
+    Marks the sheet as graded; the caller is responsible for committing.
+    """
 
-    evaluation = Evaluation.query.filter_by(text_id=extracted.text_id).first()
+    evaluation = extracted.evaluation
     if evaluation is None:
         evaluation = Evaluation(
             text_id=extracted.text_id,
@@ -232,7 +259,6 @@ def evaluate_sheet(sheet_id: int):
             model_answer_ref="Evaluated via Gemini API.",
             score=final_score,
             feedback=feedback,
-            evaluated_on=datetime.utcnow(),
         )
         db.session.add(evaluation)
         db.session.flush()
@@ -240,12 +266,19 @@ def evaluate_sheet(sheet_id: int):
         evaluation.model_answer_ref = "Evaluated via Gemini API."
         evaluation.score = final_score
         evaluation.feedback = feedback
-        evaluation.evaluated_on = datetime.utcnow()
+        # Set explicitly so the timestamp moves even when the scores
+        # are unchanged (onupdate only fires for modified rows).
+        evaluation.evaluated_on = utcnow()
         db.session.flush()
 
     # Upsert per-question evaluations linked to this evaluation,
     # aligned to the exam's defined questions when available.
+    # Changes are collected and written with one executemany INSERT for
+    # new rows and one bulk UPDATE by primary key for existing rows,
+    # instead of a statement per question.
     existing_q = {qe.question_no: qe for qe in evaluation.question_scores}
+    new_rows: list[dict] = []
+    update_rows: list[dict] = []
 
     per_q_by_no: dict[int, dict] = {}
     for item in per_q:
@@ -274,18 +307,24 @@ def evaluate_sheet(sheet_id: int):
 
             qe = existing_q.get(eq.question_no)
             if qe is None:
-                qe = QuestionEvaluation(
-                    eval_id=evaluation.eval_id,
-                    question_no=eq.question_no,
-                    score=q_score,
-                    feedback=feedback_text,
-                    has_diagram=has_diagram,
+                new_rows.append(
+                    {
+                        "eval_id": evaluation.eval_id,
+                        "question_no": eq.question_no,
+                        "score": q_score,
+                        "feedback": feedback_text,
+                        "has_diagram": has_diagram,
+                    }
                 )
-                db.session.add(qe)
             else:
-                qe.score = q_score
-                qe.feedback = feedback_text
-                qe.has_diagram = has_diagram
+                update_rows.append(
+                    {
+                        "id": qe.id,
+                        "score": q_score,
+                        "feedback": feedback_text,
+                        "has_diagram": has_diagram,
+                    }
+                )
     else:
         # Legacy behaviour: rely solely on numbered segments
         for item in per_q:
@@ -297,32 +336,348 @@ def evaluate_sheet(sheet_id: int):
             qe = existing_q.get(q_no)
             has_diagram = bool(item.get("has_diagram", False))
             if qe is None:
-                qe = QuestionEvaluation(
-                    eval_id=evaluation.eval_id,
-                    question_no=q_no,
-                    score=q_score,
-                    has_diagram=has_diagram,
+                new_rows.append(
+                    {
+                        "eval_id": evaluation.eval_id,
+                        "question_no": q_no,
+                        "score": q_score,
+                        "feedback": None,
+                        "has_diagram": has_diagram,
+                    }
                 )
-                db.session.add(qe)
             else:
-                qe.score = q_score
-                qe.has_diagram = has_diagram
+                update_rows.append(
+                    {"id": qe.id, "score": q_score, "has_diagram": has_diagram}
+                )
+
+    if new_rows:
+        db.session.execute(insert(QuestionEvaluation), new_rows)
+    if update_rows:
+        db.session.execute(update(QuestionEvaluation), update_rows)
+    if new_rows or update_rows:
+        # Bulk statements bypass the loaded objects; reload them on next
+        # access so callers see the new values.
+        for qe in existing_q.values():
+            db.session.expire(qe)
+        db.session.expire(evaluation, ["question_scores"])
 
     sheet.status = AnswerSheetStatus.GRADED
+    return evaluation
+
+
+def _ocr_sheets_concurrently(sheets: list[AnswerSheet]) -> None:
+    """Run Gemini OCR for sheets without extracted text, concurrently.
+
+    Cached results are reused; the remaining files are sent to Gemini
+    in parallel (bounded by ``OCR_CONCURRENCY``). Sheets whose OCR fails
+    are left without extracted text.
+    """
+
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+
+    texts: dict[int, str] = {}
+    to_run: list[tuple[AnswerSheet, str, tuple | None]] = []
+    for sheet in sheets:
+        abs_path = os.path.join(upload_folder, os.path.basename(sheet.file_path))
+        try:
+            key = ocr_cache.cache_key(abs_path, ocr_cache.DEFAULT_MODEL)
+        except OSError as exc:
+            logger.warning("Answer sheet file missing for sheet %s: %s", sheet.sheet_id, exc)
+            continue
+        cached = ocr_cache.get(key)
+        if cached is not None:
+            texts[sheet.sheet_id] = cached
+        else:
+            to_run.append((sheet, abs_path, key))
+
+    results = extract_texts_concurrently([abs_path for _, abs_path, _ in to_run])
+    for (sheet, _, key), result in zip(to_run, results):
+        if isinstance(result, BaseException):
+            logger.warning("Gemini OCR failed for sheet %s: %s", sheet.sheet_id, result)
+            continue
+        if result:
+            ocr_cache.put(key, result)
+            texts[sheet.sheet_id] = result
+
+    for sheet in sheets:
+        raw_text = texts.get(sheet.sheet_id)
+        if not raw_text:
+            continue
+        db.session.add(
+            ExtractedText(
+                sheet=sheet,
+                raw_text=raw_text,
+                cleaned_text=raw_text.strip().lower(),
+                extraction_confidence=0.98,
+            )
+        )
+    db.session.flush()
+
+
+def _evaluate(sheet: AnswerSheet) -> Evaluation:
+    """Score an answer sheet (Gemini first, heuristic fallback) and store it.
+
+    The sheet must already have extracted text. The caller commits.
+    """
+
+    extracted = sheet.extracted_text
+
+    # First, split the *raw* OCR text into numbered answers so
+    # question numbers are not lost by later grammar correction.
+    segments = split_numbered_answers(extracted.raw_text)
+
+    # Prefer Gemini-based evaluation when exam questions/rubric are defined.
+    sheet_exam = sheet.exam
+    exam_questions = list(sheet_exam.questions)
+
+    final_score: float
+    feedback: str
+    per_q: list[dict]
+
+    if exam_questions:
+        try:  # pragma: no cover - external API
+            payload_items = _build_payload_items(exam_questions, segments)
+            # Blank and near-verbatim answers are scored locally and
+            # previously graded answers come from the cache; only the
+            # rest are sent to Gemini.
+            local_questions, uncertain = cheap_scorer.triage(payload_items)
+            cached_questions, uncertain = eval_cache.lookup(uncertain)
+            gemini_result = evaluate_answers_with_gemini(uncertain) if uncertain else None
+            eval_cache.store(uncertain, gemini_result)
+            final_score, feedback, per_q = _parse_gemini_result(
+                cheap_scorer.merge_results(local_questions + cached_questions, gemini_result),
+                payload_items,
+            )
+        except GeminiConfigError as exc:
+            logger.warning("Gemini evaluation misconfigured, falling back to mock scoring: %s", exc)
+            # Fallback: simple heuristic based on the full text. Questions
+            # with a stored model-answer embedding are compared to it;
+            # the rest use the raw text again as a placeholder.
+            final_score, feedback, per_q = evaluate_text_by_questions(
+                extracted.raw_text,
+                extracted.raw_text,
+                _answer_embeddings(exam_questions),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Gemini evaluation failed, falling back to mock scoring: %s", exc)
+            final_score, feedback, per_q = evaluate_text_by_questions(
+                extracted.raw_text,
+                extracted.raw_text,
+                _answer_embeddings(exam_questions),
+            )
+    else:
+        # No structured exam questions; fall back to simple heuristic scoring.
+        final_score, feedback, per_q = evaluate_text_by_questions(
+            extracted.raw_text,
+            extracted.raw_text,
+        )
+
+    return _save_evaluation(sheet, extracted, exam_questions, final_score, feedback, per_q)
+
 
+def _evaluation_payload(sheet: AnswerSheet, evaluation: Evaluation) -> dict:
+    return {
+        "eval_id": evaluation.eval_id,
+        "text_id": evaluation.text_id,
+        "model_answer_ref": evaluation.model_answer_ref,
+        "score": evaluation.score,
+        "feedback": evaluation.feedback,
+        "evaluated_on": evaluation.evaluated_on.isoformat(),
+        "sheet_status": sheet.status.value,
+    }
+
+
+def _extracted_text_options():
+    """Eager loads for a sheet's extracted text, evaluation and its rows."""
+
+    return selectinload(AnswerSheet.extracted_text).selectinload(
+        ExtractedText.evaluation
+    ).selectinload(Evaluation.question_scores)
+
+
+def _load_sheet(sheet_id: int) -> AnswerSheet | None:
+    """Load a sheet with everything :func:`_evaluate` reads.
+
+    The exam, its questions, the extracted text and any existing
+    evaluation with its per-question rows come back in a few queries
+    up front instead of one lazy load each.
+    """
+
+    return db.session.execute(
+        db.select(AnswerSheet)
+        .options(
+            joinedload(AnswerSheet.exam).selectinload(Exam.questions),
+            _extracted_text_options(),
+        )
+        .where(AnswerSheet.sheet_id == sheet_id)
+    ).unique().scalar_one_or_none()
+
+
+def _run_evaluation(sheet_id: int) -> dict:
+    """Background job body for :func:`evaluate_sheet`."""
+
+    sheet = _load_sheet(sheet_id)
+    evaluation = _evaluate(sheet)
     db.session.commit()
+    return _evaluation_payload(sheet, evaluation)
+
+
+@evaluate_bp.post("/<int:sheet_id>")
+@jwt_required()
+@role_required({UserRole.TEACHER})
+def evaluate_sheet(sheet_id: int):
+    """Evaluate one answer sheet.
+
+    By default the evaluation runs on the shared worker pool and the
+    response is ``202 Accepted`` with a ``job_id`` to poll at
+    ``GET /jobs/<job_id>``. Pass ``?sync=1`` to evaluate inline and get
+    the evaluation back directly (``201 Created``).
+    """
+
+    sheet = _load_sheet(sheet_id)
+    if sheet is None:
+        return (
+            jsonify({"message": "AnswerSheet not found."}),
+            HTTPStatus.NOT_FOUND,
+        )
+
+    # Allow evaluation on newly uploaded and already graded sheets so that
+    # scores can be recomputed if the evaluation logic or rubric changes.
+    if sheet.status not in {AnswerSheetStatus.PENDING, AnswerSheetStatus.GRADED}:
+        return (
+            jsonify({"message": "Only Pending or Graded answer sheets can be evaluated."}),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    extracted = sheet.extracted_text
+    if extracted is None:
+        return (
+            jsonify({"message": "No extracted text found. Run OCR and preprocessing first."}),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    if request.args.get("sync", "").lower() in {"1", "true", "yes"}:
+        evaluation = _evaluate(sheet)
+        db.session.commit()
+        return jsonify(_evaluation_payload(sheet, evaluation)), HTTPStatus.CREATED
 
+    job_id = submit_job(_run_evaluation, sheet.sheet_id)
     return (
-        jsonify(
+        jsonify({"job_id": job_id, "sheet_id": sheet.sheet_id}),
+        HTTPStatus.ACCEPTED,
+    )
+
+
+@evaluate_bp.post("/exam/<int:exam_id>")
+@jwt_required()
+@role_required({UserRole.TEACHER})
+def evaluate_exam(exam_id: int):
+    """Evaluate all pending sheets of an exam with batched Gemini calls.
+
+    When Gemini is enabled (``USE_GEMINI``), sheets without extracted
+    text are OCR'd concurrently first; any that still have no text are
+    skipped. Sheets for which Gemini returns no evaluation result fall
+    back to the heuristic scoring used by :func:`evaluate_sheet`.
+    """
+
+    exam = db.session.get(Exam, exam_id)
+    if exam is None:
+        return (
+            jsonify({"message": "Exam not found."}),
+            HTTPStatus.NOT_FOUND,
+        )
+
+    sheets = (
+        AnswerSheet.query.filter_by(exam_id=exam_id, status=AnswerSheetStatus.PENDING)
+        .options(_extracted_text_options())
+        .order_by(AnswerSheet.sheet_id.asc())
+        .all()
+    )
+
+    missing_text = [s for s in sheets if s.extracted_text is None]
+    use_gemini = os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}
+    if missing_text and use_gemini:
+        try:  # pragma: no cover - external API
+            _ocr_sheets_concurrently(missing_text)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Concurrent Gemini OCR failed: %s", exc)
+
+    ready = [s for s in sheets if s.extracted_text is not None]
+    skipped = [s.sheet_id for s in sheets if s.extracted_text is None]
+
+    exam_questions = list(exam.questions)
+
+    payloads = [
+        _build_payload_items(exam_questions, split_numbered_answers(s.extracted_text.raw_text))
+        for s in ready
+    ]
+    results: list[dict | None] = [None] * len(ready)
+
+    if exam_questions and ready:
+        # Score blank/near-verbatim answers locally, reuse cached grades
+        # and only batch the remaining questions; sheets with nothing
+        # left to grade skip Gemini.
+        triaged = []
+        for p in payloads:
+            local_questions, uncertain = cheap_scorer.triage(p)
+            cached_questions, uncertain = eval_cache.lookup(uncertain)
+            triaged.append((local_questions + cached_questions, uncertain))
+        to_send = [i for i, (_, uncertain) in enumerate(triaged) if uncertain]
+        for i, (known_questions, uncertain) in enumerate(triaged):
+            if not uncertain:
+                results[i] = cheap_scorer.merge_results(known_questions, None)
+
+        try:  # pragma: no cover - external API
+            if to_send:
+                batch = evaluate_answers_batch([triaged[i][1] for i in to_send])
+                for i, gemini_result in zip(to_send, batch):
+                    if gemini_result is not None:
+                        eval_cache.store(triaged[i][1], gemini_result)
+                        results[i] = cheap_scorer.merge_results(triaged[i][0], gemini_result)
+        except GeminiConfigError as exc:
+            logger.warning("Gemini evaluation misconfigured, falling back to mock scoring: %s", exc)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Gemini batch evaluation failed, falling back to mock scoring: %s", exc)
+
+    # Sheets Gemini did not grade are scored heuristically, all in one
+    # batched embedding pass.
+    fallback = [i for i, r in enumerate(results) if r is None]
+    heuristic = dict(
+        zip(
+            fallback,
+            evaluate_texts_by_questions(
+                [(ready[i].extracted_text.raw_text,) * 2 for i in fallback],
+                _answer_embeddings(exam_questions),
+            ),
+        )
+    )
+
+    evaluated = []
+    for i, (sheet, payload_items, gemini_result) in enumerate(zip(ready, payloads, results)):
+        extracted = sheet.extracted_text
+        if gemini_result is not None:
+            final_score, feedback, per_q = _parse_gemini_result(gemini_result, payload_items)
+        else:
+            final_score, feedback, per_q = heuristic[i]
+
+        evaluation = _save_evaluation(sheet, extracted, exam_questions, final_score, feedback, per_q)
+        evaluated.append(
             {
+                "sheet_id": sheet.sheet_id,
                 "eval_id": evaluation.eval_id,
-                "text_id": evaluation.text_id,
-                "model_answer_ref": evaluation.model_answer_ref,
                 "score": evaluation.score,
-                "feedback": evaluation.feedback,
-                "evaluated_on": evaluation.evaluated_on.isoformat(),
-                "sheet_status": sheet.status.value,
+            }
+        )
+
+    db.session.commit()
+
+    return (
+        jsonify(
+            {
+                "exam_id": exam_id,
+                "evaluated": evaluated,
+                "skipped_sheet_ids": skipped,
             }
         ),
-        HTTPStatus.CREATED,
+        HTTPStatus.OK,
     )
@@ -0,0 +1,60 @@
+"""In-process cache of the exam list shown on the teacher pages.
+
+The dashboard, upload and evaluation pages all list every exam, and
+exams rarely change. :func:`all_exams` keeps the ``(exam_id, subject,
+max_marks)`` rows for ``EXAM_LIST_CACHE_TTL`` seconds (default 60; 0
+disables). Any ORM insert, update or delete of an exam clears it in
+this process; other worker processes pick the change up when their
+copy expires.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import event
+
+from ..extensions import db
+from ..models import Exam
+
+
+_lock = threading.Lock()
+_cached: tuple[float, list] | None = None
+
+
+def _ttl() -> float:
+    return float(os.environ.get("EXAM_LIST_CACHE_TTL", "60"))
+
+
+def all_exams() -> list:
+    """Return every exam as ``(exam_id, subject, max_marks)`` rows, by id."""
+
+    global _cached
+
+    now = time.monotonic()
+    with _lock:
+        if _cached is not None and _cached[0] > now:
+            return _cached[1]
+
+    rows = db.session.execute(
+        db.select(Exam.exam_id, Exam.subject, Exam.max_marks).order_by(Exam.exam_id.asc())
+    ).all()
+    ttl = _ttl()
+    if ttl > 0:
+        with _lock:
+            _cached = (now + ttl, rows)
+    return rows
+
+
+def invalidate() -> None:
+    global _cached
+
+    with _lock:
+        _cached = None
+
+
+@event.listens_for(Exam, "after_insert")
+@event.listens_for(Exam, "after_update")
+@event.listens_for(Exam, "after_delete")
+def _exam_written(mapper, connection, target) -> None:
+    invalidate()
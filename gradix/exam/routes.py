@@ -3,8 +3,19 @@ from http import HTTPStatus
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 
+from ..evaluate.embeddings import encode_answer
 from ..extensions import db
-from ..models import Exam, ExamQuestion, Report, UserRole
+from ..models import (
+    AnswerSheet,
+    Evaluation,
+    Exam,
+    ExamQuestion,
+    ExtractedText,
+    QuestionEvaluation,
+    QuestionStudentComment,
+    Report,
+    UserRole,
+)
 from ..rbac import role_required
 
 
@@ -18,26 +29,33 @@ def _delete_exam_with_children(exam: Exam) -> None:
     - Exam questions
     - Answer sheets (and their extracted text, evaluations, and question scores)
     - Reports linked to this exam
+    - Student comments on the exam's answer sheets
     """
 
-    # Delete answer sheets and their nested objects
-    for sheet in list(exam.answer_sheets):
-        extracted = sheet.extracted_text
-        if extracted is not None:
-            evaluation = extracted.evaluation
-            if evaluation is not None:
-                # QuestionEvaluation rows are deleted via cascade from Evaluation
-                db.session.delete(evaluation)
-            db.session.delete(extracted)
-
-        db.session.delete(sheet)
-
-    # Delete reports linked to this exam
-    Report.query.filter_by(exam_id=exam.exam_id).delete(synchronize_session=False)
-
-    # Delete questions explicitly (in addition to backref cascade, for clarity)
-    for q in list(exam.questions):
-        db.session.delete(q)
+    # Delete children with one bulk DELETE per table (bottom-up, so
+    # foreign keys are never violated) instead of walking each sheet's
+    # relationships, which cost several SELECTs per answer sheet.
+    sheet_ids = db.select(AnswerSheet.sheet_id).where(AnswerSheet.exam_id == exam.exam_id)
+    text_ids = db.select(ExtractedText.text_id).where(ExtractedText.sheet_id.in_(sheet_ids))
+    eval_ids = db.select(Evaluation.eval_id).where(Evaluation.text_id.in_(text_ids))
+
+    for query in (
+        QuestionEvaluation.query.filter(QuestionEvaluation.eval_id.in_(eval_ids)),
+        # Filter on the parent ids, not the table's own ids: MySQL cannot
+        # DELETE from a table that the subquery also selects from.
+        Evaluation.query.filter(Evaluation.text_id.in_(text_ids)),
+        ExtractedText.query.filter(ExtractedText.sheet_id.in_(sheet_ids)),
+        QuestionStudentComment.query.filter(QuestionStudentComment.sheet_id.in_(sheet_ids)),
+        AnswerSheet.query.filter(AnswerSheet.exam_id == exam.exam_id),
+        # Reports linked to this exam
+        Report.query.filter_by(exam_id=exam.exam_id),
+        ExamQuestion.query.filter_by(exam_id=exam.exam_id),
+    ):
+        query.delete(synchronize_session=False)
+
+    # Forget any collections loaded before the bulk deletes so the ORM
+    # cascade below does not try to delete those rows a second time.
+    db.session.expire(exam, ["questions", "answer_sheets", "reports"])
 
     # Finally delete the exam itself
     db.session.delete(exam)
@@ -107,16 +125,12 @@ def create_exam():
                 # satisfies existing NOT NULL constraints in
                 # production MySQL databases.
                 answer_text=answer_text or "",
+                answer_embedding=encode_answer(answer_text),
                 marks=marks_val,
             )
             db.session.add(eq)
-            rubric_parts.append(
-                (
-                    f"Q{q_no}"
-                    + (f" ({marks_val} marks)" if marks_val is not None else "")
-                    + f". {question_text}"
-                )
-            )
+            marks_part = f" ({marks_val} marks)" if marks_val is not None else ""
+            rubric_parts.append(f"Q{q_no}{marks_part}. {question_text}")
 
     # If we built a rubric from questions, prefer that; else fall back
     if rubric_parts:
@@ -139,21 +153,55 @@ def create_exam():
     )
 
 
+LIST_DEFAULT_LIMIT = 50
+LIST_MAX_LIMIT = 500
+
+
 @exam_bp.get("/list")
 @jwt_required()
 def list_exams():
-    exams = Exam.query.order_by(Exam.exam_id.desc()).all()
+    """Return one page of exams, newest first.
+
+    Keyset pagination: pass the previous response's ``next_cursor`` as
+    ``?cursor=`` to get the next page (``?limit=`` rows, default 50). Each
+    page is a primary-key range seek, so its cost does not grow with the
+    table and no ``COUNT(*)`` is needed.
+    """
+
+    try:
+        limit = int(request.args.get("limit", LIST_DEFAULT_LIMIT))
+        cursor = request.args.get("cursor", type=int)
+        if request.args.get("cursor") and cursor is None:
+            raise ValueError
+    except ValueError:
+        return (
+            jsonify({"message": "'limit' and 'cursor' must be integers."}),
+            HTTPStatus.BAD_REQUEST,
+        )
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+
+    query = db.select(Exam.exam_id, Exam.subject, Exam.max_marks, Exam.rubric_details)
+    if cursor is not None:
+        query = query.where(Exam.exam_id < cursor)
+    # One extra row tells us whether another page exists.
+    rows = db.session.execute(query.order_by(Exam.exam_id.desc()).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
     return (
         jsonify(
-            [
-                {
-                    "exam_id": e.exam_id,
-                    "subject": e.subject,
-                    "max_marks": e.max_marks,
-                    "rubric_details": e.rubric_details,
-                }
-                for e in exams
-            ]
+            {
+                "exams": [
+                    {
+                        "exam_id": r.exam_id,
+                        "subject": r.subject,
+                        "max_marks": r.max_marks,
+                        "rubric_details": r.rubric_details,
+                    }
+                    for r in rows
+                ],
+                "next_cursor": rows[-1].exam_id if has_more else None,
+            }
         ),
         HTTPStatus.OK,
     )
@@ -162,7 +210,7 @@ def list_exams():
 @exam_bp.get("/<int:exam_id>")
 @jwt_required()
 def get_exam(exam_id: int):
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
     questions = (
         ExamQuestion.query.filter_by(exam_id=exam.exam_id)
         .order_by(ExamQuestion.question_no.asc())
@@ -196,7 +244,7 @@ def get_exam(exam_id: int):
 @jwt_required()
 @role_required({UserRole.ADMIN, UserRole.TEACHER})
 def delete_exam(exam_id: int):
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
     _delete_exam_with_children(exam)
     db.session.commit()
     return ("", HTTPStatus.NO_CONTENT)
@@ -0,0 +1,30 @@
+"""Helpers shared by the local Hugging Face models (TrOCR, grammar)."""
+
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+
+def maybe_compile(model):
+    """Compile ``model.forward`` with ``torch.compile`` if ``HF_TORCH_COMPILE=1``.
+
+    ``generate`` calls ``forward`` once per decoded token, so that is what
+    gets compiled (wrapping the module itself would bypass it). Opt-in
+    because the first call pays the compile time and some transformers
+    versions fall back to eager with graph breaks anyway.
+    """
+
+    if os.environ.get("HF_TORCH_COMPILE", "0") != "1":
+        return model
+
+    import torch  # type: ignore
+
+    if not hasattr(torch, "compile"):
+        return model
+    try:
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("torch.compile failed, using the eager model: %s", exc)
+    return model
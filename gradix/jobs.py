@@ -0,0 +1,118 @@
+"""Run slow work (Gemini OCR/evaluation) on a shared thread pool.
+
+Routes call :func:`submit` with a function and its arguments and
+return the job id to the client straight away (``202 Accepted``); the
+client then polls ``GET /jobs/<job_id>`` for the result. Job state is
+stored in the ``jobs`` table so any worker process can answer a poll.
+
+The pool itself is created in :func:`gradix.create_app` and stored in
+``app.extensions["ocr_pool"]``; its size is set by ``OCR_WORKERS``.
+Short write-behind commits (:func:`persist`) use the separate
+``app.extensions["writer_pool"]`` so they never queue behind OCR jobs.
+"""
+
+import json
+import logging
+from http import HTTPStatus
+from uuid import uuid4
+
+from flask import Blueprint, current_app, jsonify
+from flask_jwt_extended import jwt_required
+
+from .extensions import db
+from .models import Job, JobStatus, UserRole, utcnow
+from .rbac import role_required
+
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+logger = logging.getLogger(__name__)
+
+
+def _run_job(app, job_id: str, fn, args, kwargs) -> None:
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        job.status = JobStatus.RUNNING
+        db.session.commit()
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Job %s (%s) failed: %s", job_id, getattr(fn, "__name__", fn), exc)
+            db.session.rollback()
+            job = db.session.get(Job, job_id)
+            job.status = JobStatus.FAILED
+            job.error = str(exc)
+        else:
+            job = db.session.get(Job, job_id)
+            job.status = JobStatus.DONE
+            job.result = json.dumps(result) if result is not None else None
+
+        job.finished_at = utcnow()
+        db.session.commit()
+
+
+def _run_write(app, fn, args, kwargs) -> None:
+    with app.app_context():
+        try:
+            fn(*args, **kwargs)
+            db.session.commit()
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Background write %s failed: %s", getattr(fn, "__name__", fn), exc)
+            db.session.rollback()
+
+
+def persist(fn, *args, **kwargs) -> None:
+    """Run the database write ``fn(*args, **kwargs)`` and commit it off-request.
+
+    The caller builds its response from values it already holds, so the
+    commit overlaps with sending the response. ``fn`` gets a fresh
+    application context (and session) and should load rows by id.
+    """
+
+    app = current_app._get_current_object()
+    app.extensions["writer_pool"].submit(_run_write, app, fn, args, kwargs)
+
+
+def submit(fn, *args, **kwargs) -> str:
+    """Queue ``fn(*args, **kwargs)`` on the worker pool and return its job id.
+
+    ``fn`` runs inside a fresh application context and must return a
+    JSON-serialisable value (or ``None``). It should reload any ORM
+    objects it needs from ids rather than receive them as arguments.
+    """
+
+    job = Job(job_id=uuid4().hex, name=getattr(fn, "__name__", str(fn)))
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    app.extensions["ocr_pool"].submit(_run_job, app, job.job_id, fn, args, kwargs)
+    return job.job_id
+
+
+@jobs_bp.get("/<job_id>")
+@jwt_required()
+@role_required({UserRole.TEACHER})
+def get_job(job_id: str):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return (
+            jsonify({"message": "Job not found."}),
+            HTTPStatus.NOT_FOUND,
+        )
+
+    return (
+        jsonify(
+            {
+                "job_id": job.job_id,
+                "name": job.name,
+                "status": job.status.value,
+                "result": json.loads(job.result) if job.result else None,
+                "error": job.error,
+                "created_at": job.created_at.isoformat(),
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            }
+        ),
+        HTTPStatus.OK,
+    )
@@ -0,0 +1,43 @@
+"""orjson-backed JSON provider for ``jsonify`` and ``app.json``.
+
+Installed by ``create_app`` when ``orjson`` is importable; otherwise
+Flask's default provider is kept. Output matches the default provider
+(sorted keys, compact separators); anything orjson cannot encode
+falls back to the stdlib path. NumPy scalars and arrays (from the
+scoring code) are encoded natively.
+"""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _encode(self, obj: Any) -> bytes | None:
+        try:
+            return orjson.dumps(obj, default=self.default, option=_OPTIONS)
+        except TypeError:
+            return None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not kwargs:
+            data = self._encode(obj)
+            if data is not None:
+                return data.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        data = self._encode(obj)
+        if data is None:
+            return super().response(obj)
+        return self._app.response_class(data, mimetype=self.mimetype)
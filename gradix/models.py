@@ -1,9 +1,45 @@
 from enum import Enum
 from datetime import datetime
 
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
 from .extensions import db
 
 
+class utcnow(FunctionElement):  # noqa: N801 - reads like a SQL function
+    """Current UTC time evaluated by the database.
+
+    Used as a column default so timestamps come from the database clock
+    (consistent across app servers) while staying in UTC like the
+    ``datetime.utcnow`` values stored elsewhere.
+    """
+
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP is UTC on SQLite but only has second precision.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+@compiles(utcnow, "mysql")
+def _utcnow_mysql(element, compiler, **kw):
+    return "UTC_TIMESTAMP(6)"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
 class UserRole(str, Enum):
     ADMIN = "ADMIN"
     TEACHER = "TEACHER"
@@ -41,6 +77,8 @@ class Exam(db.Model):
 
 class ExamQuestion(db.Model):
     __tablename__ = "exam_questions"
+    # Questions are always fetched per exam in question order.
+    __table_args__ = (db.Index("ix_exam_questions_exam_qno", "exam_id", "question_no"),)
 
     id = db.Column(db.Integer, primary_key=True)
     exam_id = db.Column(db.Integer, db.ForeignKey("exams.exam_id"), nullable=False)
@@ -54,6 +92,10 @@ class ExamQuestion(db.Model):
     # grade using only the question text and max marks. When a
     # teacher later supplies a model answer, it can be stored here.
     answer_text = db.Column(db.Text, nullable=True)
+    # float32 embedding of ``answer_text`` (see gradix.evaluate.embeddings),
+    # computed once when the question is saved. NULL when there is no
+    # model answer or no embedding model configured.
+    answer_embedding = db.Column(db.LargeBinary, nullable=True)
     marks = db.Column(db.Float, nullable=True)
 
     # Optional grouping for OR-type questions. When two or more
@@ -65,7 +107,11 @@ class ExamQuestion(db.Model):
 
     exam = db.relationship(
         "Exam",
-        backref=db.backref("questions", cascade="all, delete-orphan"),
+        backref=db.backref(
+            "questions",
+            cascade="all, delete-orphan",
+            order_by="ExamQuestion.question_no",
+        ),
     )
 
 
@@ -77,13 +123,21 @@ class AnswerSheetStatus(str, Enum):
 
 class AnswerSheet(db.Model):
     __tablename__ = "answer_sheets"
+    # Sheets are listed per exam, usually filtered by status, newest
+    # first; the dashboard lists all sheets by upload date, and report
+    # pages look up one student's sheets for an exam by status.
+    __table_args__ = (
+        db.Index("ix_answer_sheets_exam_status_date", "exam_id", "status", "upload_date"),
+        db.Index("ix_answer_sheets_upload_date", "upload_date"),
+        db.Index("ix_answer_sheets_student_exam_status", "student_id", "exam_id", "status"),
+    )
 
     sheet_id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(
-        db.Integer, db.ForeignKey("students.student_id"), nullable=False
+        db.Integer, db.ForeignKey("students.student_id"), nullable=False, index=True
     )
     exam_id = db.Column(db.Integer, db.ForeignKey("exams.exam_id"), nullable=False)
-    upload_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    upload_date = db.Column(db.DateTime, nullable=False, default=utcnow())
     file_path = db.Column(db.String(500), nullable=False)
     status = db.Column(
         db.Enum(AnswerSheetStatus), nullable=False, default=AnswerSheetStatus.PENDING
@@ -103,6 +157,9 @@ class ExtractedText(db.Model):
     raw_text = db.Column(db.Text, nullable=False)
     cleaned_text = db.Column(db.Text, nullable=False)
     extraction_confidence = db.Column(db.Float, nullable=False)
+    # SHA-256 of the sheet file the text was extracted from; lets OCR
+    # reruns on an unchanged file return the stored text.
+    file_hash = db.Column(db.String(64), nullable=True)
 
     sheet = db.relationship(
         "AnswerSheet", backref=db.backref("extracted_text", uselist=False)
@@ -119,7 +176,7 @@ class Evaluation(db.Model):
     model_answer_ref = db.Column(db.Text, nullable=False)
     score = db.Column(db.Float, nullable=False)
     feedback = db.Column(db.Text, nullable=True)
-    evaluated_on = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    evaluated_on = db.Column(db.DateTime, nullable=False, default=utcnow(), onupdate=utcnow())
     # Optional: name of the teacher who last reviewed/overrode this
     # evaluation via the web review UI. Auto-evaluated sheets will
     # typically leave this as NULL.
@@ -135,7 +192,9 @@ class QuestionEvaluation(db.Model):
     __tablename__ = "question_evaluations"
 
     id = db.Column(db.Integer, primary_key=True)
-    eval_id = db.Column(db.Integer, db.ForeignKey("evaluations.eval_id"), nullable=False)
+    eval_id = db.Column(
+        db.Integer, db.ForeignKey("evaluations.eval_id"), nullable=False, index=True
+    )
     question_no = db.Column(db.Integer, nullable=False)
     score = db.Column(db.Float, nullable=False)
     feedback = db.Column(db.Text, nullable=True)
@@ -145,21 +204,32 @@ class QuestionEvaluation(db.Model):
 
     evaluation = db.relationship(
         "Evaluation",
-        backref=db.backref("question_scores", cascade="all, delete-orphan"),
+        backref=db.backref(
+            "question_scores",
+            cascade="all, delete-orphan",
+            order_by=lambda: (QuestionEvaluation.question_no, QuestionEvaluation.id),
+        ),
     )
 
 
 class Report(db.Model):
     __tablename__ = "reports"
+    # Reports are looked up by (student, exam) and aggregated per exam.
+    # There is at most one report per student and exam.
+    __table_args__ = (
+        db.Index("uq_reports_student_exam", "student_id", "exam_id", unique=True),
+    )
 
     report_id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(
         db.Integer, db.ForeignKey("students.student_id"), nullable=False
     )
-    exam_id = db.Column(db.Integer, db.ForeignKey("exams.exam_id"), nullable=False)
+    exam_id = db.Column(
+        db.Integer, db.ForeignKey("exams.exam_id"), nullable=False, index=True
+    )
     total_score = db.Column(db.Float, nullable=False)
     remarks = db.Column(db.Text, nullable=True)
-    generated_on = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    generated_on = db.Column(db.DateTime, nullable=False, default=utcnow(), onupdate=utcnow())
 
     student = db.relationship("Student", backref="reports")
     exam = db.relationship("Exam", backref="reports")
@@ -170,7 +240,9 @@ class QuestionStudentComment(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey("students.student_id"), nullable=False)
-    sheet_id = db.Column(db.Integer, db.ForeignKey("answer_sheets.sheet_id"), nullable=False)
+    sheet_id = db.Column(
+        db.Integer, db.ForeignKey("answer_sheets.sheet_id"), nullable=False, index=True
+    )
     question_no = db.Column(db.Integer, nullable=False)
     comment = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -187,3 +259,80 @@ class QuestionStudentComment(db.Model):
         "AnswerSheet",
         backref=db.backref("student_comments", cascade="all, delete-orphan"),
     )
+
+
+class OcrCache(db.Model):
+    """Gemini OCR output cached by file content hash.
+
+    Rows are keyed by the SHA-256 of the uploaded file together with
+    the model name and OCR prompt version, so changing either one
+    naturally invalidates older entries.
+    """
+
+    __tablename__ = "ocr_cache"
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    model = db.Column(db.String(100), primary_key=True)
+    prompt_version = db.Column(db.String(20), primary_key=True)
+    text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class EvalCache(db.Model):
+    """Gemini per-question grading cached by a hash of the graded input.
+
+    ``key`` is the SHA-256 of the question, model answer, max marks and
+    student answer together with the model name and evaluation prompt
+    version (see ``gradix.evaluate.cache``).
+    """
+
+    __tablename__ = "eval_cache"
+
+    key = db.Column(db.String(64), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    feedback = db.Column(db.Text, nullable=True)
+    has_diagram = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class JobStatus(str, Enum):
+    PENDING = "Pending"
+    RUNNING = "Running"
+    DONE = "Done"
+    FAILED = "Failed"
+
+
+class Job(db.Model):
+    """Background job submitted to the app's worker pool (see ``gradix.jobs``)."""
+
+    __tablename__ = "jobs"
+
+    job_id = db.Column(db.String(32), primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    # JSON-encoded return value of the job function, when it succeeds.
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+
+class ExamStats(db.Model):
+    """Precomputed report aggregates for one exam (see ``gradix.analytics.stats``).
+
+    Acts as a materialised view over ``reports``: the row is dropped
+    whenever a report of the exam changes and rebuilt on the next read.
+    """
+
+    __tablename__ = "exam_stats"
+
+    exam_id = db.Column(db.Integer, db.ForeignKey("exams.exam_id"), primary_key=True)
+    n_reports = db.Column(db.Integer, nullable=False, default=0)
+    sum_score = db.Column(db.Float, nullable=False, default=0.0)
+    bucket_0_20 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_20_40 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_40_60 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_60_80 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_80_100 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_over_100 = db.Column(db.Integer, nullable=False, default=0)
+    refreshed_on = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
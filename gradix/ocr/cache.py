@@ -0,0 +1,103 @@
+"""Persistent cache for Gemini OCR results.
+
+Results are keyed by the SHA-256 of the file contents plus the Gemini
+model name and OCR prompt version. Re-running OCR on the same scan
+(re-evaluations, retries, duplicate uploads) is then served from the
+database instead of calling Gemini again.
+
+The cache writes through the regular ``db.session``; entries are
+persisted by the caller's commit, like the other rows a route creates.
+"""
+
+import hashlib
+import logging
+import threading
+
+from ..extensions import db
+from ..models import OcrCache
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+# Read size for hashing; scans are hashed without loading them whole.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path: str) -> str:
+    """Return the hex SHA-256 of a file's contents.
+
+    A chunked loop rather than ``hashlib.file_digest``, which needs
+    Python 3.11.
+    """
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:  # noqa: PTH123
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(file_path: str, model_name: str) -> tuple[str, str, str]:
+    """Return the ``(sha256, model, prompt_version)`` key for a file."""
+
+    from gemini_ocr_client import OCR_PROMPT_VERSION
+
+    return file_sha256(file_path), model_name, OCR_PROMPT_VERSION
+
+
+def get(key: tuple[str, str, str]) -> str | None:
+    row = db.session.get(OcrCache, key)
+    if row is None:
+        _count("misses")
+        return None
+    _count("hits")
+    return row.text
+
+
+def put(key: tuple[str, str, str], text: str) -> None:
+    sha256, model, prompt_version = key
+    db.session.merge(
+        OcrCache(sha256=sha256, model=model, prompt_version=prompt_version, text=text)
+    )
+
+
+def stats() -> dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def extract_text_cached(file_path: str, *, model_name: str = DEFAULT_MODEL) -> str:
+    """Cached wrapper around :func:`gemini_ocr_client.extract_text`.
+
+    Raises the same exceptions as the wrapped function on a cache miss.
+    Empty OCR results are not cached.
+    """
+
+    from gemini_ocr_client import extract_text
+
+    try:
+        key = cache_key(file_path, model_name)
+    except OSError as exc:
+        logger.info("Could not hash %s for OCR cache lookup: %s", file_path, exc)
+        return extract_text(file_path, model_name=model_name)
+
+    cached = get(key)
+    if cached is not None:
+        logger.info("OCR cache hit for %s", file_path)
+        return cached
+
+    text = extract_text(file_path, model_name=model_name)
+    if text:
+        put(key, text)
+    return text
@@ -1,15 +1,22 @@
+import functools
+import io
 import logging
 import os
 import subprocess
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
-from flask import Blueprint, current_app, jsonify
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required
 
 from ..extensions import db
+from ..hf_models import maybe_compile
+from ..jobs import submit as submit_job
 from ..models import AnswerSheet, ExtractedText, UserRole
 from ..rbac import role_required
+from ..streaming import NDJSON_MIMETYPE, ndjson_response
+from .cache import file_sha256
 
 
 ocr_bp = Blueprint("ocr", __name__, url_prefix="/ocr")
@@ -19,102 +26,235 @@ logger = logging.getLogger(__name__)
 _trocr_processor = None
 _trocr_model = None
 _trocr_model_id: str | None = None
+_trocr_device: str | None = None
 
+# EasyOCR loads its detector and recogniser weights when a Reader is
+# built, so one Reader is kept per process (rebuilt only if the
+# language list or GPU flag changes).
+_easyocr_reader = None
+_easyocr_key: tuple | None = None
+_easyocr_lock = threading.Lock()
 
-def _extract_pdf_text(file_path: str) -> tuple[str, float] | tuple[None, float]:
-    """Extract text directly from a PDF without OCR.
+# In-process Tesseract (tesserocr) handles, one per thread since the C++
+# API object is not thread-safe. Each keeps the traineddata loaded.
+_tess_local = threading.local()
 
-    Uses PyPDF2 to read selectable text from each page. This is
-    preferred for digital PDFs because it is faster and more
-    accurate than image-based OCR.
+# Long-lived worker for racing Tesseract against EasyOCR, so its
+# per-thread tesserocr handle is reused across requests.
+_tess_pool: ThreadPoolExecutor | None = None
+_tess_pool_lock = threading.Lock()
+
+
+def _get_tess_pool() -> ThreadPoolExecutor:
+    global _tess_pool
+
+    with _tess_pool_lock:
+        if _tess_pool is None:
+            _tess_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tesseract")
+        return _tess_pool
+
+
+def _iter_pdf_pages(file_path: str):
+    """Yield the selectable text of each non-empty PDF page, in order.
+
+    Uses PyPDF2 to read the text layer without OCR. Stops quietly (after
+    logging) if the PDF cannot be read.
     """
 
     try:  # pragma: no cover - depends on optional dependency
         import PyPDF2  # type: ignore
 
-        abs_path = os.path.abspath(file_path)
-        with open(abs_path, "rb") as f:  # noqa: PTH123
+        with open(file_path, "rb") as f:  # noqa: PTH123
             reader = PyPDF2.PdfReader(f)
-            pieces: list[str] = []
             for page in reader.pages:
                 try:
                     page_text = page.extract_text() or ""
                 except Exception:
                     page_text = ""
                 if page_text.strip():
-                    pieces.append(page_text.strip())
-
-        if not pieces:
-            return None, 0.0
-
-        text = "\n\n".join(pieces).strip()
-        return text, 0.99
+                    yield page_text.strip()
     except Exception as exc:  # noqa: BLE001
         logger.exception("PDF text extraction failed, falling back to OCR: %s", exc)
+
+
+def _extract_pdf_text(file_path: str) -> tuple[str, float] | tuple[None, float]:
+    """Extract text directly from a PDF without OCR.
+
+    This is preferred for digital PDFs because it is faster and more
+    accurate than image-based OCR.
+    """
+
+    pieces = list(_iter_pdf_pages(file_path))
+    if not pieces:
         return None, 0.0
+    return "\n\n".join(pieces).strip(), 0.99
+
+
+_JPEG_EXTENSIONS = {".jpg", ".jpeg"}
+_EXIF_ORIENTATION = 0x0112
+
+
+@functools.lru_cache(maxsize=1)
+def _turbojpeg():
+    """Return a shared ``TurboJPEG`` decoder, or ``None`` if unavailable.
+
+    libjpeg-turbo decodes scans several times faster than the stock
+    decoders, so JPEGs go through it when ``PyTurboJPEG`` is installed.
+    """
+
+    try:  # pragma: no cover - optional dependency
+        from turbojpeg import TurboJPEG  # type: ignore
+
+        return TurboJPEG()
+    except Exception:  # noqa: BLE001 - missing module or libturbojpeg
+        return None
+
+
+def _exif_orientation(data: bytes) -> int:
+    """Return the EXIF orientation tag (1-8) of JPEG ``data``, 1 if absent."""
+
+    try:
+        from PIL import Image  # type: ignore
 
+        # Image.open only parses the headers here, not the pixels.
+        with Image.open(io.BytesIO(data)) as img:
+            return int(img.getexif().get(_EXIF_ORIENTATION, 1) or 1)
+    except Exception:  # noqa: BLE001 - Pillow missing or unreadable EXIF
+        return 1
 
-def _preprocess_image(file_path: str) -> tuple[str, bool]:
+
+def _apply_orientation(pixels, orientation: int):
+    """Turn decoded ``pixels`` upright, as Pillow's ``exif_transpose`` does."""
+
+    import numpy as np
+
+    if orientation in (5, 7):
+        pixels = pixels.swapaxes(0, 1)
+    if orientation == 2:
+        pixels = np.fliplr(pixels)
+    elif orientation in (3, 7):
+        pixels = np.rot90(pixels, 2)
+    elif orientation == 4:
+        pixels = np.flipud(pixels)
+    elif orientation == 6:
+        pixels = np.rot90(pixels, -1)
+    elif orientation == 8:
+        pixels = np.rot90(pixels, 1)
+    return np.ascontiguousarray(pixels)
+
+
+def _decode_jpeg(path: str, gray: bool = False):
+    """Decode a JPEG with libjpeg-turbo; ``None`` if not a JPEG or unsupported.
+
+    libjpeg-turbo ignores the EXIF orientation that ``cv2.imread`` and
+    phone cameras rely on, so rotated photos are turned upright here.
+    """
+
+    tj = _turbojpeg()
+    if tj is None or os.path.splitext(path)[1].lower() not in _JPEG_EXTENSIONS:
+        return None
+    from turbojpeg import TJPF_GRAY, TJPF_RGB  # type: ignore
+
+    try:
+        with open(path, "rb") as f:  # noqa: PTH123
+            data = f.read()
+        pixels = tj.decode(data, pixel_format=TJPF_GRAY if gray else TJPF_RGB)
+    except Exception as exc:  # noqa: BLE001
+        logger.info("TurboJPEG decode failed for %s, using the default decoder: %s", path, exc)
+        return None
+
+    orientation = _exif_orientation(data)
+    if orientation != 1:
+        pixels = _apply_orientation(pixels, orientation)
+    return pixels
+
+
+def _preprocess_image(abs_path: str):
     """Lightly preprocess the image to help OCR.
 
     Steps (best-effort, all inside try/except):
     - Convert to grayscale
-    - Apply blur + Otsu thresholding for better contrast
-    - Optionally upscale smaller images
+    - Upscale smaller images
+    - Apply adaptive thresholding for better contrast
 
-    Returns (path_to_use, is_temporary_file).
-    On any error, returns the original path and False.
-    """
+    ``abs_path`` must already be absolute (see :func:`run_ocr`).
 
-    abs_path = os.path.abspath(file_path)
+    Returns (image, abs_path) where ``image`` is the processed
+    grayscale array, kept in memory for the OCR backends. On any error
+    ``image`` is ``None`` and the original file should be used.
+    """
 
     try:  # pragma: no cover - depends on OpenCV being available
         import cv2  # type: ignore
 
-        image = cv2.imread(abs_path)
-        if image is None:
-            return abs_path, False
-
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (3, 3), 0)
-        _, thresh = cv2.threshold(
-            gray,
-            0,
-            255,
-            cv2.THRESH_BINARY + cv2.THRESH_OTSU,
-        )
-
-        height, width = thresh.shape[:2]
+        gray = _decode_jpeg(abs_path, gray=True)
+        if gray is not None:
+            gray = gray.reshape(gray.shape[:2])  # TJPF_GRAY comes back as HxWx1
+        else:
+            gray = cv2.imread(abs_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            return None, abs_path
+
+        # Upscale small images first, so thresholding runs once at the
+        # final size and the edges stay binary.
+        height, width = gray.shape[:2]
         if height < 1000:
             scale = 1000.0 / float(height)
             new_size = (int(width * scale), 1000)
-            thresh = cv2.resize(thresh, new_size, interpolation=cv2.INTER_LINEAR)
+            gray = cv2.resize(gray, new_size, interpolation=cv2.INTER_LINEAR)
 
-        fd, tmp_path = tempfile.mkstemp(suffix=".png")
-        os.close(fd)
-        cv2.imwrite(tmp_path, thresh)
+        # Adaptive thresholding smooths each neighbourhood itself, so it
+        # replaces the separate blur and Otsu histogram passes; it also
+        # copes better with uneven lighting in phone photos.
+        thresh = cv2.adaptiveThreshold(
+            gray,
+            255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            31,
+            10,
+        )
 
-        return tmp_path, True
+        return thresh, abs_path
 
     except Exception as exc:
         logger.info("Image preprocessing failed or OpenCV missing, using original image: %s", exc)
-        return abs_path, False
+        return None, abs_path
+
 
+def _load_rgb(path: str):
+    """Open an image as RGB, decoding JPEGs with libjpeg-turbo when possible."""
 
-def _run_hf_ocr(file_path: str) -> tuple[str, float] | tuple[None, float]:
+    from PIL import Image, ImageOps  # type: ignore
+
+    rgb = _decode_jpeg(path)
+    if rgb is not None:
+        return Image.fromarray(rgb)
+    with Image.open(path) as img:
+        # Upright like the libjpeg-turbo path above.
+        return ImageOps.exif_transpose(img).convert("RGB")
+
+
+def _run_hf_ocr(file_paths: list[str]) -> tuple[str, float] | tuple[None, float]:
     """Use a local Hugging Face TrOCR model via transformers.
 
     By default uses ``microsoft/trocr-small-handwritten``, which is
     suitable for handwriting. You can override the model by setting
     ``HF_OCR_MODEL`` in the environment.
 
+    ``file_paths`` are the pages (or crops) of one document. They are
+    run through the model in batches of ``HF_OCR_BATCH_SIZE`` (default
+    16) images per ``generate`` call, and the texts are joined in order.
+
     The model and processor are loaded lazily and cached at module
-    level so they are only loaded once per process.
+    level so they are only loaded once per process. On CUDA the model
+    runs in FP16.
     """
 
-    global _trocr_processor, _trocr_model, _trocr_model_id
+    global _trocr_processor, _trocr_model, _trocr_model_id, _trocr_device
 
     try:  # pragma: no cover - heavy optional dependency
+        import torch  # type: ignore
         from transformers import TrOCRProcessor, VisionEncoderDecoderModel  # type: ignore
         from PIL import Image  # type: ignore
     except Exception as exc:
@@ -122,27 +262,44 @@ def _run_hf_ocr(file_path: str) -> tuple[str, float] | tuple[None, float]:
         return None, 0.0
 
     model_id = os.environ.get("HF_OCR_MODEL", "microsoft/trocr-small-handwritten")
+    batch_size = max(1, int(os.environ.get("HF_OCR_BATCH_SIZE", "16")))
+    max_new_tokens = int(os.environ.get("HF_OCR_MAX_NEW_TOKENS", "64"))
 
     try:
         if _trocr_processor is None or _trocr_model is None or _trocr_model_id != model_id:
-            logger.info("Loading TrOCR model: %s", model_id)
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            logger.info("Loading TrOCR model: %s on %s", model_id, device)
+            model = VisionEncoderDecoderModel.from_pretrained(model_id).to(device)
+            if device == "cuda":
+                model = model.half()
             _trocr_processor = TrOCRProcessor.from_pretrained(model_id)
-            _trocr_model = VisionEncoderDecoderModel.from_pretrained(model_id)
+            _trocr_model = maybe_compile(model.eval())
             _trocr_model_id = model_id
-
-        abs_path = os.path.abspath(file_path)
-        image = Image.open(abs_path).convert("RGB")
-
-        pixel_values = _trocr_processor(images=image, return_tensors="pt").pixel_values
-        generated_ids = _trocr_model.generate(pixel_values)
-        generated_texts = _trocr_processor.batch_decode(
-            generated_ids, skip_special_tokens=True
-        )
-
-        if not generated_texts:
-            return None, 0.0
-
-        text = (generated_texts[0] or "").strip()
+            _trocr_device = device
+
+        device = _trocr_device or "cpu"
+        dtype = next(_trocr_model.parameters()).dtype
+
+        generated_texts: list[str] = []
+        for start in range(0, len(file_paths), batch_size):
+            images = [_load_rgb(path) for path in file_paths[start : start + batch_size]]
+            pixel_values = _trocr_processor(images=images, return_tensors="pt").pixel_values
+            pixel_values = pixel_values.to(device, dtype=dtype)
+            with torch.inference_mode():
+                # Greedy decoding with the KV cache; some checkpoints
+                # default to beam search otherwise.
+                generated_ids = _trocr_model.generate(
+                    pixel_values,
+                    num_beams=1,
+                    do_sample=False,
+                    use_cache=True,
+                    max_new_tokens=max_new_tokens,
+                )
+            generated_texts.extend(
+                _trocr_processor.batch_decode(generated_ids, skip_special_tokens=True)
+            )
+
+        text = "\n\n".join(t.strip() for t in generated_texts if t and t.strip())
         if not text:
             return None, 0.0
 
@@ -153,20 +310,45 @@ def _run_hf_ocr(file_path: str) -> tuple[str, float] | tuple[None, float]:
         return None, 0.0
 
 
-def _run_easyocr(file_path: str) -> tuple[str, float] | tuple[None, float]:
+def _get_easyocr_reader():
+    """Return the cached EasyOCR ``Reader``, building it on first use.
+
+    Languages come from ``EASYOCR_LANGS`` (comma-separated, default
+    ``en``); ``EASYOCR_GPU=1`` enables the GPU. GPU off keeps it simple
+    and works on most machines.
+    """
+
+    global _easyocr_reader, _easyocr_key
+
+    langs = tuple(
+        lang.strip() for lang in os.environ.get("EASYOCR_LANGS", "en").split(",") if lang.strip()
+    )
+    gpu = os.environ.get("EASYOCR_GPU", "0") == "1"
+    key = (langs, gpu)
+
+    with _easyocr_lock:
+        if _easyocr_reader is None or _easyocr_key != key:
+            import easyocr  # type: ignore
+
+            logger.info("Loading EasyOCR reader: langs=%s gpu=%s", langs, gpu)
+            _easyocr_reader = easyocr.Reader(list(langs), gpu=gpu)
+            _easyocr_key = key
+        return _easyocr_reader
+
+
+def _run_easyocr(image) -> tuple[str, float] | tuple[None, float]:
     """Try to extract text using EasyOCR.
 
+    ``image`` is a file path or an in-memory image array.
+
     This tends to work better for handwriting than plain Tesseract.
     Returns (text, confidence) or (None, 0.0) if EasyOCR is not usable.
     """
 
     try:  # pragma: no cover - depends on optional heavy dependency
-        import easyocr  # type: ignore
-
-        # GPU=False keeps it simple and works on most machines.
-        reader = easyocr.Reader(["en"], gpu=False)
+        reader = _get_easyocr_reader()
         # detail=0 -> list of strings; paragraph=True -> join nearby words.
-        result = reader.readtext(file_path, detail=0, paragraph=True)
+        result = reader.readtext(image, detail=0, paragraph=True)
         text = "\n".join(line.strip() for line in result if line and line.strip())
 
         if not text:
@@ -179,8 +361,28 @@ def _run_easyocr(file_path: str) -> tuple[str, float] | tuple[None, float]:
         return None, 0.0
 
 
-def _run_tesseract(file_path: str) -> tuple[str, float]:
-    """Run OCR on the given file by invoking the Tesseract binary.
+def _get_tess_api():
+    """Return this thread's ``tesserocr`` API, or ``None`` if unavailable."""
+
+    api = getattr(_tess_local, "api", None)
+    if api is None:
+        try:  # pragma: no cover - optional dependency
+            import tesserocr  # type: ignore
+        except ImportError:
+            api = False  # remembered so the import is not retried per call
+        else:
+            api = tesserocr.PyTessBaseAPI(lang="eng", psm=tesserocr.PSM.SINGLE_BLOCK)
+        _tess_local.api = api
+    return api or None
+
+
+def _run_tesseract(image) -> tuple[str, float]:
+    """Run Tesseract OCR on the given file or image array.
+
+    When ``tesserocr`` is installed Tesseract runs in-process, reusing a
+    per-thread API handle so the language data is loaded only once.
+    Otherwise the Tesseract binary is invoked; arrays are then
+    PNG-encoded in memory and piped to it on stdin.
 
     - Expects Tesseract to be installed (for example in
       C:\\Program Files\\Tesseract-OCR\\tesseract.exe).
@@ -189,17 +391,37 @@ def _run_tesseract(file_path: str) -> tuple[str, float]:
       used and must be on PATH.
     """
 
+    api = _get_tess_api()
+    if api is not None:  # pragma: no cover - optional dependency
+        if isinstance(image, str):
+            api.SetImageFile(image)
+        else:
+            from PIL import Image  # type: ignore
+
+            api.SetImage(Image.fromarray(image))
+        extracted_text = (api.GetUTF8Text() or "").strip()
+        if not extracted_text:
+            raise RuntimeError("Tesseract returned empty text.")
+        return extracted_text, 0.7
+
     tesseract_cmd = os.environ.get("TESSERACT_CMD", "tesseract")
 
-    # tesseract <image> stdout -l eng --psm 6
+    if isinstance(image, str):
+        source, stdin = image, None
+    else:
+        import cv2  # type: ignore
+
+        source, stdin = "stdin", cv2.imencode(".png", image)[1].tobytes()
+
+    # tesseract <image|stdin> stdout -l eng --psm 6
     result = subprocess.run(
-        [tesseract_cmd, os.path.abspath(file_path), "stdout", "-l", "eng", "--psm", "6"],
+        [tesseract_cmd, source, "stdout", "-l", "eng", "--psm", "6"],
+        input=stdin,
         capture_output=True,
-        text=True,
         check=True,
     )
 
-    extracted_text = (result.stdout or "").strip()
+    extracted_text = result.stdout.decode("utf-8", errors="replace").strip()
     if not extracted_text:
         raise RuntimeError("Tesseract returned empty text.")
 
@@ -217,11 +439,16 @@ def run_ocr(file_path: str) -> tuple[str, float]:
       PyPDF2 without OCR.
     - For image files, or if PDF extraction fails, fall back to the
       existing image OCR pipeline:
-        1. Preprocess the image (grayscale + threshold + optional upscale).
+        1. Preprocess the image in memory (grayscale + threshold +
+           optional upscale).
         2. Try EasyOCR (works well for handwriting).
-        3. As a last resort, fall back to Tesseract if available.
+        3. As a last resort, fall back to Tesseract if available
+           (optionally run concurrently with EasyOCR, see
+           ``OCR_RACE_BACKENDS``).
     """
 
+    # Resolved once here; the helpers below expect an absolute path.
+    file_path = os.path.abspath(file_path)
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
         # For PDFs, first try direct text extraction. If that fails or
@@ -236,46 +463,93 @@ def run_ocr(file_path: str) -> tuple[str, float]:
         # on a non-image input.
         return "", 0.0
 
-    processed_path, is_temp = _preprocess_image(file_path)
+    processed, abs_path = _preprocess_image(file_path)
+    # The processed image stays in memory; fall back to the original
+    # file when preprocessing was not possible.
+    image = processed if processed is not None else abs_path
+
+    # EasyOCR (lighter than TrOCR and avoids large model downloads) is
+    # preferred; Tesseract is the fallback. With OCR_RACE_BACKENDS=1,
+    # Tesseract starts at the same time so a failed EasyOCR run does not
+    # add Tesseract's full latency on top. That costs a full Tesseract
+    # run of CPU for every image EasyOCR reads successfully, since a
+    # started run cannot be stopped, so it is off by default.
+    race = os.environ.get("OCR_RACE_BACKENDS", "0") == "1"
+    fut_tess = _get_tess_pool().submit(_run_tesseract, image) if race else None
+
+    text, confidence = _run_easyocr(image)
+    if text:
+        if fut_tess is not None:
+            fut_tess.cancel()  # only if still queued behind another run
+        return text, confidence
 
     try:
-        # First, try EasyOCR (lighter than TrOCR and avoids large model
-        # downloads).
-        text, confidence = _run_easyocr(processed_path)
-        if text:
-            return text, confidence
+        return fut_tess.result() if fut_tess is not None else _run_tesseract(image)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Tesseract OCR failed as well: %s", exc)
+        return "", 0.0
 
-        # Finally, attempt plain Tesseract as a last fallback
-        try:
-            return _run_tesseract(processed_path)
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Tesseract OCR failed as well: %s", exc)
-            return "", 0.0
 
-    finally:
-        if is_temp and os.path.exists(processed_path):
-            try:
-                os.remove(processed_path)
-            except OSError:
-                logger.info("Could not remove temporary preprocessed image: %s", processed_path)
+def _file_sha256(path: str) -> str | None:
+    try:
+        return file_sha256(path)
+    except OSError as exc:
+        logger.info("Could not hash %s: %s", path, exc)
+        return None
 
 
-@ocr_bp.post("/run/<int:sheet_id>")
-@jwt_required()
-@role_required({UserRole.TEACHER})
-def ocr_run(sheet_id: int):
-    sheet = AnswerSheet.query.get(sheet_id)
-    if sheet is None:
-        return (
-            jsonify({"message": "AnswerSheet not found."}),
-            HTTPStatus.NOT_FOUND,
-        )
+def _extracted_payload(extracted: ExtractedText) -> dict:
+    return {
+        "text_id": extracted.text_id,
+        "sheet_id": extracted.sheet_id,
+        "raw_text": extracted.raw_text,
+        "cleaned_text": extracted.cleaned_text,
+        "extraction_confidence": extracted.extraction_confidence,
+    }
+
+
+def _extract_sheet_text(sheet_id: int, force: bool = False) -> dict:
+    """OCR an answer sheet and upsert its ExtractedText; returns the API payload.
+
+    If the sheet already has non-empty text extracted from a file with
+    the same contents, that text is returned without running OCR again
+    unless ``force`` is set.
+    """
+
+    payload: dict = {}
+    for event in _iter_sheet_text(sheet_id, force):
+        payload = event
+    return payload
+
+
+def _iter_sheet_text(sheet_id: int, force: bool = False):
+    """Generator behind :func:`_extract_sheet_text`.
+
+    Yields ``{"page", "text", "confidence"}`` for each page as it is
+    extracted (PDF text layers page by page; images and Gemini OCR as a
+    single page), then the stored ExtractedText payload last.
+    """
+
+    sheet = db.session.get(AnswerSheet, sheet_id)
 
     # Build absolute file path for local OCR backends
     upload_folder = current_app.config["UPLOAD_FOLDER"]
     filename = os.path.basename(sheet.file_path)
     abs_path = os.path.join(upload_folder, filename)
 
+    file_hash = _file_sha256(abs_path)
+    extracted = sheet.extracted_text
+    if (
+        not force
+        and extracted is not None
+        and file_hash is not None
+        and extracted.file_hash == file_hash
+        and extracted.raw_text
+    ):
+        logger.info("Sheet %s unchanged since last OCR, reusing extracted text", sheet_id)
+        yield _extracted_payload(extracted)
+        return
+
     raw_text = ""
     confidence = 0.0
 
@@ -283,13 +557,15 @@ def ocr_run(sheet_id: int):
     use_gemini = os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}
     if use_gemini:
         try:  # pragma: no cover - depends on external API
-            from gemini_ocr_client import GeminiConfigError, extract_text as gemini_extract
+            from gemini_ocr_client import GeminiConfigError
+            from .cache import extract_text_cached as gemini_extract
 
             logger.info("Attempting Gemini OCR for path: %s", abs_path)
             g_text = gemini_extract(abs_path)
             if g_text:
                 raw_text = g_text
                 confidence = 0.98
+                yield {"page": 1, "text": raw_text, "confidence": confidence}
             else:
                 raise RuntimeError("Empty text from Gemini OCR")
         except GeminiConfigError as exc:
@@ -297,38 +573,75 @@ def ocr_run(sheet_id: int):
         except Exception as exc:  # noqa: BLE001
             logger.exception("Gemini OCR failed, falling back to local OCR: %s", exc)
 
-    # 2) Local OCR fallback if Gemini is disabled or failed.
+    # 2) Local OCR fallback if Gemini is disabled or failed. PDF text
+    # layers are read page by page (as ``run_ocr`` does).
     if not raw_text:
-        raw_text, confidence = run_ocr(abs_path)
+        if os.path.splitext(abs_path)[1].lower() == ".pdf":
+            pieces = []
+            for page_no, page_text in enumerate(_iter_pdf_pages(abs_path), start=1):
+                pieces.append(page_text)
+                yield {"page": page_no, "text": page_text, "confidence": 0.99}
+            raw_text = "\n\n".join(pieces).strip()
+            confidence = 0.99 if pieces else 0.0
+        else:
+            raw_text, confidence = run_ocr(abs_path)
+            yield {"page": 1, "text": raw_text, "confidence": confidence}
 
     cleaned_text = raw_text.strip().lower()
 
     # Upsert ExtractedText for this sheet
-    extracted = ExtractedText.query.filter_by(sheet_id=sheet.sheet_id).first()
     if extracted is None:
         extracted = ExtractedText(
             sheet_id=sheet.sheet_id,
             raw_text=raw_text,
             cleaned_text=cleaned_text,
             extraction_confidence=confidence,
+            file_hash=file_hash,
         )
         db.session.add(extracted)
     else:
         extracted.raw_text = raw_text
         extracted.cleaned_text = cleaned_text
         extracted.extraction_confidence = confidence
+        extracted.file_hash = file_hash
 
     db.session.commit()
 
+    yield _extracted_payload(extracted)
+
+
+@ocr_bp.post("/run/<int:sheet_id>")
+@jwt_required()
+@role_required({UserRole.TEACHER})
+def ocr_run(sheet_id: int):
+    """Run OCR for an answer sheet.
+
+    Runs on the shared worker pool by default and returns ``202`` with
+    a ``job_id`` to poll at ``GET /jobs/<job_id>``; pass ``?sync=1`` to
+    run inline and get the extracted text back (``201 Created``). Text
+    already extracted from an unchanged file is reused; pass
+    ``?force=1`` to OCR again anyway.
+
+    With ``Accept: application/x-ndjson`` OCR runs inline and the
+    response is streamed as one JSON line per page followed by a final
+    line with the stored extracted text.
+    """
+
+    sheet = db.session.get(AnswerSheet, sheet_id)
+    if sheet is None:
+        return (
+            jsonify({"message": "AnswerSheet not found."}),
+            HTTPStatus.NOT_FOUND,
+        )
+
+    force = request.args.get("force", "").lower() in {"1", "true", "yes"}
+    if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return ndjson_response(_iter_sheet_text(sheet.sheet_id, force), HTTPStatus.CREATED)
+    if request.args.get("sync", "").lower() in {"1", "true", "yes"}:
+        return jsonify(_extract_sheet_text(sheet.sheet_id, force)), HTTPStatus.CREATED
+
+    job_id = submit_job(_extract_sheet_text, sheet.sheet_id, force)
     return (
-        jsonify(
-            {
-                "text_id": extracted.text_id,
-                "sheet_id": extracted.sheet_id,
-                "raw_text": extracted.raw_text,
-                "cleaned_text": extracted.cleaned_text,
-                "extraction_confidence": extracted.extraction_confidence,
-            }
-        ),
-        HTTPStatus.CREATED,
+        jsonify({"job_id": job_id, "sheet_id": sheet.sheet_id}),
+        HTTPStatus.ACCEPTED,
     )
@@ -0,0 +1,147 @@
+"""Password hashing helpers.
+
+New hashes use bcrypt with ``Config.BCRYPT_ROUNDS`` rounds, or argon2id
+when ``Config.PASSWORD_HASHER`` is ``"argon2"`` (requires
+``argon2-cffi``). Verification picks the algorithm from the stored
+hash's prefix, so existing bcrypt hashes keep working after switching.
+Logins rehash passwords whose stored hash no longer matches the current
+settings (see :func:`needs_rehash`), so switching hasher or lowering
+``BCRYPT_ROUNDS`` takes effect for existing users too.
+
+Successful verifications are remembered for ``PASSWORD_CACHE_TTL``
+seconds (keyed by an HMAC of the hash and password, never the password
+itself), so repeated logins from scripts skip the slow hash.
+Logins for unknown accounts call :func:`dummy_verify` so they take as
+long as a wrong password and do not reveal which emails exist.
+"""
+
+import hashlib
+import hmac
+import threading
+import time
+
+import bcrypt
+from flask import current_app
+
+
+_ARGON2_PREFIX = "$argon2"
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# bcrypt only uses the first 72 bytes of a password.
+_BCRYPT_MAX_BYTES = 72
+# Longer submitted passwords are rejected without hashing them.
+MAX_PASSWORD_LENGTH = 1024
+
+_argon2_hasher = None
+
+_VERIFY_CACHE_SIZE = 1024
+
+# HMAC digest -> expiry time of recently verified (hash, password) pairs.
+_verified: dict[bytes, float] = {}
+_verified_lock = threading.Lock()
+
+# (hasher, bcrypt rounds) -> hash of a throwaway password, for dummy_verify.
+_dummy_hashes: dict[tuple, str] = {}
+
+
+def _get_argon2_hasher():
+    global _argon2_hasher
+
+    if _argon2_hasher is None:
+        from argon2 import PasswordHasher  # type: ignore
+
+        _argon2_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+    return _argon2_hasher
+
+
+def _bcrypt_rounds() -> int:
+    return int(current_app.config.get("BCRYPT_ROUNDS", 12))
+
+
+def hash_password(password: str) -> str:
+    if current_app.config.get("PASSWORD_HASHER") == "argon2":
+        return _get_argon2_hasher().hash(password)
+
+    rounds = _bcrypt_rounds()
+    return bcrypt.hashpw(_bcrypt_input(password), bcrypt.gensalt(rounds=rounds)).decode(
+        "utf-8"
+    )
+
+
+def _bcrypt_input(password: str) -> bytes:
+    # Same bytes bcrypt would use; newer bcrypt releases raise on >72.
+    return password.encode("utf-8")[:_BCRYPT_MAX_BYTES]
+
+
+def _verify_cache_key(password: str, password_hash: str) -> bytes:
+    secret = str(current_app.config.get("SECRET_KEY") or "").encode("utf-8")
+    message = password_hash.encode("utf-8") + b"\0" + password.encode("utf-8")
+    return hmac.new(secret, message, hashlib.sha256).digest()
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    ttl = float(current_app.config.get("PASSWORD_CACHE_TTL", 0))
+    if ttl <= 0:
+        return _verify_uncached(password, password_hash)
+
+    key = _verify_cache_key(password, password_hash)
+    now = time.monotonic()
+    with _verified_lock:
+        if _verified.get(key, 0.0) > now:
+            return True
+
+    if not _verify_uncached(password, password_hash):
+        return False
+
+    with _verified_lock:
+        _verified.pop(key, None)
+        _verified[key] = now + ttl
+        while len(_verified) > _VERIFY_CACHE_SIZE:
+            # Dicts keep insertion order, so this drops the oldest entry.
+            del _verified[next(iter(_verified))]
+    return True
+
+
+def _verify_uncached(password: str, password_hash: str) -> bool:
+    if len(password) > MAX_PASSWORD_LENGTH:
+        return False
+
+    if password_hash.startswith(_ARGON2_PREFIX):
+        from argon2.exceptions import InvalidHashError, VerificationError  # type: ignore
+
+        try:
+            return _get_argon2_hasher().verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    return bcrypt.checkpw(_bcrypt_input(password), password_hash.encode("utf-8"))
+
+
+def dummy_verify(password: str) -> None:
+    """Do the work of a failed verification when no account matched.
+
+    The throwaway hash is made with the current settings, so the time
+    spent matches a real check against a freshly hashed password.
+    """
+
+    settings = (current_app.config.get("PASSWORD_HASHER"), _bcrypt_rounds())
+    dummy = _dummy_hashes.get(settings)
+    if dummy is None:
+        dummy = _dummy_hashes.setdefault(settings, hash_password("gradix-dummy-password"))
+    _verify_uncached(password, dummy)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Whether ``password_hash`` was made with other than the current settings."""
+
+    if current_app.config.get("PASSWORD_HASHER") == "argon2":
+        if not password_hash.startswith(_ARGON2_PREFIX):
+            return True
+        return _get_argon2_hasher().check_needs_rehash(password_hash)
+
+    if not password_hash.startswith(_BCRYPT_PREFIXES):
+        return True
+    # bcrypt hashes look like "$2b$12$...", with the cost after the prefix.
+    try:
+        return int(password_hash[4:6]) != _bcrypt_rounds()
+    except ValueError:
+        return True
@@ -11,10 +11,12 @@ import re
 from typing import Optional
 from http import HTTPStatus
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 
 from ..extensions import db
+from ..hf_models import maybe_compile
+from ..jobs import persist
 from ..models import ExtractedText, UserRole
 from ..rbac import role_required
 
@@ -37,7 +39,9 @@ def _hf_grammar_correct(text: str) -> Optional[str]:
     the model will run on CUDA for faster inference.
 
     The model ID can be overridden via ``HF_GRAMMAR_MODEL``; by
-    default we use a T5-based grammar-correction model.
+    default we use a T5-based grammar-correction model. On CUDA the
+    model is run under BF16/FP16 autocast; on CPU its Linear layers are
+    quantised to int8 unless ``HF_GRAMMAR_QUANTIZE=0``.
     """
 
     global _grammar_tokenizer, _grammar_model, _grammar_model_id, _grammar_device
@@ -60,7 +64,14 @@ def _hf_grammar_correct(text: str) -> Optional[str]:
             logger.info("Loading grammar model: %s on %s", model_id, device)
             tokenizer = AutoTokenizer.from_pretrained(model_id)
             model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
-            model.to(device)
+            model.to(device).eval()
+            if device == "cpu" and os.environ.get("HF_GRAMMAR_QUANTIZE", "1") == "1":
+                # Dynamic int8 quantisation of the Linear layers: weights
+                # are 4x smaller, which is what bounds CPU decoding speed.
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            model = maybe_compile(model)
 
             _grammar_tokenizer = tokenizer
             _grammar_model = model
@@ -79,7 +90,16 @@ def _hf_grammar_correct(text: str) -> Optional[str]:
         )
         inputs = {k: v.to(device) for k, v in inputs.items()}
 
-        with torch.no_grad():
+        # Autocast rather than ``model.half()``: T5 activations overflow
+        # when the whole model runs in FP16, so prefer BF16 where the GPU
+        # supports it.
+        use_amp = device == "cuda"
+        amp_dtype = (
+            torch.bfloat16 if use_amp and torch.cuda.is_bf16_supported() else torch.float16
+        )
+        with torch.inference_mode(), torch.autocast(
+            device_type=device, dtype=amp_dtype, enabled=use_amp
+        ):
             # Allow enough tokens so the model can rewrite the
             # entire passage instead of cutting it off too early.
             input_len = int(inputs["input_ids"].shape[1])
@@ -87,6 +107,9 @@ def _hf_grammar_correct(text: str) -> Optional[str]:
             outputs = model.generate(
                 **inputs,
                 max_new_tokens=max_new,
+                num_beams=1,
+                do_sample=False,
+                use_cache=True,
             )
 
         corrected = tokenizer.decode(outputs[0], skip_special_tokens=True).strip()
@@ -96,6 +119,31 @@ def _hf_grammar_correct(text: str) -> Optional[str]:
         return None
 
 
+# Signs of OCR noise worth a correction pass: non-ASCII characters, a
+# character repeated 5+ times, runs of punctuation, or long consonant
+# clusters no English word has.
+_OCR_ARTIFACT_RE = re.compile(
+    r"[^\x00-\x7f]|(\w)\1{4,}|[^\w\s]{3,}|[bcdfghjklmnpqrstvwxz]{6,}",
+    re.IGNORECASE,
+)
+
+
+def _is_probably_clean(text: str) -> bool:
+    """Cheap check for text the grammar model would not improve.
+
+    Very short answers (under 8 words) are left as they are, as is
+    text with no visible OCR artifacts and ordinary word lengths.
+    """
+
+    words = text.split()
+    if len(words) < 8:
+        return True
+    if _OCR_ARTIFACT_RE.search(text):
+        return False
+    mean_len = sum(len(w) for w in words) / len(words)
+    return 2.0 <= mean_len <= 10.0
+
+
 def preprocess_text(raw_text: str) -> str:
     """Normalize OCR text and correct spelling/grammar with Hugging Face.
 
@@ -105,11 +153,17 @@ def preprocess_text(raw_text: str) -> str:
        via ``language_tool_python``.
     3. On any error, return the raw text unchanged so the pipeline
        still succeeds.
+
+    Text that already looks clean (see :func:`_is_probably_clean`) is
+    returned unchanged without running either corrector.
     """
 
     if not raw_text:
         return ""
 
+    if _is_probably_clean(raw_text):
+        return raw_text
+
     # First preference: Hugging Face Inference API
     corrected = _hf_grammar_correct(raw_text)
     if corrected:
@@ -126,6 +180,15 @@ def preprocess_text(raw_text: str) -> str:
         return raw_text
 
 
+# Match any line that starts with an integer question number,
+# regardless of what follows ("1.", "1)", "1(a)", etc.). Standard
+# delimiters directly after the number (".", ")", spaces, tabs) are
+# consumed by the match, so "1(a)" keeps the "(a)" as part of the
+# answer text while "1." / "1)" lose the punctuation. Compiled once at
+# import since this runs for every sheet that is evaluated or reviewed.
+_QUESTION_NUMBER_RE = re.compile(r"(?m)^\s*(\d+)[.) \t]*")
+
+
 def split_numbered_answers(text: str):
     """Split OCR text into (question_no, answer_text) segments.
 
@@ -141,38 +204,36 @@ def split_numbered_answers(text: str):
     if not text or not text.strip():
         return []
 
-    # Match any line that starts with an integer question number,
-    # regardless of what follows ("1.", "1)", "1(a)", etc.). We
-    # then manually skip standard punctuation/whitespace after the
-    # number so that patterns like "1(a)" keep the "(a)" as part of
-    # the answer text, while "1." / "1)" lose the punctuation.
-    pattern = re.compile(r"(?m)^\s*(\d+)")
-    matches = list(pattern.finditer(text))
+    # With one capturing group, split() returns
+    # [preamble, number1, body1, number2, body2, ...].
+    parts = _QUESTION_NUMBER_RE.split(text)
 
-    if not matches:
+    if len(parts) == 1:
         return [(1, text.strip())]
 
-    segments = []
-    for i, match in enumerate(matches):
-        q_no = int(match.group(1))
-        start = match.end()
-        # Skip common delimiter characters directly after the number
-        # (".", ")", spaces, tabs). For "1(a)" this leaves the
-        # "(a)" intact; for "1." it removes the dot and spaces.
-        while start < len(text) and text[start] in ".) \t":
-            start += 1
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        answer = text[start:end].strip()
-        if answer:
-            segments.append((q_no, answer))
+    return [
+        (int(q_no), answer)
+        for q_no, body in zip(parts[1::2], parts[2::2])
+        if (answer := body.strip())
+    ]
 
-    return segments
+
+def _store_cleaned_text(text_id: int, cleaned_text: str) -> None:
+    extracted = db.session.get(ExtractedText, text_id)
+    if extracted is not None:
+        extracted.cleaned_text = cleaned_text
 
 
 @preprocess_bp.post("preprocess/<int:sheet_id>")
 @jwt_required()
 @role_required({UserRole.TEACHER})
 def preprocess(sheet_id: int):
+    """Clean a sheet's extracted text.
+
+    The cleaned text is returned straight away and committed in the
+    background; pass ``?sync=1`` to commit before responding.
+    """
+
     extracted = ExtractedText.query.filter_by(sheet_id=sheet_id).first()
     if extracted is None:
         return (
@@ -180,8 +241,12 @@ def preprocess(sheet_id: int):
             HTTPStatus.BAD_REQUEST,
         )
 
-    extracted.cleaned_text = preprocess_text(extracted.raw_text)
-    db.session.commit()
+    cleaned_text = preprocess_text(extracted.raw_text)
+    if request.args.get("sync", "").lower() in {"1", "true", "yes"}:
+        _store_cleaned_text(extracted.text_id, cleaned_text)
+        db.session.commit()
+    else:
+        persist(_store_cleaned_text, extracted.text_id, cleaned_text)
 
     return (
         jsonify(
@@ -189,7 +254,7 @@ def preprocess(sheet_id: int):
                 "text_id": extracted.text_id,
                 "sheet_id": extracted.sheet_id,
                 "raw_text": extracted.raw_text,
-                "cleaned_text": extracted.cleaned_text,
+                "cleaned_text": cleaned_text,
                 "extraction_confidence": extracted.extraction_confidence,
             }
         ),
@@ -9,14 +9,14 @@ from .models import UserRole
 
 
 def role_required(allowed_roles: Iterable[UserRole]):
-    allowed_values = {r.value if isinstance(r, UserRole) else str(r) for r in allowed_roles}
+    allowed_values = frozenset(
+        r.value if isinstance(r, UserRole) else str(r) for r in allowed_roles
+    )
 
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            claims = get_jwt()
-            role = claims.get("role")
-            if role not in allowed_values:
+            if get_jwt().get("role") not in allowed_values:
                 return (
                     jsonify({"message": "Forbidden: insufficient permissions."}),
                     HTTPStatus.FORBIDDEN,
@@ -1,15 +1,95 @@
 from http import HTTPStatus
-from datetime import datetime
 
 from flask import Blueprint, jsonify
 from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
-from ..models import AnswerSheet, AnswerSheetStatus, Evaluation, Report, UserRole
+from ..models import (
+    AnswerSheet,
+    AnswerSheetStatus,
+    Evaluation,
+    ExtractedText,
+    Report,
+    UserRole,
+)
 
 
 report_bp = Blueprint("report", __name__, url_prefix="/report")
 
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_missing_reports(rows: list[dict]) -> None:
+    """Insert the reports in ``rows`` whose (student, exam) has none yet.
+
+    On SQLite and PostgreSQL this is one ``INSERT ... ON CONFLICT DO
+    NOTHING`` relying on ``uq_reports_student_exam``, so two requests
+    generating the same report cannot both insert it. Other databases
+    insert row by row inside a savepoint. The caller commits.
+    """
+
+    if not rows:
+        return
+
+    dialect_insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        db.session.execute(dialect_insert(Report).values(rows).on_conflict_do_nothing())
+        return
+
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.add(Report(**row))
+        except IntegrityError:
+            continue
+
+
+def generate_missing_reports(student_id: int, exam_ids: list[int] | None = None) -> None:
+    """Create the reports ``student_id`` is missing for reviewed exams.
+
+    Each report takes the best score across the reviewed sheets of its
+    exam, with their feedback as remarks. ``exam_ids`` limits the exams
+    considered. Run through :func:`gradix.jobs.persist` whenever a sheet
+    becomes reviewed, so report pages only read ``Report`` rows.
+    """
+
+    query = (
+        db.select(AnswerSheet.exam_id, AnswerSheet.sheet_id, Evaluation.score, Evaluation.feedback)
+        .join(ExtractedText, ExtractedText.sheet_id == AnswerSheet.sheet_id)
+        .join(Evaluation, Evaluation.text_id == ExtractedText.text_id)
+        .where(
+            AnswerSheet.student_id == student_id,
+            AnswerSheet.status == AnswerSheetStatus.REVIEWED,
+            Evaluation.score.is_not(None),
+            AnswerSheet.exam_id.not_in(
+                db.select(Report.exam_id).where(Report.student_id == student_id)
+            ),
+        )
+        .order_by(AnswerSheet.exam_id.asc(), AnswerSheet.sheet_id.asc())
+    )
+    if exam_ids is not None:
+        query = query.where(AnswerSheet.exam_id.in_(exam_ids))
+
+    rows_by_exam: dict[int, list] = {}
+    for row in db.session.execute(query):
+        rows_by_exam.setdefault(row.exam_id, []).append(row)
+
+    new_reports = []
+    for exam_id, rows in rows_by_exam.items():
+        remarks_parts = [f"Sheet {r.sheet_id}: {r.feedback}" for r in rows if r.feedback]
+        new_reports.append(
+            {
+                "student_id": student_id,
+                "exam_id": exam_id,
+                # Use the best (maximum) score across attempts for this exam
+                "total_score": round(max(r.score for r in rows), 2),
+                "remarks": " \n".join(remarks_parts) if remarks_parts else None,
+            }
+        )
+    insert_missing_reports(new_reports)
+
 
 @report_bp.get("/<int:student_id>/<int:exam_id>")
 @jwt_required()
@@ -41,36 +121,31 @@ def get_report(student_id: int, exam_id: int):
     # If a report already exists, return it
     report = Report.query.filter_by(student_id=student_id, exam_id=exam_id).first()
     if report is None:
-        # Generate only if there is at least one reviewed answer sheet
-        sheets = (
-            AnswerSheet.query.filter_by(
-                student_id=student_id,
-                exam_id=exam_id,
-                status=AnswerSheetStatus.REVIEWED,
+        # Generate only if there is at least one reviewed answer sheet.
+        # One joined query returns each reviewed sheet with its
+        # evaluation (if any) instead of lazy-loading both per sheet.
+        rows = db.session.execute(
+            db.select(AnswerSheet.sheet_id, Evaluation.score, Evaluation.feedback)
+            .outerjoin(ExtractedText, ExtractedText.sheet_id == AnswerSheet.sheet_id)
+            .outerjoin(Evaluation, Evaluation.text_id == ExtractedText.text_id)
+            .where(
+                AnswerSheet.student_id == student_id,
+                AnswerSheet.exam_id == exam_id,
+                AnswerSheet.status == AnswerSheetStatus.REVIEWED,
             )
             .order_by(AnswerSheet.sheet_id.asc())
-            .all()
-        )
+        ).all()
 
-        if not sheets:
+        if not rows:
             return (
                 jsonify({"message": "Report not available. No reviewed answer sheets found."}),
                 HTTPStatus.BAD_REQUEST,
             )
 
         # Aggregate evaluation scores across reviewed sheets
-        scores = []
-        remarks_parts = []
-        for sheet in sheets:
-            extracted = sheet.extracted_text
-            if not extracted or not extracted.evaluation:
-                continue
-            eval_obj: Evaluation = extracted.evaluation
-            scores.append(eval_obj.score)
-            if eval_obj.feedback:
-                remarks_parts.append(
-                    f"Sheet {sheet.sheet_id}: {eval_obj.feedback}"
-                )
+        evaluated = [r for r in rows if r.score is not None]
+        scores = [r.score for r in evaluated]
+        remarks_parts = [f"Sheet {r.sheet_id}: {r.feedback}" for r in evaluated if r.feedback]
 
         if not scores:
             return (
@@ -82,15 +157,19 @@ def get_report(student_id: int, exam_id: int):
         total_score = round(max(scores), 2)
         remarks = " \n".join(remarks_parts) if remarks_parts else None
 
-        report = Report(
-            student_id=student_id,
-            exam_id=exam_id,
-            total_score=total_score,
-            remarks=remarks,
-            generated_on=datetime.utcnow(),
+        insert_missing_reports(
+            [
+                {
+                    "student_id": student_id,
+                    "exam_id": exam_id,
+                    "total_score": total_score,
+                    "remarks": remarks,
+                }
+            ]
         )
-        db.session.add(report)
         db.session.commit()
+        # Ours, or the one a concurrent request inserted first.
+        report = Report.query.filter_by(student_id=student_id, exam_id=exam_id).one()
 
     return (
         jsonify(
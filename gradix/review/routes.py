@@ -1,17 +1,19 @@
 from http import HTTPStatus
-from datetime import datetime
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 
 from ..extensions import db
+from ..jobs import persist
 from ..models import (
     AnswerSheet,
     AnswerSheetStatus,
     Evaluation,
     UserRole,
+    utcnow,
 )
 from ..rbac import role_required
+from ..report.routes import generate_missing_reports
 
 
 review_bp = Blueprint("review", __name__, url_prefix="/review")
@@ -21,7 +23,7 @@ review_bp = Blueprint("review", __name__, url_prefix="/review")
 @jwt_required()
 @role_required({UserRole.TEACHER})
 def get_review(sheet_id: int):
-    sheet = AnswerSheet.query.get(sheet_id)
+    sheet = db.session.get(AnswerSheet, sheet_id)
     if sheet is None:
         return (
             jsonify({"message": "AnswerSheet not found."}),
@@ -77,7 +79,7 @@ def get_review(sheet_id: int):
 @jwt_required()
 @role_required({UserRole.TEACHER})
 def override_review(sheet_id: int):
-    sheet = AnswerSheet.query.get(sheet_id)
+    sheet = db.session.get(AnswerSheet, sheet_id)
     if sheet is None:
         return (
             jsonify({"message": "AnswerSheet not found."}),
@@ -120,11 +122,12 @@ def override_review(sheet_id: int):
     evaluation.score = score_val
     if feedback is not None:
         evaluation.feedback = feedback
-    evaluation.evaluated_on = datetime.utcnow()
+    evaluation.evaluated_on = utcnow()
 
     sheet.status = AnswerSheetStatus.REVIEWED
 
     db.session.commit()
+    persist(generate_missing_reports, sheet.student_id, [sheet.exam_id])
 
     return (
         jsonify(
@@ -0,0 +1,29 @@
+"""Helpers for streaming large JSON responses."""
+
+from collections.abc import Iterable
+
+from flask import Response, current_app, stream_with_context
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def ndjson_response(items: Iterable, status: int = 200) -> Response:
+    """Stream ``items`` as newline-delimited JSON, one object per line.
+
+    Each line is sent as soon as its item is produced, so clients can
+    show progress for long-running work. ``items`` runs inside the
+    request context.
+    """
+
+    dumps = current_app.json.dumps
+
+    def generate():
+        for item in items:
+            yield dumps(item) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        status=status,
+        mimetype=NDJSON_MIMETYPE,
+    )
@@ -2,6 +2,8 @@ from http import HTTPStatus
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
 from ..models import Student, UserRole
@@ -10,6 +12,43 @@ from ..rbac import role_required
 
 student_bp = Blueprint("student", __name__, url_prefix="/student")
 
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_missing_students(rows: list[dict]) -> dict[str, int]:
+    """Insert the students in ``rows`` whose roll number is not taken yet.
+
+    Returns ``{roll_no: student_id}`` for the rows actually inserted.
+    On SQLite and PostgreSQL this is one ``INSERT ... ON CONFLICT
+    (roll_no) DO NOTHING RETURNING`` statement, so there is no window
+    between checking for a duplicate and inserting. Other databases
+    insert row by row inside a savepoint. The caller commits.
+    """
+
+    if not rows:
+        return {}
+
+    dialect_insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = (
+            dialect_insert(Student)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["roll_no"])
+            .returning(Student.roll_no, Student.student_id)
+        )
+        return dict(db.session.execute(stmt).all())
+
+    created: dict[str, int] = {}
+    for row in rows:
+        student = Student(**row)
+        try:
+            with db.session.begin_nested():
+                db.session.add(student)
+        except IntegrityError:
+            continue
+        created[student.roll_no] = student.student_id
+    return created
+
 
 @student_bp.post("/create")
 @jwt_required()
@@ -28,22 +67,20 @@ def create_student():
             HTTPStatus.BAD_REQUEST,
         )
 
-    existing = Student.query.filter_by(roll_no=roll_no).first()
-    if existing is not None:
+    values = {"name": name, "roll_no": roll_no, "course": course, "semester": semester}
+    # Keyed by the stored roll number, which may differ in type from
+    # the request's (e.g. a JSON number), so take the one entry as is.
+    created = list(insert_missing_students([values]).values())
+    if not created:
+        db.session.rollback()
         return (
             jsonify({"message": "Student with this roll number already exists."}),
             HTTPStatus.CONFLICT,
         )
-
-    student = Student(
-        name=name,
-        roll_no=roll_no,
-        course=course,
-        semester=semester,
-    )
-    db.session.add(student)
     db.session.commit()
 
+    # Respond with the values as stored, not as sent.
+    student = db.session.get(Student, created[0])
     return (
         jsonify(
             {
@@ -58,23 +95,50 @@ def create_student():
     )
 
 
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+
+
 @student_bp.get("/list")
 @jwt_required()
 @role_required({UserRole.ADMIN, UserRole.TEACHER})
 def list_students():
-    students = Student.query.order_by(Student.student_id.desc()).all()
+    """Return one page of students, newest first.
+
+    Keyset pagination like ``GET /exam/list``: pass the previous
+    response's ``next_cursor`` as ``?cursor=`` to get the next page
+    (``?limit=`` rows, default 100). Only the listed columns are
+    selected, as plain rows rather than ORM objects.
+    """
+
+    try:
+        limit = int(request.args.get("limit", LIST_DEFAULT_LIMIT))
+        cursor = request.args.get("cursor", type=int)
+        if request.args.get("cursor") and cursor is None:
+            raise ValueError
+    except ValueError:
+        return (
+            jsonify({"message": "'limit' and 'cursor' must be integers."}),
+            HTTPStatus.BAD_REQUEST,
+        )
+    limit = max(1, min(limit, LIST_MAX_LIMIT))
+
+    query = db.select(
+        Student.student_id, Student.name, Student.roll_no, Student.course, Student.semester
+    )
+    if cursor is not None:
+        query = query.where(Student.student_id < cursor)
+    # One extra row tells us whether another page exists.
+    rows = db.session.execute(query.order_by(Student.student_id.desc()).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
     return (
         jsonify(
-            [
-                {
-                    "student_id": s.student_id,
-                    "name": s.name,
-                    "roll_no": s.roll_no,
-                    "course": s.course,
-                    "semester": s.semester,
-                }
-                for s in students
-            ]
+            {
+                "students": [row._asdict() for row in rows],
+                "next_cursor": rows[-1].student_id if has_more else None,
+            }
         ),
         HTTPStatus.OK,
     )
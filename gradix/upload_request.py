@@ -0,0 +1,53 @@
+"""Request class that spools large uploads inside ``UPLOAD_FOLDER``.
+
+Werkzeug spools file parts over 500 KB to an anonymous temporary file
+(usually under ``/tmp``), which ``_save_upload`` then copies into the
+upload folder. :class:`UploadRequest` creates that temporary file in
+``UPLOAD_FOLDER`` itself, so saving the upload is a hard link of bytes
+already on the right filesystem instead of a second full copy. The
+temporary name is removed when the request closes its files. Other
+platforms keep Werkzeug's default spooling.
+"""
+
+import os
+import tempfile
+from typing import IO
+
+from flask import Request, current_app
+from werkzeug.formparser import default_stream_factory
+
+
+# Same threshold Werkzeug uses to move a part from memory to disk.
+SPOOL_TO_DISK_SIZE = 1024 * 500
+
+
+class UploadRequest(Request):
+    def _get_file_stream(
+        self,
+        total_content_length: int | None,
+        content_type: str | None,
+        filename: str | None = None,
+        content_length: int | None = None,
+    ) -> IO[bytes]:
+        # POSIX only: on Windows the temporary file is delete-on-close
+        # (so it cannot outlive the request as a hard link) and
+        # os.fchmod is missing before Python 3.13.
+        if os.name == "posix" and (
+            total_content_length is None or total_content_length > SPOOL_TO_DISK_SIZE
+        ):
+            try:
+                stream = tempfile.NamedTemporaryFile(
+                    "wb+", dir=current_app.config["UPLOAD_FOLDER"], prefix=".upload-"
+                )
+            except (OSError, KeyError, RuntimeError):
+                pass
+            else:
+                # mkstemp files are 0600; match files written with open().
+                os.fchmod(stream.fileno(), 0o644)
+                return stream
+        return default_stream_factory(
+            total_content_length=total_content_length,
+            content_type=content_type,
+            filename=filename,
+            content_length=content_length,
+        )
@@ -1,16 +1,19 @@
+import functools
+import mimetypes
 import os
 import re
 import json
 import tempfile
-from datetime import datetime
 from functools import wraps
+from urllib.parse import quote
 from uuid import uuid4
 
-import bcrypt
 from flask import (
     Blueprint,
+    abort,
     current_app,
     flash,
+    make_response,
     redirect,
     render_template,
     request,
@@ -19,6 +22,9 @@ from flask import (
     url_for,
     jsonify,
 )
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import contains_eager, defer, joinedload, load_only, selectinload
+from werkzeug.security import safe_join
 
 from .extensions import db
 from .models import (
@@ -28,21 +34,36 @@ from .models import (
     Exam,
     ExamQuestion,
     ExtractedText,
+    Job,
+    JobStatus,
+    QuestionEvaluation,
     Report,
     Student,
     User,
     UserRole,
     QuestionStudentComment,
+    utcnow,
 )
 from .ocr.routes import run_ocr
 from .preprocess.routes import preprocess_text, split_numbered_answers
 from .evaluate.routes import evaluate_text_by_questions
-from .answersheet.routes import _allowed_file
+from .exam.cache import all_exams
+from .answersheet.routes import _allowed_extension, _save_upload
+from .jobs import persist, submit as submit_job
+from .report.routes import generate_missing_reports, insert_missing_reports
+from .student.routes import insert_missing_students
+from .passwords import dummy_verify, hash_password, needs_rehash, verify_password
 
 
 web_bp = Blueprint("web", __name__)
 
 
+def _session_role() -> str | None:
+    # Logins store the role at the top level of the session; sessions
+    # created before that only have it under "user".
+    return session.get("role") or (session.get("user") or {}).get("role")
+
+
 def login_required_view(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
@@ -55,15 +76,14 @@ def login_required_view(fn):
 
 
 def role_required_view(allowed_roles):
-    role_values = {
+    role_values = frozenset(
         r.value if isinstance(r, UserRole) else str(r) for r in allowed_roles
-    }
+    )
 
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            user = session.get("user")
-            if not user or user.get("role") not in role_values:
+            if _session_role() not in role_values:
                 flash("You do not have permission to access this page.", "error")
                 return redirect(url_for("web.login_page"))
             return fn(*args, **kwargs)
@@ -109,46 +129,49 @@ def _parse_students_from_ocr_text(text: str) -> list[dict[str, str]]:
     return students
 
 
+# Landing page for each logged-in role.
+_ROLE_HOME = {
+    UserRole.TEACHER.value: "web.teacher_dashboard",
+    UserRole.STUDENT.value: "web.student_report",
+    UserRole.ADMIN.value: "web.admin_home",
+}
+
+
+def _home_for(role: str | None):
+    return redirect(url_for(_ROLE_HOME.get(role, "web.login_page")))
+
+
 @web_bp.route("/")
 def index():
-    if "user" in session:
-        role = session["user"].get("role")
-        if role == UserRole.TEACHER.value:
-            return redirect(url_for("web.teacher_dashboard"))
-        if role == UserRole.STUDENT.value:
-            return redirect(url_for("web.student_report"))
-        if role == UserRole.ADMIN.value:
-            return redirect(url_for("web.admin_home"))
-    return redirect(url_for("web.login_page"))
+    return _home_for(_session_role())
 
 
 @web_bp.route("/login", methods=["GET", "POST"])
 def login_page():
     # If already logged in, redirect based on role instead of re-showing login
-    if request.method == "GET" and "user" in session:
-        role = session["user"].get("role")
-        if role == UserRole.TEACHER.value:
-            return redirect(url_for("web.teacher_dashboard"))
-        if role == UserRole.STUDENT.value:
-            return redirect(url_for("web.student_report"))
-        if role == UserRole.ADMIN.value:
-            return redirect(url_for("web.admin_home"))
+    if request.method == "GET" and _session_role() in _ROLE_HOME:
+        return _home_for(_session_role())
 
     if request.method == "POST":
         email = (request.form.get("email") or "").strip()
         password = request.form.get("password") or ""
 
-        user = User.query.filter_by(email=email).first()
+        user = db.session.execute(
+            db.select(User).where(User.email == email)
+        ).scalar_one_or_none()
         if user is None:
+            dummy_verify(password)
             flash("Invalid email or password.", "error")
             return render_template("login.html")
 
-        if not bcrypt.checkpw(
-            password.encode("utf-8"), user.password_hash.encode("utf-8")
-        ):
+        if not verify_password(password, user.password_hash):
             flash("Invalid email or password.", "error")
             return render_template("login.html")
 
+        if needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+            db.session.commit()
+
         session.clear()
         session["user"] = {
             "user_id": user.user_id,
@@ -156,12 +179,9 @@ def login_page():
             "email": user.email,
             "role": user.role.value,
         }
+        session["role"] = user.role.value
 
-        if user.role == UserRole.TEACHER:
-            return redirect(url_for("web.teacher_dashboard"))
-        if user.role == UserRole.STUDENT:
-            return redirect(url_for("web.student_report"))
-        return redirect(url_for("web.admin_home"))
+        return _home_for(user.role.value)
 
     return render_template("login.html")
 
@@ -194,6 +214,7 @@ def student_login():
         "email": None,
         "role": UserRole.STUDENT.value,
     }
+    session["role"] = UserRole.STUDENT.value
 
     return redirect(url_for("web.student_report"))
 
@@ -217,13 +238,17 @@ def admin_home():
 @role_required_view({UserRole.TEACHER})
 def teacher_dashboard():
     teacher = session.get("user")
-    exams = Exam.query.order_by(Exam.exam_id.asc()).all()
-    sheets = AnswerSheet.query.order_by(AnswerSheet.upload_date.desc()).all()
-
-    # Pending student comments (unresolved) across all sheets
+    exams = all_exams()
+    # Pending student comments (unresolved) across all sheets. The
+    # template shows each comment's student and exam, so load those in
+    # the same query.
     pending_comments = (
         db.session.query(QuestionStudentComment)
         .join(AnswerSheet, QuestionStudentComment.sheet_id == AnswerSheet.sheet_id)
+        .options(
+            contains_eager(QuestionStudentComment.sheet).joinedload(AnswerSheet.exam),
+            joinedload(QuestionStudentComment.student),
+        )
         .filter(QuestionStudentComment.resolved.is_(False))
         .order_by(QuestionStudentComment.created_at.desc())
         .all()
@@ -232,7 +257,6 @@ def teacher_dashboard():
         "teacher_dashboard.html",
         teacher=teacher,
         exams=exams,
-        sheets=sheets,
         pending_comments=pending_comments,
         AnswerSheetStatus=AnswerSheetStatus,
     )
@@ -393,29 +417,30 @@ def create_exam_page():
         db.session.add(exam)
         db.session.flush()
 
-        rubric_parts: list[str] = []
-        for item in questions:
-            eq = ExamQuestion(
-                exam_id=exam.exam_id,
-                question_no=item["question_no"],
-                question_text=item["question_text"],
-                # Model answers are now optional; store an empty
-                # string instead of NULL so existing databases where
-                # answer_text is NOT NULL continue to work.
-                answer_text="",
-                marks=item["marks"],
-                or_group=item.get("or_group"),
-            )
-            db.session.add(eq)
-            rubric_parts.append(
-                (
-                    f"Q{item['question_no']}"
-                    + (f" ({item['marks']} marks)" if item["marks"] is not None else "")
-                    + f". {item['question_text']}"
-                )
+        if questions:
+            # One executemany INSERT for all of the exam's questions.
+            db.session.execute(
+                insert(ExamQuestion),
+                [
+                    {
+                        "exam_id": exam.exam_id,
+                        "question_no": item["question_no"],
+                        "question_text": item["question_text"],
+                        # Model answers are now optional; store an empty
+                        # string instead of NULL so existing databases where
+                        # answer_text is NOT NULL continue to work.
+                        "answer_text": "",
+                        "marks": item["marks"],
+                        "or_group": item.get("or_group"),
+                    }
+                    for item in questions
+                ],
             )
 
-        if rubric_parts:
+            rubric_parts: list[str] = []
+            for item in questions:
+                marks_part = f" ({item['marks']} marks)" if item["marks"] is not None else ""
+                rubric_parts.append(f"Q{item['question_no']}{marks_part}. {item['question_text']}")
             exam.rubric_details = "\n\n".join(rubric_parts)
 
         db.session.commit()
@@ -452,7 +477,7 @@ def extract_questions_from_paper():
     ext = (file.filename.rsplit(".", 1)[1].lower() if "." in file.filename else "png")
     safe_name = f"question_paper_{uuid4().hex}.{ext}"
     full_path = os.path.join(upload_folder, safe_name)
-    file.save(full_path)
+    _save_upload(file, full_path)
 
     try:
         raw_text = ""
@@ -644,7 +669,7 @@ def extract_questions_from_paper():
 @login_required_view
 @role_required_view({UserRole.TEACHER, UserRole.ADMIN})
 def view_exam(exam_id: int):
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
     questions = (
         ExamQuestion.query.filter_by(exam_id=exam.exam_id)
         .order_by(ExamQuestion.question_no.asc())
@@ -659,7 +684,7 @@ def view_exam(exam_id: int):
 def delete_exam_view(exam_id: int):
     from .exam.routes import _delete_exam_with_children
 
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
 
     # Remove exam and all related data (questions, sheets, reports)
     _delete_exam_with_children(exam)
@@ -699,22 +724,17 @@ def manage_students():
             if not semester:
                 errors.append("Semester is required.")
 
-            if Student.query.filter_by(roll_no=roll_no).first() is not None:
-                errors.append("A student with this roll number already exists.")
-
             if errors:
                 for e in errors:
                     flash(e, "error")
-            else:
-                student = Student(
-                    name=name,
-                    roll_no=roll_no,
-                    course=course,
-                    semester=semester,
-                )
-                db.session.add(student)
+            elif insert_missing_students(
+                [{"name": name, "roll_no": roll_no, "course": course, "semester": semester}]
+            ):
                 db.session.commit()
                 flash("Student added successfully.", "success")
+            else:
+                db.session.rollback()
+                flash("A student with this roll number already exists.", "error")
 
             return redirect(url_for("web.manage_students"))
 
@@ -730,7 +750,7 @@ def manage_students():
             fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(file.filename)[1] or ".png")
             os.close(fd)
             try:
-                file.save(tmp_path)
+                _save_upload(file, tmp_path)
 
                 # Prefer Gemini Vision for structured extraction. If it is
                 # misconfigured or fails, fall back to local OCR + regex.
@@ -853,23 +873,22 @@ def manage_students():
                 flash("Invalid OCR data submitted. Please extract again.", "error")
                 return redirect(url_for("web.manage_students"))
 
-            created_count = 0
+            # One row per roll number; ones already registered are
+            # skipped by the insert itself.
+            new_rows: dict[str, dict] = {}
             for item in records:
                 name = (item.get("name") or "").strip()
                 roll_no = (item.get("roll_no") or "").strip()
-                if not name or not roll_no:
-                    continue
-                if Student.query.filter_by(roll_no=roll_no).first() is not None:
+                if not name or not roll_no or roll_no in new_rows:
                     continue
+                new_rows[roll_no] = {
+                    "name": name,
+                    "roll_no": roll_no,
+                    "course": ocr_course,
+                    "semester": ocr_semester,
+                }
 
-                student = Student(
-                    name=name,
-                    roll_no=roll_no,
-                    course=ocr_course,
-                    semester=ocr_semester,
-                )
-                db.session.add(student)
-                created_count += 1
+            created_count = len(insert_missing_students(list(new_rows.values())))
 
             if created_count:
                 db.session.commit()
@@ -915,7 +934,7 @@ def manage_students():
 def delete_student(student_id: int):
     """Remove a student and their related data (answer sheets, reports)."""
 
-    student = Student.query.get_or_404(student_id)
+    student = db.get_or_404(Student, student_id)
 
     # Delete answer sheets and their nested evaluation data
     for sheet in list(student.answer_sheets):
@@ -974,55 +993,69 @@ def evaluated_students():
             selected_exam_id = None
 
         if selected_exam_id is not None:
-            selected_exam = Exam.query.get(selected_exam_id)
+            selected_exam = db.session.get(Exam, selected_exam_id)
 
             if selected_exam is not None:
-                from .models import ExtractedText  # local import to avoid cycles
-
-                rows = (
-                    db.session.query(Student, AnswerSheet, Evaluation)
-                    .join(AnswerSheet, AnswerSheet.student_id == Student.student_id)
+                graded = [AnswerSheetStatus.GRADED, AnswerSheetStatus.REVIEWED]
+
+                # Rank each student's evaluated sheets, newest first, so
+                # the database returns only the latest one per student.
+                ranked = (
+                    db.session.query(
+                        AnswerSheet.sheet_id,
+                        db.func.row_number()
+                        .over(
+                            partition_by=AnswerSheet.student_id,
+                            order_by=AnswerSheet.upload_date.desc(),
+                        )
+                        .label("rn"),
+                    )
                     .join(ExtractedText, ExtractedText.sheet_id == AnswerSheet.sheet_id)
                     .join(Evaluation, Evaluation.text_id == ExtractedText.text_id)
                     .filter(
                         AnswerSheet.exam_id == selected_exam_id,
-                        AnswerSheet.status.in_([AnswerSheetStatus.GRADED, AnswerSheetStatus.REVIEWED]),
+                        AnswerSheet.status.in_(graded),
                     )
-                    .order_by(Student.name.asc(), AnswerSheet.upload_date.desc())
-                    .all()
+                    .subquery()
                 )
 
-                latest_by_student = {}
-                for student, sheet, evaluation in rows:
-                    # First row per student is the latest due to ordering
-                    if student.student_id not in latest_by_student:
-                        latest_by_student[student.student_id] = (student, sheet, evaluation)
-
-                for student_id, (student, sheet, evaluation) in latest_by_student.items():
-                    student_rows.append(
-                        {
-                            "student": student,
-                            "sheet": sheet,
-                            "evaluation": evaluation,
-                        }
-                    )
+                query = (
+                    db.session.query(Student, AnswerSheet, Evaluation)
+                    .join(AnswerSheet, AnswerSheet.student_id == Student.student_id)
+                    .join(ranked, db.and_(ranked.c.sheet_id == AnswerSheet.sheet_id, ranked.c.rn == 1))
+                    .join(ExtractedText, ExtractedText.sheet_id == AnswerSheet.sheet_id)
+                    .join(Evaluation, Evaluation.text_id == ExtractedText.text_id)
+                    # The list shows only the score; skip the long feedback.
+                    .options(load_only(Evaluation.eval_id, Evaluation.score))
+                )
 
                 # Optional search filter by name or roll number
                 if search_query:
                     sq = search_query.lower()
-                    filtered_rows = []
-                    for row in student_rows:
-                        name = (row["student"].name or "").lower()
-                        roll = (row["student"].roll_no or "").lower()
-                        if sq in name or sq in roll:
-                            filtered_rows.append(row)
-                    student_rows = filtered_rows
-
-                # Sorting: default by marks descending, or ascending if requested
+                    query = query.filter(
+                        db.or_(
+                            db.func.lower(Student.name).contains(sq, autoescape=True),
+                            db.func.lower(Student.roll_no).contains(sq, autoescape=True),
+                        )
+                    )
+
+                # Sorting: default by marks descending, or ascending if
+                # requested; equal marks are ordered by name, ignoring case.
                 if sort_order == "marks_asc":
-                    student_rows.sort(key=lambda r: float(getattr(r["evaluation"], "score", 0.0)))
+                    score_order = Evaluation.score.asc()
                 else:  # "marks_desc" or anything else
-                    student_rows.sort(key=lambda r: float(getattr(r["evaluation"], "score", 0.0)), reverse=True)
+                    score_order = Evaluation.score.desc()
+
+                student_rows = [
+                    {
+                        "student": student,
+                        "sheet": sheet,
+                        "evaluation": evaluation,
+                    }
+                    for student, sheet, evaluation in query.order_by(
+                        score_order, db.func.lower(Student.name).asc()
+                    )
+                ]
 
     return render_template(
         "evaluated_students.html",
@@ -1034,6 +1067,86 @@ def evaluated_students():
     )
 
 
+def _extract_upload_text(sheet_id: int) -> dict:
+    """OCR and clean an uploaded sheet's text and store it as ExtractedText.
+
+    Runs on the shared job pool for the upload page (see
+    :func:`_start_text_extraction`), so it reloads the sheet by id.
+    """
+
+    sheet = db.session.get(AnswerSheet, sheet_id)
+    full_path = os.path.join(current_app.config["UPLOAD_FOLDER"], os.path.basename(sheet.file_path))
+
+    # Run OCR via Gemini first (if configured), otherwise fall back to
+    # the existing local OCR pipeline. Evaluation happens later.
+    raw_text = ""
+    confidence = 0.0
+
+    use_gemini = os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}
+    if use_gemini:
+        try:  # pragma: no cover - depends on external API
+            from gemini_ocr_client import GeminiConfigError
+            from .ocr.cache import extract_text_cached as gemini_extract
+
+            current_app.logger.info("Attempting Gemini OCR for path: %s", full_path)
+            g_text = gemini_extract(full_path)
+            if g_text:
+                raw_text = g_text
+                confidence = 0.98
+            else:
+                raise RuntimeError("Empty text from Gemini OCR")
+        except GeminiConfigError as exc:
+            current_app.logger.warning(
+                "Gemini misconfigured, falling back to local OCR: %s",
+                exc,
+            )
+        except Exception as exc:  # noqa: BLE001
+            current_app.logger.exception(
+                "Gemini OCR failed, falling back to local OCR: %s",
+                exc,
+            )
+
+    if not raw_text:
+        raw_text, confidence = run_ocr(full_path)
+
+    cleaned_text = preprocess_text(raw_text)
+
+    extracted = sheet.extracted_text
+    if extracted is None:
+        extracted = ExtractedText(
+            sheet_id=sheet.sheet_id,
+            raw_text=raw_text,
+            cleaned_text=cleaned_text,
+            extraction_confidence=confidence,
+        )
+        db.session.add(extracted)
+    else:
+        extracted.raw_text = raw_text
+        extracted.cleaned_text = cleaned_text
+        extracted.extraction_confidence = confidence
+
+    db.session.commit()
+    return {"sheet_id": sheet.sheet_id, "text_id": extracted.text_id}
+
+
+def _start_text_extraction(sheet: AnswerSheet):
+    """Queue text extraction for ``sheet`` and show its upload page.
+
+    OCR and grammar correction take seconds, so by default they run on
+    the job pool and the page refreshes until the text is stored; pass
+    ``?sync=1`` to extract inline before the page is shown.
+    """
+
+    if request.args.get("sync", "").lower() in {"1", "true", "yes"}:
+        _extract_upload_text(sheet.sheet_id)
+        flash("Text extracted successfully. You can now run evaluation.", "success")
+        return redirect(url_for("web.upload_page", sheet_id=sheet.sheet_id))
+
+    job_id = submit_job(_extract_upload_text, sheet.sheet_id)
+    flash("Extracting text in the background. This page will update when it is ready.", "success")
+    return redirect(url_for("web.upload_page", sheet_id=sheet.sheet_id, job_id=job_id))
+
+
 @web_bp.route("/upload", methods=["GET", "POST"])
 @login_required_view
 @role_required_view({UserRole.TEACHER})
@@ -1048,13 +1161,23 @@ def upload_page():
                 sheet_id_int = int(request.form.get("sheet_id"))
             except (TypeError, ValueError):
                 flash("Invalid sheet id for evaluation.", "error")
-                exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+                exams = all_exams()
                 return render_template("upload.html", exams=exams)
 
-            sheet = AnswerSheet.query.get(sheet_id_int)
+            # Exam questions, extracted text and evaluation are all read
+            # below; load them up front.
+            sheet = db.session.get(
+                AnswerSheet,
+                sheet_id_int,
+                options=[
+                    joinedload(AnswerSheet.exam).selectinload(Exam.questions),
+                    joinedload(AnswerSheet.extracted_text)
+                    .joinedload(ExtractedText.evaluation),
+                ],
+            )
             if sheet is None or sheet.extracted_text is None:
                 flash("No extracted text found for this sheet. Please extract again.", "error")
-                exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+                exams = all_exams()
                 return render_template("upload.html", exams=exams)
 
             # Absolute path to the uploaded answer sheet file (image or PDF)
@@ -1071,10 +1194,7 @@ def upload_page():
 
             # If the exam has structured questions (with marks), prefer a
             # Gemini-based evaluation using the full rubric.
-            exam_questions = sorted(
-                getattr(exam, "questions", []),
-                key=lambda q: q.question_no,
-            )
+            exam_questions = list(exam.questions)
 
             # Build a textual representation of the rubric for storage in
             # Evaluation.model_answer_ref. Prefer any precomputed
@@ -1220,7 +1340,6 @@ def upload_page():
                     model_answer_ref=model_answer_text,
                     score=final_score,
                     feedback=feedback,
-                    evaluated_on=datetime.utcnow(),
                 )
                 db.session.add(evaluation)
                 db.session.flush()
@@ -1228,19 +1347,18 @@ def upload_page():
                 evaluation.model_answer_ref = model_answer_text
                 evaluation.score = final_score
                 evaluation.feedback = feedback
-                evaluation.evaluated_on = datetime.utcnow()
+                evaluation.evaluated_on = utcnow()
 
-                # Clear existing question scores
-                for qs in list(evaluation.question_scores):
-                    db.session.delete(qs)
+                # Clear existing question scores in one statement
+                db.session.execute(
+                    delete(QuestionEvaluation).where(
+                        QuestionEvaluation.eval_id == evaluation.eval_id
+                    )
+                )
+                db.session.expire(evaluation, ["question_scores"])
 
             # Store per-question evaluations, aligned to the exam's questions.
-            from .models import QuestionEvaluation
-
-            exam_questions = sorted(
-                getattr(exam, "questions", []),
-                key=lambda q: q.question_no,
-            )
+            new_rows: list[dict] = []
 
             if exam_questions:
                 # Map OCR-numbered answers by question number
@@ -1267,14 +1385,15 @@ def upload_page():
                         feedback_text = "Unanswered"
                         has_diagram = False
 
-                    qe = QuestionEvaluation(
-                        eval_id=evaluation.eval_id,
-                        question_no=eq.question_no,
-                        score=q_score,
-                        feedback=feedback_text,
-                        has_diagram=has_diagram,
+                    new_rows.append(
+                        {
+                            "eval_id": evaluation.eval_id,
+                            "question_no": eq.question_no,
+                            "score": q_score,
+                            "feedback": feedback_text,
+                            "has_diagram": has_diagram,
+                        }
                     )
-                    db.session.add(qe)
             else:
                 # Legacy: if exam has no defined questions, fall back to OCR numbers
                 for item in per_q:
@@ -1283,13 +1402,19 @@ def upload_page():
                         q_score = float(item["score"])
                     except (TypeError, ValueError):
                         continue
-                    qe = QuestionEvaluation(
-                        eval_id=evaluation.eval_id,
-                        question_no=q_no,
-                        score=q_score,
-                        has_diagram=bool(item.get("has_diagram", False)),
+                    new_rows.append(
+                        {
+                            "eval_id": evaluation.eval_id,
+                            "question_no": q_no,
+                            "score": q_score,
+                            "feedback": None,
+                            "has_diagram": bool(item.get("has_diagram", False)),
+                        }
                     )
-                    db.session.add(qe)
+
+            if new_rows:
+                db.session.execute(insert(QuestionEvaluation), new_rows)
+                db.session.expire(evaluation, ["question_scores"])
 
             sheet.status = AnswerSheetStatus.GRADED
             db.session.commit()
@@ -1305,87 +1430,16 @@ def upload_page():
                 sheet_id_int = int(request.form.get("sheet_id"))
             except (TypeError, ValueError):
                 flash("Invalid sheet id for extraction.", "error")
-                exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+                exams = all_exams()
                 return render_template("upload.html", exams=exams)
 
-            sheet = AnswerSheet.query.get(sheet_id_int)
+            sheet = db.session.get(AnswerSheet, sheet_id_int)
             if sheet is None:
                 flash("Answer sheet not found for extraction.", "error")
-                exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+                exams = all_exams()
                 return render_template("upload.html", exams=exams)
 
-            upload_folder = current_app.config["UPLOAD_FOLDER"]
-            os.makedirs(upload_folder, exist_ok=True)
-
-            sheet_filename = os.path.basename(sheet.file_path)
-            full_path = os.path.join(upload_folder, sheet_filename)
-
-            raw_text = ""
-            confidence = 0.0
-
-            use_gemini = os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}
-            if use_gemini:
-                try:  # pragma: no cover - depends on external API
-                    from gemini_ocr_client import (
-                        GeminiConfigError,
-                        extract_text as gemini_extract,
-                    )
-
-                    current_app.logger.info("Attempting Gemini OCR for path: %s", full_path)
-                    g_text = gemini_extract(full_path)
-                    if g_text:
-                        raw_text = g_text
-                        confidence = 0.98
-                    else:
-                        raise RuntimeError("Empty text from Gemini OCR")
-                except GeminiConfigError as exc:
-                    current_app.logger.warning(
-                        "Gemini misconfigured, falling back to local OCR: %s",
-                        exc,
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    current_app.logger.exception(
-                        "Gemini OCR failed, falling back to local OCR: %s",
-                        exc,
-                    )
-
-            if not raw_text:
-                raw_text, confidence = run_ocr(full_path)
-
-            cleaned_text = preprocess_text(raw_text)
-
-            extracted = sheet.extracted_text
-            if extracted is None:
-                extracted = ExtractedText(
-                    sheet_id=sheet.sheet_id,
-                    raw_text=raw_text,
-                    cleaned_text=cleaned_text,
-                    extraction_confidence=confidence,
-                )
-                db.session.add(extracted)
-            else:
-                extracted.raw_text = raw_text
-                extracted.cleaned_text = cleaned_text
-                extracted.extraction_confidence = confidence
-
-            db.session.commit()
-
-            flash("Text extracted successfully. You can now run evaluation.", "success")
-
-            exams = Exam.query.order_by(Exam.exam_id.asc()).all()
-            file_url = url_for(
-                "web.uploaded_file",
-                filename=os.path.basename(sheet.file_path),
-            )
-            selected_exam = sheet.exam
-            return render_template(
-                "upload.html",
-                exams=exams,
-                selected_exam=selected_exam,
-                sheet=sheet,
-                extracted=extracted,
-                file_url=file_url,
-            )
+            return _start_text_extraction(sheet)
 
         # Otherwise we are in the Extract Text step: upload + OCR only.
         student_name = (request.form.get("student_name") or "").strip()
@@ -1402,7 +1456,7 @@ def upload_page():
         exam = None
         try:
             exam_id_int = int(exam_id) if exam_id is not None else None
-            exam = Exam.query.get(exam_id_int) if exam_id_int is not None else None
+            exam = db.session.get(Exam, exam_id_int) if exam_id_int is not None else None
         except (TypeError, ValueError):
             errors.append("Exam must be valid.")
             exam_id_int = None
@@ -1411,17 +1465,18 @@ def upload_page():
             errors.append("Selected exam not found.")
 
         filename = file.filename or ""
-        if not filename or not _allowed_file(filename):
+        ext = _allowed_extension(filename)
+        if ext is None:
             errors.append("Invalid file type. Allowed: PDF, JPG, PNG.")
 
         if errors:
             for e in errors:
                 flash(e, "error")
-            exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+            exams = all_exams()
             selected_exam = None
             try:
                 if exam_id_int is not None:
-                    selected_exam = Exam.query.get(exam_id_int)
+                    selected_exam = db.session.get(Exam, exam_id_int)
             except Exception:  # noqa: BLE001
                 selected_exam = None
             return render_template("upload.html", exams=exams, selected_exam=selected_exam)
@@ -1429,39 +1484,42 @@ def upload_page():
         upload_folder = current_app.config["UPLOAD_FOLDER"]
         os.makedirs(upload_folder, exist_ok=True)
 
-        ext = filename.rsplit(".", 1)[1].lower()
         from uuid import uuid4
 
         # Find or create the student using roll number; name is
         # optional if the student is already registered.
-        student = Student.query.filter_by(roll_no=roll_no).first()
-        if student is None:
+        find_student_id = db.select(Student.student_id).where(Student.roll_no == roll_no)
+        student_id_int = db.session.execute(find_student_id).scalar_one_or_none()
+        if student_id_int is None:
             if not student_name:
                 errors.append(
                     "No student with this roll number. Provide a name to create one, or add the student via Manage Students.",
                 )
                 for e in errors:
                     flash(e, "error")
-                exams = Exam.query.order_by(Exam.exam_id.asc()).all()
-                selected_exam = Exam.query.get(exam_id_int) if exam_id_int is not None else None
+                exams = all_exams()
+                selected_exam = db.session.get(Exam, exam_id_int) if exam_id_int is not None else None
                 return render_template("upload.html", exams=exams, selected_exam=selected_exam)
 
             # Course and semester are required in the model, so we store
             # placeholder values when creating from this flow.
-            student = Student(
-                name=student_name,
-                roll_no=roll_no,
-                course="UNKNOWN",
-                semester="UNKNOWN",
-            )
-            db.session.add(student)
-            db.session.flush()
-
-        student_id_int = student.student_id
+            student_id_int = insert_missing_students(
+                [
+                    {
+                        "name": student_name,
+                        "roll_no": roll_no,
+                        "course": "UNKNOWN",
+                        "semester": "UNKNOWN",
+                    }
+                ]
+            ).get(roll_no)
+            if student_id_int is None:
+                # Registered by a concurrent request since the lookup.
+                student_id_int = db.session.execute(find_student_id).scalar_one()
 
         safe_name = f"{student_id_int}_{exam_id_int}_{uuid4().hex}.{ext}"
         full_path = os.path.join(upload_folder, safe_name)
-        file.save(full_path)
+        _save_upload(file, full_path)
 
         relative_path = os.path.join("uploads", safe_name)
 
@@ -1472,71 +1530,11 @@ def upload_page():
             status=AnswerSheetStatus.PENDING,
         )
         db.session.add(sheet)
-        db.session.flush()  # get sheet_id
-
-        # Run OCR via Gemini first (if configured), otherwise fall back to
-        # the existing local OCR pipeline. Evaluation happens later.
-        raw_text = ""
-        confidence = 0.0
-
-        use_gemini = os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}
-        if use_gemini:
-            try:  # pragma: no cover - depends on external API
-                from gemini_ocr_client import (
-                    GeminiConfigError,
-                    extract_text as gemini_extract,
-                )
-
-                current_app.logger.info("Attempting Gemini OCR for path: %s", full_path)
-                g_text = gemini_extract(full_path)
-                if g_text:
-                    raw_text = g_text
-                    confidence = 0.98
-                else:
-                    raise RuntimeError("Empty text from Gemini OCR")
-            except GeminiConfigError as exc:
-                current_app.logger.warning(
-                    "Gemini misconfigured, falling back to local OCR: %s",
-                    exc,
-                )
-            except Exception as exc:  # noqa: BLE001
-                current_app.logger.exception(
-                    "Gemini OCR failed, falling back to local OCR: %s",
-                    exc,
-                )
-
-        if not raw_text:
-            raw_text, confidence = run_ocr(full_path)
-
-        cleaned_text = preprocess_text(raw_text)
-
-        extracted = ExtractedText(
-            sheet_id=sheet.sheet_id,
-            raw_text=raw_text,
-            cleaned_text=cleaned_text,
-            extraction_confidence=confidence,
-        )
-        db.session.add(extracted)
-
         db.session.commit()
 
-        flash("Text extracted successfully. You can now run evaluation.", "success")
-
-        exams = Exam.query.order_by(Exam.exam_id.asc()).all()
-        file_url = url_for(
-            "web.uploaded_file",
-            filename=os.path.basename(sheet.file_path),
-        )
-        return render_template(
-            "upload.html",
-            exams=exams,
-            selected_exam=exam,
-            sheet=sheet,
-            extracted=extracted,
-            file_url=file_url,
-        )
+        return _start_text_extraction(sheet)
 
-    exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+    exams = all_exams()
 
     sheet = None
     extracted = None
@@ -1546,7 +1544,7 @@ def upload_page():
     if sheet_id_raw:
         try:
             sheet_id_int = int(sheet_id_raw)
-            sheet = AnswerSheet.query.get(sheet_id_int)
+            sheet = db.session.get(AnswerSheet, sheet_id_int)
         except (TypeError, ValueError):
             sheet = None
 
@@ -1555,12 +1553,13 @@ def upload_page():
     if exam_id_raw:
         try:
             exam_id_int = int(exam_id_raw)
-            selected_exam = Exam.query.get(exam_id_int)
+            selected_exam = db.session.get(Exam, exam_id_int)
         except (TypeError, ValueError):
             selected_exam = None
     elif sheet is not None:
         selected_exam = sheet.exam
 
+    extracting = False
     if sheet is not None:
         file_url = url_for(
             "web.uploaded_file",
@@ -1568,12 +1567,22 @@ def upload_page():
         )
         extracted = sheet.extracted_text
 
+        # Background extraction started by the POST above.
+        job_id = request.args.get("job_id")
+        job = db.session.get(Job, job_id) if job_id else None
+        if job is not None:
+            if job.status == JobStatus.FAILED:
+                flash(f"Text extraction failed: {job.error}", "error")
+            elif job.status != JobStatus.DONE:
+                extracting = True
+
     return render_template(
         "upload.html",
         exams=exams,
         selected_exam=selected_exam,
         sheet=sheet,
         extracted=extracted,
+        extracting=extracting,
         file_url=file_url,
     )
 
@@ -1588,7 +1597,7 @@ def select_exam_for_evaluation():
     requires the student's roll number and the answer sheet.
     """
 
-    exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+    exams = all_exams()
 
     # For each exam, count how many uploaded sheets are still pending evaluation
     pending_counts_rows = (
@@ -1616,7 +1625,7 @@ def teacher_exam_sheets(exam_id: int):
     OCR + evaluation without uploading files themselves.
     """
 
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
 
     # All sheets uploaded for this exam
     sheets = (
@@ -1661,7 +1670,7 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
     teacher only needs to trigger extraction/evaluation.
     """
 
-    sheet = AnswerSheet.query.get_or_404(sheet_id)
+    sheet = db.get_or_404(AnswerSheet, sheet_id)
     exam = sheet.exam
 
     upload_folder = current_app.config["UPLOAD_FOLDER"]
@@ -1679,10 +1688,8 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
         use_gemini = os.environ.get("USE_GEMINI", "").lower() in {"1", "true", "yes"}
         if use_gemini:
             try:  # pragma: no cover - depends on external API
-                from gemini_ocr_client import (
-                    GeminiConfigError,
-                    extract_text as gemini_extract,
-                )
+                from gemini_ocr_client import GeminiConfigError
+                from .ocr.cache import extract_text_cached as gemini_extract
 
                 current_app.logger.info("Attempting Gemini OCR for path: %s", sheet_abs_path)
                 g_text = gemini_extract(sheet_abs_path)
@@ -1723,14 +1730,9 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
         return redirect(url_for("web.teacher_exam_sheets", exam_id=sheet.exam_id))
 
     # Use the same evaluation pipeline as the upload page.
-    from .models import QuestionEvaluation
-
     segments = split_numbered_answers(extracted.raw_text)
 
-    exam_questions = sorted(
-        getattr(exam, "questions", []),
-        key=lambda q: q.question_no,
-    )
+    exam_questions = list(exam.questions)
 
     if exam.rubric_details:
         model_answer_text = exam.rubric_details
@@ -1848,7 +1850,6 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
             model_answer_ref=model_answer_text,
             score=final_score,
             feedback=feedback,
-            evaluated_on=datetime.utcnow(),
         )
         db.session.add(evaluation)
         db.session.flush()
@@ -1856,15 +1857,14 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
         evaluation.model_answer_ref = model_answer_text
         evaluation.score = final_score
         evaluation.feedback = feedback
-        evaluation.evaluated_on = datetime.utcnow()
+        evaluation.evaluated_on = utcnow()
 
-        for qs in list(evaluation.question_scores):
-            db.session.delete(qs)
+        db.session.execute(
+            delete(QuestionEvaluation).where(QuestionEvaluation.eval_id == evaluation.eval_id)
+        )
+        db.session.expire(evaluation, ["question_scores"])
 
-    exam_questions = sorted(
-        getattr(exam, "questions", []),
-        key=lambda q: q.question_no,
-    )
+    new_rows: list[dict] = []
 
     if exam_questions:
         per_q_by_no: dict[int, dict] = {}
@@ -1889,14 +1889,15 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
                 feedback_text = "Unanswered"
                 has_diagram = False
 
-            qe = QuestionEvaluation(
-                eval_id=evaluation.eval_id,
-                question_no=eq.question_no,
-                score=q_score,
-                feedback=feedback_text,
-                has_diagram=has_diagram,
+            new_rows.append(
+                {
+                    "eval_id": evaluation.eval_id,
+                    "question_no": eq.question_no,
+                    "score": q_score,
+                    "feedback": feedback_text,
+                    "has_diagram": has_diagram,
+                }
             )
-            db.session.add(qe)
     else:
         for item in per_q:
             try:
@@ -1904,13 +1905,19 @@ def teacher_extract_evaluate_sheet(sheet_id: int):
                 q_score = float(item["score"])
             except (TypeError, ValueError):
                 continue
-            qe = QuestionEvaluation(
-                eval_id=evaluation.eval_id,
-                question_no=q_no,
-                score=q_score,
-                has_diagram=bool(item.get("has_diagram", False)),
+            new_rows.append(
+                {
+                    "eval_id": evaluation.eval_id,
+                    "question_no": q_no,
+                    "score": q_score,
+                    "feedback": None,
+                    "has_diagram": bool(item.get("has_diagram", False)),
+                }
             )
-            db.session.add(qe)
+
+    if new_rows:
+        db.session.execute(insert(QuestionEvaluation), new_rows)
+        db.session.expire(evaluation, ["question_scores"])
 
     sheet.status = AnswerSheetStatus.GRADED
     db.session.commit()
@@ -1934,7 +1941,11 @@ def lookup_student_by_roll():
     if not roll_no:
         return jsonify({"found": False}), 200
 
-    student = Student.query.filter_by(roll_no=roll_no).first()
+    student = db.session.execute(
+        db.select(Student.name, Student.course, Student.semester).where(
+            Student.roll_no == roll_no
+        )
+    ).first()
     if student is None:
         return jsonify({"found": False}), 200
 
@@ -1948,11 +1959,93 @@ def lookup_student_by_roll():
     )
 
 
+@functools.lru_cache(maxsize=256)
+def _answer_segments(raw_text: str) -> tuple[tuple[int, str], ...]:
+    """Memoised :func:`split_numbered_answers` for the review and report pages.
+
+    A sheet's raw OCR text does not change between views, so repeat
+    views reuse the split. Keyed by the text itself, so re-extracted
+    text is split afresh.
+    """
+
+    return tuple(split_numbered_answers(raw_text))
+
+
+def _scored_answers(raw_text: str, question_scores) -> dict[int, str]:
+    """Answer text for the question numbers in ``question_scores`` only.
+
+    Stray numbered lines in the OCR text that were never scored are
+    left out of the map.
+    """
+
+    needed = {qe.question_no for qe in question_scores}
+    return {q_no: ans for q_no, ans in _answer_segments(raw_text) if q_no in needed}
+
+
+def _sheet_evaluation_options():
+    """Eager loads for a sheet's extracted text, evaluation and question scores.
+
+    The review and report pages split ``raw_text`` into answers but never
+    show ``cleaned_text``, so that column is left unloaded.
+    """
+
+    return joinedload(AnswerSheet.extracted_text).options(
+        defer(ExtractedText.cleaned_text),
+        joinedload(ExtractedText.evaluation).selectinload(Evaluation.question_scores),
+    )
+
+
+def _review_question_details(sheet: AnswerSheet, extracted, evaluation) -> list[dict]:
+    """Per-question rows for ``review.html``, from the stored question scores.
+
+    Only built when the page is rendered, not for a successful POST
+    that redirects.
+    """
+
+    # Use raw OCR text for splitting so that question numbers are
+    # preserved even if later preprocessing rewrites the text.
+    answers_by_q = _scored_answers(extracted.raw_text, evaluation.question_scores)
+
+    # Look up OR-group information for this exam so the review page
+    # can indicate which questions are alternatives (e.g. "1 OR 2").
+    exam_questions = ExamQuestion.query.filter_by(exam_id=sheet.exam_id).all()
+    or_by_q: dict[int, int | None] = {
+        eq.question_no: eq.or_group for eq in exam_questions
+    }
+    group_members: dict[int, list[int]] = {}
+    for eq in exam_questions:
+        if eq.or_group is None:
+            continue
+        group_members.setdefault(eq.or_group, []).append(eq.question_no)
+
+    per_question_details = []
+    for qe in evaluation.question_scores:
+        q_no = qe.question_no
+        or_group = or_by_q.get(q_no)
+        or_peers: list[int] = []
+        if or_group is not None:
+            members = group_members.get(or_group, [])
+            or_peers = sorted(q for q in members if q != q_no)
+
+        per_question_details.append(
+            {
+                "question_no": q_no,
+                "answer_text": answers_by_q.get(q_no, ""),
+                "score": qe.score,
+                "feedback": qe.feedback or "",
+                "or_group": or_group,
+                "or_peers": or_peers,
+                "has_diagram": bool(getattr(qe, "has_diagram", False)),
+            }
+        )
+    return per_question_details
+
+
 @web_bp.route("/review/<int:sheet_id>", methods=["GET", "POST"])
 @login_required_view
 @role_required_view({UserRole.TEACHER})
 def review_page(sheet_id: int):
-    sheet = AnswerSheet.query.get_or_404(sheet_id)
+    sheet = db.get_or_404(AnswerSheet, sheet_id, options=[_sheet_evaluation_options()])
     user = session.get("user") or {}
     teacher_name = user.get("name") or None
 
@@ -1967,47 +2060,6 @@ def review_page(sheet_id: int):
         flash("No evaluation found for this answer sheet.", "error")
         return redirect(url_for("web.teacher_dashboard"))
 
-    # Build per-question details for display from stored question scores.
-    per_question_details = []
-    if extracted is not None and evaluation is not None:
-        # Use raw OCR text for splitting so that question numbers are
-        # preserved even if later preprocessing rewrites the text.
-        answers_by_q = {
-            q_no: ans for q_no, ans in split_numbered_answers(extracted.raw_text)
-        }
-
-        # Look up OR-group information for this exam so the review page
-        # can indicate which questions are alternatives (e.g. "1 OR 2").
-        exam_questions = ExamQuestion.query.filter_by(exam_id=sheet.exam_id).all()
-        or_by_q: dict[int, int | None] = {
-            eq.question_no: eq.or_group for eq in exam_questions
-        }
-        group_members: dict[int, list[int]] = {}
-        for eq in exam_questions:
-            if eq.or_group is None:
-                continue
-            group_members.setdefault(eq.or_group, []).append(eq.question_no)
-
-        for qe in sorted(evaluation.question_scores, key=lambda x: x.question_no):
-            q_no = qe.question_no
-            or_group = or_by_q.get(q_no)
-            or_peers: list[int] = []
-            if or_group is not None:
-                members = group_members.get(or_group, [])
-                or_peers = sorted(q for q in members if q != q_no)
-
-            per_question_details.append(
-                {
-                    "question_no": q_no,
-                    "answer_text": answers_by_q.get(q_no, ""),
-                    "score": qe.score,
-                    "feedback": qe.feedback or "",
-                    "or_group": or_group,
-                        "or_peers": or_peers,
-                        "has_diagram": bool(getattr(qe, "has_diagram", False)),
-                }
-            )
-
     # Load any student comments for this sheet; when the teacher opens
     # the review page, mark unresolved comments as resolved so they no
     # longer appear as pending on the dashboard.
@@ -2036,12 +2088,15 @@ def review_page(sheet_id: int):
         # Update per-question scores and feedback
         question_nos = request.form.getlist("question_no")
         updated_scores = []
+        # QuestionEvaluation id -> (score, feedback), written in one UPDATE.
+        updates: dict[int, tuple[float, str | None]] = {}
+        # First row per question number, matching the form's question_no values.
+        scores_by_no = {}
+        for x in evaluation.question_scores:
+            scores_by_no.setdefault(str(x.question_no), x)
 
         for q_no_str in question_nos:
-            qe = next(
-                (x for x in evaluation.question_scores if str(x.question_no) == q_no_str),
-                None,
-            )
+            qe = scores_by_no.get(q_no_str)
             if qe is None:
                 continue
 
@@ -2057,7 +2112,7 @@ def review_page(sheet_id: int):
                     sheet=sheet,
                     extracted=extracted,
                     evaluation=evaluation,
-                    per_question_details=per_question_details,
+                    per_question_details=_review_question_details(sheet, extracted, evaluation),
                     file_url=url_for(
                         "web.uploaded_file",
                         filename=os.path.basename(sheet.file_path),
@@ -2066,8 +2121,7 @@ def review_page(sheet_id: int):
                     commented_q_nos=commented_q_nos,
                 )
 
-            qe.score = score_val
-            qe.feedback = request.form.get(feedback_field) or None
+            updates[qe.id] = (score_val, request.form.get(feedback_field) or None)
             updated_scores.append(score_val)
 
         if not updated_scores:
@@ -2077,7 +2131,7 @@ def review_page(sheet_id: int):
                 sheet=sheet,
                 extracted=extracted,
                 evaluation=evaluation,
-                per_question_details=per_question_details,
+                per_question_details=_review_question_details(sheet, extracted, evaluation),
                 file_url=url_for(
                     "web.uploaded_file",
                     filename=os.path.basename(sheet.file_path),
@@ -2086,13 +2140,32 @@ def review_page(sheet_id: int):
                 commented_q_nos=commented_q_nos,
             )
 
+        db.session.execute(
+            update(QuestionEvaluation)
+            .where(QuestionEvaluation.id.in_(updates))
+            .values(
+                score=db.case(
+                    {qe_id: score for qe_id, (score, _) in updates.items()},
+                    value=QuestionEvaluation.id,
+                    else_=QuestionEvaluation.score,
+                ),
+                feedback=db.case(
+                    {qe_id: feedback for qe_id, (_, feedback) in updates.items()},
+                    value=QuestionEvaluation.id,
+                    else_=QuestionEvaluation.feedback,
+                ),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.expire(evaluation, ["question_scores"])
+
         # Recompute overall score as the sum of question scores
         final_score = round(sum(updated_scores), 2)
         evaluation.score = final_score
         evaluation.feedback = (
             evaluation.feedback or ""
         ) + " (Adjusted via question-wise review.)"
-        evaluation.evaluated_on = datetime.utcnow()
+        evaluation.evaluated_on = utcnow()
         if teacher_name:
             evaluation.reviewed_by = teacher_name
         sheet.status = AnswerSheetStatus.REVIEWED
@@ -2108,13 +2181,12 @@ def review_page(sheet_id: int):
                 exam_id=sheet.exam_id,
                 total_score=final_score,
                 remarks=evaluation.feedback,
-                generated_on=datetime.utcnow(),
             )
             db.session.add(report)
         else:
             report.total_score = final_score
             report.remarks = evaluation.feedback
-            report.generated_on = datetime.utcnow()
+            report.generated_on = utcnow()
 
         db.session.commit()
 
@@ -2127,7 +2199,7 @@ def review_page(sheet_id: int):
         sheet=sheet,
         extracted=extracted,
         evaluation=evaluation,
-        per_question_details=per_question_details,
+        per_question_details=_review_question_details(sheet, extracted, evaluation),
         file_url=file_url,
         student_comments=student_comments,
         commented_q_nos=commented_q_nos,
@@ -2136,8 +2208,28 @@ def review_page(sheet_id: int):
 
 @web_bp.route("/uploads/<path:filename>")
 def uploaded_file(filename: str):
+    """Serve an uploaded sheet, or hand it to nginx when configured.
+
+    With ``UPLOADS_ACCEL_PREFIX`` set, only an ``X-Accel-Redirect``
+    header is returned and nginx sends the file itself. Otherwise
+    ``send_from_directory`` serves it (as ``X-Sendfile`` when
+    ``USE_X_SENDFILE`` is on).
+    """
+
     upload_folder = current_app.config["UPLOAD_FOLDER"]
-    return send_from_directory(upload_folder, filename)
+    accel_prefix = current_app.config.get("UPLOADS_ACCEL_PREFIX")
+    if not accel_prefix:
+        return send_from_directory(upload_folder, filename)
+
+    path = safe_join(upload_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    response = make_response("")
+    response.headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + quote(filename)
+    response.headers["Content-Type"] = (
+        mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    return response
 
 
 @web_bp.route("/student/report", methods=["GET", "POST"])
@@ -2149,7 +2241,7 @@ def student_report():
     student = None
     if student_id is not None:
         try:
-            student = Student.query.get(int(student_id))
+            student = db.session.get(Student, int(student_id))
         except (TypeError, ValueError):
             student = None
 
@@ -2185,57 +2277,25 @@ def student_report():
 
         return redirect(url_for("web.student_report"))
 
-    # Ensure reports exist for any reviewed sheets for this student
-    reviewed_sheets = (
-        AnswerSheet.query.filter_by(
-            student_id=student.student_id,
-            status=AnswerSheetStatus.REVIEWED,
-        )
-        .order_by(AnswerSheet.exam_id.asc(), AnswerSheet.sheet_id.asc())
-        .all()
-    )
-
-    sheets_by_exam = {}
-    for sheet in reviewed_sheets:
-        sheets_by_exam.setdefault(sheet.exam_id, []).append(sheet)
-
-    for exam_id, sheets in sheets_by_exam.items():
-        existing = Report.query.filter_by(student_id=student.student_id, exam_id=exam_id).first()
-        if existing is not None:
-            continue
-
-        scores = []
-        remarks_parts = []
-        for sheet in sheets:
-            extracted = sheet.extracted_text
-            if not extracted or not extracted.evaluation:
-                continue
-            eval_obj: Evaluation = extracted.evaluation
-            scores.append(eval_obj.score)
-            if eval_obj.feedback:
-                remarks_parts.append(f"Sheet {sheet.sheet_id}: {eval_obj.feedback}")
-
-        if not scores:
-            continue
-
-        # Use the best (maximum) score across attempts for this exam
-        total_score = round(max(scores), 2)
-        remarks = " \n".join(remarks_parts) if remarks_parts else None
-
-        new_report = Report(
-            student_id=student.student_id,
-            exam_id=exam_id,
-            total_score=total_score,
-            remarks=remarks,
-            generated_on=datetime.utcnow(),
+    # Reports are written when sheets are reviewed; this page only reads
+    # them. Reviewed exams still without one (reviewed before reports
+    # were generated on review) are filled in off-request.
+    unreported_exam_ids = db.session.scalars(
+        db.select(AnswerSheet.exam_id)
+        .where(
+            AnswerSheet.student_id == student.student_id,
+            AnswerSheet.status == AnswerSheetStatus.REVIEWED,
+            AnswerSheet.exam_id.not_in(
+                db.select(Report.exam_id).where(Report.student_id == student.student_id)
+            ),
         )
-        db.session.add(new_report)
-
-    if sheets_by_exam:
-        db.session.commit()
+        .distinct()
+    ).all()
+    if unreported_exam_ids:
+        persist(generate_missing_reports, student.student_id, unreported_exam_ids)
 
     # All exams (for allowing uploads by exam from student page)
-    exams = Exam.query.order_by(Exam.exam_id.asc()).all()
+    exams = all_exams()
 
     # Latest uploaded sheet per exam for this student (if any)
     latest_sheet_by_exam: dict[int, AnswerSheet] = {}
@@ -2275,7 +2335,7 @@ def student_exam_upload(exam_id: int):
     student = None
     if student_id is not None:
         try:
-            student = Student.query.get(int(student_id))
+            student = db.session.get(Student, int(student_id))
         except (TypeError, ValueError):
             student = None
 
@@ -2286,7 +2346,7 @@ def student_exam_upload(exam_id: int):
         )
         return redirect(url_for("web.student_report"))
 
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
 
     # Enforce single upload per student+exam as long as a sheet exists
     existing_sheet = (
@@ -2308,7 +2368,7 @@ def student_exam_upload(exam_id: int):
         filename = file.filename if file is not None else ""
         if not file or not filename:
             errors.append("File is required.")
-        elif not _allowed_file(filename):
+        elif (ext := _allowed_extension(filename)) is None:
             errors.append("Invalid file type. Allowed: PDF, JPG, PNG.")
 
         if errors:
@@ -2319,10 +2379,9 @@ def student_exam_upload(exam_id: int):
         upload_folder = current_app.config["UPLOAD_FOLDER"]
         os.makedirs(upload_folder, exist_ok=True)
 
-        ext = filename.rsplit(".", 1)[1].lower()
         safe_name = f"{student.student_id}_{exam.exam_id}_{uuid4().hex}.{ext}"
         full_path = os.path.join(upload_folder, safe_name)
-        file.save(full_path)
+        _save_upload(file, full_path)
 
         relative_path = os.path.join("uploads", safe_name)
 
@@ -2359,7 +2418,7 @@ def student_exam_report(exam_id: int):
     student = None
     if student_id is not None:
         try:
-            student = Student.query.get(int(student_id))
+            student = db.session.get(Student, int(student_id))
         except (TypeError, ValueError):
             student = None
 
@@ -2370,7 +2429,11 @@ def student_exam_report(exam_id: int):
         )
         return redirect(url_for("web.student_report"))
 
-    report = Report.query.filter_by(student_id=student.student_id, exam_id=exam_id).first()
+    report = (
+        Report.query.filter_by(student_id=student.student_id, exam_id=exam_id)
+        .options(joinedload(Report.exam).selectinload(Exam.questions))
+        .first()
+    )
     if report is None:
         flash("No report available for this exam.", "error")
         return redirect(url_for("web.student_report"))
@@ -2384,6 +2447,7 @@ def student_exam_report(exam_id: int):
             exam_id=exam_id,
             status=AnswerSheetStatus.REVIEWED,
         )
+        .options(_sheet_evaluation_options())
         .order_by(AnswerSheet.sheet_id.desc())
         .first()
     )
@@ -2451,17 +2515,15 @@ def student_exam_report(exam_id: int):
             or_by_q: dict[int, int | None] = {}
             group_members: dict[int, list[int]] = {}
             if exam is not None:
-                for q in sorted(getattr(exam, "questions", []), key=lambda q: q.question_no):
+                for q in exam.questions:
                     marks_by_q[q.question_no] = float(q.marks) if q.marks is not None else None
                     or_by_q[q.question_no] = getattr(q, "or_group", None)
                     if q.or_group is not None:
                         group_members.setdefault(q.or_group, []).append(q.question_no)
 
             # Use raw OCR text so question numbers align exactly with stored scores
-            answers_by_q = {
-                q_no: ans for q_no, ans in split_numbered_answers(extracted.raw_text)
-            }
-            for qe in sorted(evaluation.question_scores, key=lambda x: x.question_no):
+            answers_by_q = _scored_answers(extracted.raw_text, evaluation.question_scores)
+            for qe in evaluation.question_scores:
                 q_no = qe.question_no
                 max_marks_val = None
                 if exam is not None:
@@ -2538,20 +2600,31 @@ def teacher_report(student_id: int, exam_id: int):
     """
 
     # If a report already exists, return it / reuse it
-    report = Report.query.filter_by(student_id=student_id, exam_id=exam_id).first()
+    report = (
+        Report.query.filter_by(student_id=student_id, exam_id=exam_id)
+        .options(
+            joinedload(Report.exam).selectinload(Exam.questions),
+            joinedload(Report.student),
+        )
+        .first()
+    )
     if report is None:
-        # Generate only if there is at least one reviewed answer sheet
-        sheets = (
-            AnswerSheet.query.filter_by(
-                student_id=student_id,
-                exam_id=exam_id,
-                status=AnswerSheetStatus.REVIEWED,
+        # Generate only if there is at least one reviewed answer sheet.
+        # As in the /report API, one joined query returns just the
+        # columns the report needs for each reviewed sheet.
+        rows = db.session.execute(
+            db.select(AnswerSheet.sheet_id, Evaluation.score, Evaluation.feedback)
+            .outerjoin(ExtractedText, ExtractedText.sheet_id == AnswerSheet.sheet_id)
+            .outerjoin(Evaluation, Evaluation.text_id == ExtractedText.text_id)
+            .where(
+                AnswerSheet.student_id == student_id,
+                AnswerSheet.exam_id == exam_id,
+                AnswerSheet.status == AnswerSheetStatus.REVIEWED,
             )
             .order_by(AnswerSheet.sheet_id.asc())
-            .all()
-        )
+        ).all()
 
-        if not sheets:
+        if not rows:
             flash(
                 "Report not available. No reviewed answer sheets found.",
                 "error",
@@ -2559,16 +2632,9 @@ def teacher_report(student_id: int, exam_id: int):
             return redirect(url_for("web.teacher_dashboard"))
 
         # Aggregate evaluation scores across reviewed sheets
-        scores = []
-        remarks_parts = []
-        for sheet in sheets:
-            extracted = sheet.extracted_text
-            if not extracted or not extracted.evaluation:
-                continue
-            eval_obj: Evaluation = extracted.evaluation
-            scores.append(eval_obj.score)
-            if eval_obj.feedback:
-                remarks_parts.append(f"Sheet {sheet.sheet_id}: {eval_obj.feedback}")
+        evaluated = [r for r in rows if r.score is not None]
+        scores = [r.score for r in evaluated]
+        remarks_parts = [f"Sheet {r.sheet_id}: {r.feedback}" for r in evaluated if r.feedback]
 
         if not scores:
             flash("No evaluation scores found for reviewed sheets.", "error")
@@ -2578,15 +2644,19 @@ def teacher_report(student_id: int, exam_id: int):
         total_score = round(max(scores), 2)
         remarks = " \n".join(remarks_parts) if remarks_parts else None
 
-        report = Report(
-            student_id=student_id,
-            exam_id=exam_id,
-            total_score=total_score,
-            remarks=remarks,
-            generated_on=datetime.utcnow(),
+        insert_missing_reports(
+            [
+                {
+                    "student_id": student_id,
+                    "exam_id": exam_id,
+                    "total_score": total_score,
+                    "remarks": remarks,
+                }
+            ]
         )
-        db.session.add(report)
         db.session.commit()
+        # Ours, or the one a concurrent request inserted first.
+        report = Report.query.filter_by(student_id=student_id, exam_id=exam_id).one()
 
     # Build detailed per-question view based on the latest reviewed sheet
     exam = report.exam
@@ -2597,6 +2667,7 @@ def teacher_report(student_id: int, exam_id: int):
             exam_id=exam_id,
             status=AnswerSheetStatus.REVIEWED,
         )
+        .options(_sheet_evaluation_options())
         .order_by(AnswerSheet.sheet_id.desc())
         .first()
     )
@@ -2622,18 +2693,15 @@ def teacher_report(student_id: int, exam_id: int):
             or_by_q: dict[int, int | None] = {}
             group_members: dict[int, list[int]] = {}
             if exam is not None:
-                for q in sorted(getattr(exam, "questions", []), key=lambda q: q.question_no):
+                for q in exam.questions:
                     marks_by_q[q.question_no] = float(q.marks) if q.marks is not None else None
                     or_by_q[q.question_no] = getattr(q, "or_group", None)
                     if q.or_group is not None:
                         group_members.setdefault(q.or_group, []).append(q.question_no)
 
             # Use raw OCR text so question numbers align exactly with stored scores
-            answers_by_q = {
-                q_no: ans
-                for q_no, ans in split_numbered_answers(extracted.raw_text)
-            }
-            for qe in sorted(evaluation.question_scores, key=lambda x: x.question_no):
+            answers_by_q = _scored_answers(extracted.raw_text, evaluation.question_scores)
+            for qe in evaluation.question_scores:
                 q_no = qe.question_no
                 max_marks_val = None
                 if exam is not None:
@@ -2682,21 +2750,29 @@ def delete_student_evaluation(student_id: int, exam_id: int):
     evaluation for a student.
     """
 
-    sheets = AnswerSheet.query.filter_by(student_id=student_id, exam_id=exam_id).all()
-
-    for sheet in sheets:
-        extracted = sheet.extracted_text
-        if extracted is not None:
-            evaluation = extracted.evaluation
-            if evaluation is not None:
-                db.session.delete(evaluation)
-            db.session.delete(extracted)
-
-        db.session.delete(sheet)
-
-    Report.query.filter_by(student_id=student_id, exam_id=exam_id).delete(
-        synchronize_session=False
+    # One bulk DELETE per table, children first, as when deleting an exam.
+    sheet_ids = db.select(AnswerSheet.sheet_id).where(
+        AnswerSheet.student_id == student_id, AnswerSheet.exam_id == exam_id
     )
+    text_ids = db.select(ExtractedText.text_id).where(ExtractedText.sheet_id.in_(sheet_ids))
+    eval_ids = db.select(Evaluation.eval_id).where(Evaluation.text_id.in_(text_ids))
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        # A reset lost to a crash can simply be repeated, so don't wait
+        # for the WAL flush when committing it.
+        db.session.execute(db.text("SET LOCAL synchronous_commit = OFF"))
+
+    # Nothing is pending, so skip the autoflush before each statement.
+    with db.session.no_autoflush:
+        for query in (
+            QuestionEvaluation.query.filter(QuestionEvaluation.eval_id.in_(eval_ids)),
+            Evaluation.query.filter(Evaluation.text_id.in_(text_ids)),
+            ExtractedText.query.filter(ExtractedText.sheet_id.in_(sheet_ids)),
+            QuestionStudentComment.query.filter(QuestionStudentComment.sheet_id.in_(sheet_ids)),
+            AnswerSheet.query.filter_by(student_id=student_id, exam_id=exam_id),
+            Report.query.filter_by(student_id=student_id, exam_id=exam_id),
+        ):
+            query.delete(synchronize_session=False)
 
     db.session.commit()
 
@@ -2714,7 +2790,7 @@ def exam_report_page(exam_id: int):
     and top-performing students for the selected exam.
     """
 
-    exam = Exam.query.get_or_404(exam_id)
+    exam = db.get_or_404(Exam, exam_id)
 
     # All students currently in the system
     all_students = Student.query.order_by(Student.roll_no.asc()).all()
@@ -0,0 +1,19 @@
+"""Gunicorn settings: ``gunicorn`` (run from the repository root).
+
+Threaded workers let several requests hash passwords, wait on Gemini
+or run OCR in parallel; bcrypt and argon2 release the GIL while they
+hash, so logins spread across cores instead of queueing behind one
+synchronous worker. Flask-SQLAlchemy sessions are already scoped per
+thread.
+"""
+
+import os
+
+
+wsgi_app = "app:app"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+# OCR and Gemini grading can run well past gunicorn's 30 s default.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
@@ -3,14 +3,17 @@
 Usage (after setting OPENAI_API_KEY in .env):
 
     py openai_ocr_test.py --sheet-id 1
+    py openai_ocr_test.py --sheet-id 1 2 3
 
 This will:
-- Look up the AnswerSheet with the given sheet_id
+- Look up the AnswerSheet(s) with the given sheet_id(s)
 - Load the corresponding image file from the uploads folder
 - Load the exam questions + model answers
 - Call GPT-4o with the image and rubric
 - Print extracted answers and tentative scores per question
 
+Several sheet ids are graded concurrently with one AsyncOpenAI client.
+
 This script does NOT write anything back to the DB; it is just for
 experimentation so you can see how GPT-4o behaves on your real data.
 """
@@ -18,7 +21,11 @@ experimentation so you can see how GPT-4o behaves on your real data.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import base64
+import json
+import mimetypes
+import mmap
 import os
 from dataclasses import dataclass
 from typing import Any
@@ -43,50 +50,46 @@ class QuestionRubric:
 
 
 def _encode_image_to_data_url(path: str) -> str:
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    # Encode straight from a read-only mapping of the file instead of
+    # reading it into a bytes copy first.
     with open(path, "rb") as f:
-        b = f.read()
-    # Infer a basic mime type from extension; good enough for testing.
-    ext = os.path.splitext(path)[1].lower().lstrip(".")
-    if ext in {"jpg", "jpeg"}:
-        mime = "image/jpeg"
-    elif ext == "png":
-        mime = "image/png"
-    else:
-        mime = "application/octet-stream"
-    b64 = base64.b64encode(b).decode("ascii")
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                b64 = base64.b64encode(mm).decode("ascii")
+        except ValueError:  # empty files cannot be mapped
+            b64 = ""
     return f"data:{mime};base64,{b64}"
 
 
+# Static instructions first and the per-exam rubric last so repeated
+# calls for the same exam share an identical prompt prefix.
+_PROMPT_HEADER = (
+    "You are an examiner. The student answer sheet image will be provided. "
+    "First, transcribe the student's answers, then evaluate them strictly "
+    "against the given model answers and marks.\n"
+    "Return JSON with this structure only: "
+    "{\"questions\":[{\"question_no\":int,\"extracted_answer\":str,"
+    "\"score\":float,\"feedback\":str}], \"total_score\": float}.\n"
+    "If you cannot read an answer, set score=0 and feedback='Not legible'.\n"
+    "\n"
+    "Rubric (questions and model answers):"
+)
+
+
 def build_prompt(rubric: list[QuestionRubric]) -> str:
-    lines: list[str] = []
-    lines.append(
-        "You are an examiner. The student answer sheet image will be provided. "
-        "First, transcribe the student's answers, then evaluate them strictly "
-        "against the given model answers and marks."
+    rubric_text = "".join(
+        f"\nQ{q.question_no}{f' ({q.max_marks} marks)' if q.max_marks is not None else ''}: "
+        f"{q.question_text}\nModel answer: {q.model_answer}\n"
+        for q in rubric
     )
-    lines.append("")
-    lines.append("Rubric (questions and model answers):")
-    for q in rubric:
-        marks_part = f" ({q.max_marks} marks)" if q.max_marks is not None else ""
-        lines.append(f"Q{q.question_no}{marks_part}: {q.question_text}")
-        lines.append(f"Model answer: {q.model_answer}")
-        lines.append("")
-    lines.append(
-        "Return JSON with this structure only: "
-        "{\"questions\":[{\"question_no\":int,\"extracted_answer\":str,"
-        "\"score\":float,\"feedback\":str}], \"total_score\": float}."
-    )
-    lines.append(
-        "If you cannot read an answer, set score=0 and feedback='Not legible'."
-    )
-
-    return "\n".join(lines)
+    return _PROMPT_HEADER + rubric_text
 
 
-def call_openai_vision(image_path: str, prompt: str) -> dict[str, Any]:
+def _import_openai():
     # Lazy import so this file doesn't break for users without openai installed.
     try:
-        from openai import OpenAI  # type: ignore
+        import openai  # type: ignore
     except Exception as exc:  # noqa: BLE001
         raise RuntimeError(
             "The 'openai' package is not installed. Run 'pip install openai'."
@@ -95,14 +98,14 @@ def call_openai_vision(image_path: str, prompt: str) -> dict[str, Any]:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set in environment/.env")
+    return openai, api_key
 
-    client = OpenAI(api_key=api_key)
 
+def _completion_kwargs(image_path: str, prompt: str) -> dict[str, Any]:
     data_url = _encode_image_to_data_url(image_path)
-
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
             {
                 "role": "system",
                 "content": "You read exam answer sheet images and grade them.",
@@ -115,60 +118,88 @@ def call_openai_vision(image_path: str, prompt: str) -> dict[str, Any]:
                 ],
             },
         ],
-        response_format={"type": "json_object"},
-        temperature=0.1,
+        "response_format": {"type": "json_object"},
+        "temperature": 0.1,
+    }
+
+
+def call_openai_vision(image_path: str, prompt: str) -> dict[str, Any]:
+    openai, api_key = _import_openai()
+    client = openai.OpenAI(api_key=api_key)
+    completion = client.chat.completions.create(**_completion_kwargs(image_path, prompt))
+    return json.loads(completion.choices[0].message.content or "{}")
+
+
+async def call_openai_vision_async(client, image_path: str, prompt: str) -> dict[str, Any]:
+    completion = await client.chat.completions.create(
+        **_completion_kwargs(image_path, prompt)
     )
+    return json.loads(completion.choices[0].message.content or "{}")
 
-    content = completion.choices[0].message.content or "{}"
-    import json
 
-    return json.loads(content)
+async def _run_all(jobs: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    """Grade every ``(image_path, prompt)`` concurrently on one client."""
+
+    openai, api_key = _import_openai()
+    async with openai.AsyncOpenAI(api_key=api_key) as client:
+        return await asyncio.gather(
+            *(call_openai_vision_async(client, path, prompt) for path, prompt in jobs)
+        )
+
+
+def _sheet_job(app, sheet_id: int) -> tuple[str, str]:
+    """Return ``(image_path, prompt)`` for one sheet."""
+
+    sheet = db.session.get(AnswerSheet, sheet_id)
+    if sheet is None:
+        raise SystemExit(f"No AnswerSheet with sheet_id={sheet_id}")
+
+    upload_folder = app.config["UPLOAD_FOLDER"]
+    filename = os.path.basename(sheet.file_path)
+    image_path = os.path.join(upload_folder, filename)
+    if not os.path.exists(image_path):
+        raise SystemExit(f"File not found: {image_path}")
+
+    # Build rubric from ExamQuestion rows
+    questions = (
+        ExamQuestion.query.filter_by(exam_id=sheet.exam_id)
+        .order_by(ExamQuestion.question_no.asc())
+        .all()
+    )
+    if not questions:
+        raise SystemExit(f"No questions/rubric defined for the exam of sheet {sheet_id}.")
+
+    rubric = [
+        QuestionRubric(
+            question_no=q.question_no,
+            question_text=q.question_text,
+            model_answer=q.answer_text,
+            max_marks=q.marks,
+        )
+        for q in questions
+    ]
+    return image_path, build_prompt(rubric)
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Test OpenAI OCR + eval for a sheet")
-    parser.add_argument("--sheet-id", type=int, required=True)
+    parser = argparse.ArgumentParser(description="Test OpenAI OCR + eval for sheets")
+    parser.add_argument("--sheet-id", type=int, nargs="+", required=True)
     args = parser.parse_args()
 
     app = create_app()
     with app.app_context():
-        sheet = AnswerSheet.query.get(args.sheet_id)
-        if sheet is None:
-            raise SystemExit(f"No AnswerSheet with sheet_id={args.sheet_id}")
-
-        upload_folder = app.config["UPLOAD_FOLDER"]
-        filename = os.path.basename(sheet.file_path)
-        image_path = os.path.join(upload_folder, filename)
-        if not os.path.exists(image_path):
-            raise SystemExit(f"File not found: {image_path}")
-
-        # Build rubric from ExamQuestion rows
-        questions = (
-            ExamQuestion.query.filter_by(exam_id=sheet.exam_id)
-            .order_by(ExamQuestion.question_no.asc())
-            .all()
-        )
-        if not questions:
-            raise SystemExit("No questions/rubric defined for this exam.")
-
-        rubric = [
-            QuestionRubric(
-                question_no=q.question_no,
-                question_text=q.question_text,
-                model_answer=q.answer_text,
-                max_marks=q.marks,
-            )
-            for q in questions
-        ]
-
-        prompt = build_prompt(rubric)
+        jobs = [_sheet_job(app, sheet_id) for sheet_id in args.sheet_id]
 
+    for image_path, _ in jobs:
         print(f"Calling OpenAI on {image_path} ...")
-        result = call_openai_vision(image_path, prompt)
-
-        print("\n--- Raw JSON result ---\n")
-        import json
+    if len(jobs) == 1:
+        results = [call_openai_vision(*jobs[0])]
+    else:
+        # Several sheets: the calls are network-bound, so run them together.
+        results = asyncio.run(_run_all(jobs))
 
+    for sheet_id, result in zip(args.sheet_id, results):
+        print(f"\n--- Raw JSON result (sheet {sheet_id}) ---\n")
         print(json.dumps(result, indent=2, ensure_ascii=False))
 
 